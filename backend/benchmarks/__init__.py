@@ -0,0 +1 @@
+# NBA Prop Bet Analyzer - Offline benchmarks
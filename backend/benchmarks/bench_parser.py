@@ -0,0 +1,76 @@
+"""
+Compare game log parser engines on saved HTML fixtures.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.bench_parser --repeat 20
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import pandas as pd
+
+from benchmarks.fixtures import FIXTURES_DIR, ensure_fixtures
+from src.scrapers import game_log_parser
+from src.scrapers.game_log_parser import parse_game_log
+
+
+def available_engines():
+    engines = ['html.parser', 'strainer']
+    if game_log_parser.lxml is not None:
+        engines.append('lxml')
+    return engines
+
+
+def time_engine(html: bytes, season: int, engine: str, repeat: int) -> float:
+    """Return the median parse time in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse_game_log(html, season, engine=engine)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark game log parser engines')
+    parser.add_argument('--repeat', type=int, default=10, help='Number of parses per fixture and engine')
+    args = parser.parse_args()
+
+    engines = available_engines()
+    baseline = 'html.parser'
+    totals = {engine: 0.0 for engine in engines}
+
+    print(f"{'fixture':<40}" + ''.join(f"{engine:>14}" for engine in engines))
+    for path in ensure_fixtures():
+        with open(path, 'rb') as f:
+            html = f.read()
+        season = int(os.path.splitext(os.path.basename(path))[0])
+
+        # All engines must agree on the parsed game log
+        expected = parse_game_log(html, season, engine=baseline)
+        for engine in engines:
+            try:
+                pd.testing.assert_frame_equal(parse_game_log(html, season, engine=engine), expected, check_like=True)
+            except AssertionError as e:
+                print(f"Error: {engine} output differs from {baseline} for {path}: {e}")
+                return 1
+
+        timings = {engine: time_engine(html, season, engine, args.repeat) for engine in engines}
+        for engine, ms in timings.items():
+            totals[engine] += ms
+        name = os.path.relpath(path, FIXTURES_DIR)
+        print(f"{name:<40}" + ''.join(f"{timings[engine]:>12.2f}ms" for engine in engines))
+
+    print(f"{'total':<40}" + ''.join(f"{totals[engine]:>12.2f}ms" for engine in engines))
+    for engine in engines:
+        if engine != baseline and totals[engine] > 0:
+            print(f"{engine}: {totals[baseline] / totals[engine]:.1f}x faster than {baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
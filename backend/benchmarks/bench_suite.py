@@ -0,0 +1,334 @@
+"""
+Time the request path stage by stage against recorded pages and catch regressions.
+
+Game log and search result pages are replayed through the local stub upstream
+(``benchmarks.stub_server``) with an empty cache directory and the rate limiter
+opened up, so runs are offline and repeatable. Each scenario is split into the
+stages of the code path it exercises (rate limit wait, fetch, parse, store,
+select, stats, serialize, ...) and reported as p50/p95/p99 latency per stage plus
+the throughput of the whole scenario.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.bench_suite --save-baseline    # record benchmarks/baseline.json
+    python -m benchmarks.bench_suite                    # compare against it
+
+A run that is slower than the baseline by more than ``--tolerance`` (and by more
+than ``--min-delta`` milliseconds, to ignore noise on very short stages) exits
+with status 1. Baselines are machine specific: the committed one records how
+the synthetic fixtures perform on the machine named in it, so record a new one
+on the machine that runs the comparison.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from benchmarks.stub_server import StubServer
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+SEASON = 2024
+SEASONS = [2024, 2023]
+BET_LINES = {"points": 20.5, "rebounds": 5.5, "assists": 6.5}
+
+
+class StageTimer:
+    """Collect latency samples in milliseconds per scenario and stage."""
+
+    def __init__(self):
+        self.samples: Dict[str, Dict[str, List[float]]] = defaultdict(lambda: defaultdict(list))
+
+    @contextlib.contextmanager
+    def stage(self, scenario: str, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(scenario, stage, time.perf_counter() - start)
+
+    def add(self, scenario: str, stage: str, seconds: float) -> None:
+        self.samples[scenario][stage].append(seconds * 1000)
+
+    def run(self, scenario: str, iterations: int, iteration: Callable[[int], None]) -> None:
+        """Run ``iteration(i)`` for each iteration, timing the whole of it as the "total" stage."""
+        for i in range(iterations):
+            start = time.perf_counter()
+            iteration(i)
+            self.add(scenario, 'total', time.perf_counter() - start)
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Summarize the samples.
+
+        Returns:
+            Dictionary mapping scenario to stage to n, mean, p50, p95 and p99 (ms),
+            with the scenario's throughput as ``ops_per_sec`` on its "total" stage
+        """
+        results = {}
+        for scenario, stages in self.samples.items():
+            results[scenario] = {}
+            for stage, samples in stages.items():
+                values = np.asarray(samples)
+                p50, p95, p99 = np.percentile(values, [50, 95, 99])
+                results[scenario][stage] = {'n': len(values), 'mean': float(values.mean()),
+                                            'p50': float(p50), 'p95': float(p95), 'p99': float(p99)}
+            total = results[scenario].get('total')
+            if total and total['mean'] > 0:
+                total['ops_per_sec'] = 1000 / total['mean']
+        return results
+
+
+def bench_game_log_cold(timer: StageTimer, scraper, iterations: int) -> None:
+    """``get_game_log_by_id`` for game logs that are not cached or stored yet."""
+    def iteration(i: int):
+        player_id = f"cold{i:05d}"
+        url = scraper._game_log_url(player_id, SEASON)
+
+        start = time.perf_counter()
+        response = scraper._get(url, ttl=scraper._season_ttl(SEASON))
+        elapsed = time.perf_counter() - start
+        timer.add('game_log_cold', 'rate_limit', response.queue_wait)
+        timer.add('game_log_cold', 'fetch', elapsed - response.queue_wait)
+
+        with timer.stage('game_log_cold', 'parse'):
+            game_log = scraper._parse_game_log_response(response, player_id, SEASON)
+        with timer.stage('game_log_cold', 'store'):
+            scraper.game_log_store.save(player_id, SEASON, game_log)
+
+    timer.run('game_log_cold', iterations, iteration)
+
+
+def bench_game_log_warm(timer: StageTimer, scraper, iterations: int) -> None:
+    """``get_game_log_by_id`` for game logs already in the game log store."""
+    def iteration(i: int):
+        scraper.get_game_log_by_id(f"cold{i:05d}", SEASON, columns=scraper.RELEVANT_COLUMNS)
+
+    timer.run('game_log_warm', iterations, iteration)
+
+
+def bench_recent_games(timer: StageTimer, scraper, iterations: int) -> None:
+    """``get_recent_games`` over two seasons, the first call per player fetching both pages."""
+    def iteration(i: int):
+        player_id = f"recent{i % max(iterations // 2, 1):05d}"
+        query = scraper.games_query(10)
+        with timer.stage('recent_games', 'fetch'):
+            season_logs = scraper._fetch_season_logs("Bench Player", SEASONS, player_id,
+                                                     columns=scraper.RELEVANT_COLUMNS, query=query)
+        with timer.stage('recent_games', 'select'):
+            scraper._select_recent_games(season_logs, "Bench Player", 10)
+
+    timer.run('recent_games', iterations, iteration)
+
+
+def bench_analyze(timer: StageTimer, scraper, iterations: int) -> None:
+    """``analyze_player`` without the analysis cache, from stored game logs."""
+    from src.analysis import fetch_games, get_season_years, parse_analysis_request, resolve_player, summarize_games
+    from src.serialization import dumps
+
+    # Store the game logs first, so the scenario measures the analysis itself
+    for i in range(iterations):
+        scraper._fetch_season_logs("Bench Player", get_season_years('both'), f"analyze{i:05d}")
+
+    def iteration(i: int):
+        data = {"playerName": "Bench Player", "playerId": f"analyze{i:05d}", "seasons": "both",
+                "gamesCount": 20, "betLines": BET_LINES}
+        with timer.stage('analyze', 'resolve'):
+            analysis = resolve_player(parse_analysis_request(data), scraper)
+        with timer.stage('analyze', 'fetch'):
+            games_df = fetch_games(analysis, scraper)
+        with timer.stage('analyze', 'stats'):
+            result = summarize_games(analysis, games_df)
+        with timer.stage('analyze', 'serialize'):
+            dumps(result)
+
+    timer.run('analyze', iterations, iteration)
+
+
+def bench_analyze_request(timer: StageTimer, iterations: int) -> None:
+    """``POST /api/player/analyze`` through the Flask app, computed and then answered from the analysis cache."""
+    from src import api
+
+    client = api.app.test_client()
+
+    def body(i: int) -> dict:
+        return {"playerName": "Bench Player", "playerId": f"analyze{i:05d}", "seasons": "both",
+                "gamesCount": 20, "betLines": BET_LINES}
+
+    def computed(i: int):
+        api.analysis_cache.clear()
+        client.post('/api/player/analyze', json=body(i))
+
+    def cached(i: int):
+        client.post('/api/player/analyze', json=body(i))
+
+    timer.run('analyze_request', iterations, computed)
+
+    # Every request in the cached scenario is answered from the analysis cache
+    for i in range(iterations):
+        client.post('/api/player/analyze', json=body(i))
+    timer.run('analyze_request_cached', iterations, cached)
+
+
+def bench_search(timer: StageTimer, scraper, iterations: int) -> None:
+    """``search_players`` on search result pages that are not cached yet."""
+    def iteration(i: int):
+        url = f"{scraper.BASE_URL}/search/search.fcgi?search=bench{i:05d}"
+
+        start = time.perf_counter()
+        response = scraper._get(url, ttl=scraper.SEARCH_TTL)
+        elapsed = time.perf_counter() - start
+        timer.add('search', 'rate_limit', response.queue_wait)
+        timer.add('search', 'fetch', elapsed - response.queue_wait)
+
+        with timer.stage('search', 'parse'):
+            scraper._parse_search_results(response)
+
+    timer.run('search', iterations, iteration)
+
+
+def print_report(results: Dict, baseline: Dict = None) -> None:
+    header = f"{'scenario':<24}{'stage':<12}{'n':>6}{'p50':>10}{'p95':>10}{'p99':>10}{'ops/s':>10}"
+    if baseline:
+        header += f"{'p50 base':>10}{'change':>9}"
+    print(header)
+    for scenario, stages in results.items():
+        for stage, stats in stages.items():
+            ops = f"{stats['ops_per_sec']:.1f}" if 'ops_per_sec' in stats else ''
+            line = (f"{scenario:<24}{stage:<12}{stats['n']:>6}{stats['p50']:>8.2f}ms"
+                    f"{stats['p95']:>8.2f}ms{stats['p99']:>8.2f}ms{ops:>10}")
+            base = (baseline or {}).get(scenario, {}).get(stage)
+            if base:
+                change = (stats['p50'] - base['p50']) / base['p50'] * 100 if base['p50'] > 0 else 0.0
+                line += f"{base['p50']:>8.2f}ms{change:>+8.0f}%"
+            print(line)
+
+
+def find_regressions(results: Dict, baseline: Dict, tolerance: float, min_delta: float) -> List[str]:
+    """
+    Compare p50 latencies against a baseline.
+
+    Args:
+        results: Output of ``StageTimer.summary``
+        baseline: Results of an earlier run
+        tolerance: Allowed slowdown as a fraction of the baseline (e.g., 0.25 for 25%)
+        min_delta: Slowdowns of at most this many milliseconds are ignored as noise
+
+    Returns:
+        Descriptions of the stages that got slower
+    """
+    regressions = []
+    for scenario, stages in baseline.items():
+        for stage, base in stages.items():
+            current = results.get(scenario, {}).get(stage)
+            if current is None:
+                continue
+            delta = current['p50'] - base['p50']
+            if delta > min_delta and current['p50'] > base['p50'] * (1 + tolerance):
+                regressions.append(f"{scenario}/{stage}: p50 {base['p50']:.2f}ms -> {current['p50']:.2f}ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the request path stage by stage against a stub upstream')
+    parser.add_argument('--iterations', type=int, default=50, help='Iterations per scenario')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds the stub upstream waits before responding')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='Baseline file to compare against or save')
+    parser.add_argument('--save-baseline', action='store_true', help='Save the results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed p50 slowdown against the baseline (e.g., 0.25 for 25%%)')
+    parser.add_argument('--min-delta', type=float, default=0.5,
+                        help='Slowdowns of at most this many milliseconds are ignored as noise')
+    parser.add_argument('--output', default=None, help='Also write the results to this JSON file')
+    args = parser.parse_args()
+
+    server = StubServer(latency=args.latency)
+    server.start()
+    cache_dir = tempfile.mkdtemp(prefix='nbaprops-bench-')
+
+    # Read by the shared cache, store and rate limiter on first use, so set before importing the app
+    os.environ.update(
+        NBAPROPS_BASE_URL=server.url,
+        NBAPROPS_CACHE_DIR=cache_dir,
+        NBAPROPS_RATE_LIMIT_RPM='1000000',
+        NBAPROPS_RATE_LIMIT_BURST='100000',
+        NBAPROPS_LOG_LEVEL=os.environ.get('NBAPROPS_LOG_LEVEL', 'WARNING'),
+    )
+    for name in ('NBAPROPS_RATE_LIMIT_FILE', 'NBAPROPS_ANALYSIS_CACHE_FILE'):
+        os.environ.pop(name, None)
+
+    from src.instrumentation import configure_logging
+    from src.scrapers.basketball_reference import BasketballReferenceScaper
+
+    configure_logging()
+    BasketballReferenceScaper.BASE_URL = server.url
+    scraper = BasketballReferenceScaper()
+    timer = StageTimer()
+
+    print(f"Running {args.iterations} iterations per scenario against {server.url} "
+          f"({args.latency * 1000:.0f}ms upstream latency)...")
+    try:
+        bench_game_log_cold(timer, scraper, args.iterations)
+        bench_game_log_warm(timer, scraper, args.iterations)
+        bench_recent_games(timer, scraper, args.iterations)
+        bench_analyze(timer, scraper, args.iterations)
+        bench_analyze_request(timer, args.iterations)
+        bench_search(timer, scraper, args.iterations)
+    finally:
+        server.stop()
+
+    results = timer.summary()
+    run = {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.platform(),
+        'iterations': args.iterations,
+        'latency': args.latency,
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(run, f, indent=2)
+
+    if args.save_baseline:
+        print_report(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(run, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print_report(results)
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one.")
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('latency') != args.latency:
+        print(f"Warning: The baseline was recorded with {baseline.get('latency', 0) * 1000:.0f}ms upstream latency")
+    if baseline.get('machine') != run['machine']:
+        # The committed baseline comes from another machine; record a local one for meaningful comparisons
+        print(f"Warning: The baseline was recorded on {baseline.get('machine')}, "
+              f"run with --save-baseline to record one for this machine")
+
+    print_report(results, baseline['results'])
+    regressions = find_regressions(results, baseline['results'], args.tolerance, args.min_delta)
+    if regressions:
+        print(f"{len(regressions)} stages are slower than the baseline:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print("No regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,289 @@
+"""
+HTML fixtures for the offline benchmarks.
+
+Fixtures live in ``benchmarks/fixtures/`` and mirror the URL layout of
+basketball-reference.com (e.g. ``players/y/youngtr01/gamelog/2025.html``).
+They can be recorded from the live site (game logs as ``PLAYER_ID:SEASON``,
+search result pages as ``search:QUERY``):
+
+    python -m benchmarks.fixtures record youngtr01:2025 youngtr01:2024 search:young
+
+or synthesized, which produces pages with the same markup as the site's
+game log table and search results padded with unrelated page content:
+
+    python -m benchmarks.fixtures synthesize
+
+The committed fixtures are synthesized, since recorded pages cannot be
+redistributed. The synthetic game logs reproduce the quirks of the real pages
+that the parsers have to handle: header rows repeated inside the table body,
+rows for games the player missed with a single reason cell (including reasons
+other than ``DNP_REASONS``), empty percentages, and a playoffs table hidden in
+an HTML comment with the same markup as the regular season table. Record real
+pages over them to benchmark against the live markup; recorded pages take
+precedence over synthesis in the stub server.
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+from typing import List, Tuple
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# Players, seasons and search queries used when synthesizing fixtures
+SYNTHETIC_LOGS = [('youngtr01', 2025), ('youngtr01', 2024), ('jamesle01', 2025), ('jamesle01', 2024)]
+SYNTHETIC_SEARCHES = ['young', 'james']
+
+# Reasons given on the site for missed games; only some of them are DNP_REASONS
+MISSED_GAME_REASONS = ['Inactive', 'Did Not Play', 'Did Not Dress', 'Not With Team', 'Player Suspended']
+
+TEAMS = ['ATL', 'BOS', 'BRK', 'CHI', 'CHO', 'CLE', 'DAL', 'DEN', 'DET', 'GSW', 'HOU', 'IND', 'LAC', 'LAL', 'MEM',
+         'MIA', 'MIL', 'MIN', 'NOP', 'NYK', 'OKC', 'ORL', 'PHI', 'PHO', 'POR', 'SAC', 'SAS', 'TOR', 'UTA', 'WAS']
+
+STAT_COLUMNS = ['gs', 'mp', 'fg', 'fga', 'fg_pct', 'fg3', 'fg3a', 'fg3_pct', 'ft', 'fta', 'ft_pct', 'orb', 'drb',
+                'trb', 'ast', 'stl', 'blk', 'tov', 'pf', 'pts', 'game_score', 'plus_minus']
+
+
+def fixture_path(relative_url: str) -> str:
+    """Map a site-relative URL to its fixture file."""
+    path = relative_url.lstrip('/').split('?')[0]
+    if not path.endswith('.html'):
+        path += '.html'
+    return os.path.join(FIXTURES_DIR, path)
+
+
+def game_log_url(player_id: str, season: int) -> str:
+    return f"/players/{player_id[0]}/{player_id}/gamelog/{season}"
+
+
+def search_fixture_path(query: str) -> str:
+    """Map a search query to its fixture file (``search/<query>.html``)."""
+    return fixture_path(f"/search/{query.strip().lower().replace(' ', '_')}")
+
+
+def synthesize_search_page(query: str, results: int = 20) -> str:
+    """
+    Build a search results page in basketball-reference markup.
+
+    Args:
+        query: Search query, used in the player names and to seed the page
+        results: Number of players on the page
+
+    Returns:
+        HTML page
+    """
+    rng = random.Random(f"search-{query}")
+    positions = ['Point Guard', 'Shooting Guard', 'Small Forward', 'Power Forward', 'Center']
+    items = []
+    for i in range(results):
+        last_name = f"{query.strip().title()}{'son' * (i % 3)}"
+        first_name = rng.choice(['Trae', 'LeBron', 'Jalen', 'Anthony', 'Chris', 'Kevin', 'Marcus', 'Luka'])
+        player_id = f"{last_name.lower()[:5]}{first_name.lower()[:2]}{i % 100:02d}"
+        first_year = rng.randint(2000, 2020)
+        items.append(
+            f'<div class="search-item"><div class="search-item-name">'
+            f'<a href="/players/{player_id[0]}/{player_id}.html">{first_name} {last_name} '
+            f'({first_year}-{first_year + rng.randint(1, 5)})</a></div>'
+            f'<div class="search-item-url">Position: {rng.choice(positions)} • Shoots: Right • '
+            f'Team: {rng.choice(TEAMS)}</div></div>'
+        )
+
+    return (
+        f'<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>Search Results</title></head>'
+        f'<body>{_filler(rng, "header")}<div id="players"><h2>Players</h2>{"".join(items)}</div>'
+        f'{_filler(rng, "footer")}</body></html>'
+    )
+
+
+def synthesize_game_log(player_id: str, season: int, games: int = 82) -> str:
+    """
+    Build a game log page in basketball-reference markup.
+
+    Like the real pages, the regular season table repeats its header row every
+    20 games, has rows with only a reason for missed games and is followed by a
+    playoffs table inside an HTML comment.
+
+    Args:
+        player_id: Basketball Reference player ID, used to seed the random stats
+        season: Season year (e.g., 2025 for 2024-2025 season)
+        games: Number of team games in the log
+
+    Returns:
+        HTML page
+    """
+    rng = random.Random(f"{player_id}-{season}")
+    team = rng.choice(TEAMS)
+    # Games every other day from late October, oldest first like the real pages
+    start = datetime.date(season - 1, 10, 22)
+    regular_season = _game_log_table('pgl_basic', _game_log_rows(rng, team, season, start, games, 'pgl_basic'))
+    playoffs = _game_log_table('pgl_basic_playoffs', _game_log_rows(
+        rng, team, season, start + datetime.timedelta(days=2 * games + 10), rng.randint(4, 16), 'pgl_basic_playoffs'))
+    return (
+        f'<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>{player_id} {season} Game Log</title>'
+        f'</head><body>{_filler(rng, "header")}'
+        f'<h1 itemprop="name"><span>{player_id} {season - 1}-{str(season)[2:]} Game Log</span></h1>'
+        f'{regular_season}'
+        # The site sends the tables below the first one commented out and uncomments them in the browser
+        f'<div class="table_wrapper" id="all_pgl_basic_playoffs"><div class="section_heading"><h2>Playoffs</h2>'
+        f'</div><div class="placeholder"></div>\n<!--\n{playoffs}\n-->\n</div>'
+        f'{_filler(rng, "footer")}</body></html>'
+    )
+
+
+def _game_log_table(table_id: str, rows: List[str]) -> str:
+    """Wrap game log rows in the site's table markup."""
+    header = ''.join(f'<th data-stat="{stat}">{stat}</th>' for stat in ['ranker', 'date_game'] + STAT_COLUMNS)
+    return (
+        f'<div class="table_container" id="div_{table_id}"><table class="row_summable sortable stats_table" '
+        f'id="{table_id}"><thead><tr>{header}</tr></thead><tbody>{"".join(rows)}</tbody></table></div>'
+    )
+
+
+def _game_log_rows(rng: random.Random, team: str, season: int, start: datetime.date, games: int,
+                   table_id: str) -> List[str]:
+    """Build the body rows of a game log table, one game every other day from ``start``."""
+    rows = []
+    for i in range(games):
+        if i and i % 20 == 0:
+            rows.append('<tr class="thead"><th data-stat="ranker">Rk</th><th data-stat="date_game">Date</th></tr>')
+
+        game_date = start + datetime.timedelta(days=2 * i)
+        year, month, day = game_date.year, game_date.month, game_date.day
+        opponent = rng.choice([t for t in TEAMS if t != team])
+        location = rng.choice(['', '@'])
+        cells = [
+            f'<th scope="row" class="right " data-stat="ranker">{i + 1}</th>',
+            f'<td class="right " data-stat="game_season">{i + 1}</td>',
+            f'<td class="left " data-stat="date_game"><a href="/boxscores/{year}{month:02d}{day:02d}0{team}.html">'
+            f'{year}-{month:02d}-{day:02d}</a></td>',
+            f'<td class="right " data-stat="age">25-{100 + i:03d}</td>',
+            f'<td class="left " data-stat="team_id"><a href="/teams/{team}/{season}.html">{team}</a></td>',
+            f'<td class="center " data-stat="game_location">{location}</td>',
+            f'<td class="left " data-stat="opp_id"><a href="/teams/{opponent}/{season}.html">{opponent}</a></td>',
+            f'<td class="center " data-stat="game_result">{rng.choice(["W", "L"])} ({rng.randint(-20, 20):+d})</td>',
+        ]
+
+        if rng.random() < 0.08:
+            reason = rng.choice(MISSED_GAME_REASONS)
+            cells.append(f'<td class="center iz" data-stat="reason" colspan="22">{reason}</td>')
+        else:
+            fg3a = rng.randint(0, 12)
+            fg3 = rng.randint(0, fg3a)
+            fga = rng.randint(max(10, fg3a), 25)
+            fg = rng.randint(fg3, fga)
+            fta = rng.randint(0, 12)
+            ft = rng.randint(0, fta)
+            orb, drb = rng.randint(0, 3), rng.randint(1, 8)
+            values = {
+                'gs': 1, 'mp': f"{rng.randint(24, 40)}:{rng.randint(0, 59):02d}",
+                'fg': fg, 'fga': fga, 'fg_pct': f"{fg / fga:.3f}".lstrip('0'),
+                'fg3': fg3, 'fg3a': fg3a, 'fg3_pct': f"{fg3 / fg3a:.3f}".lstrip('0') if fg3a else '',
+                'ft': ft, 'fta': fta, 'ft_pct': f"{ft / fta:.3f}".lstrip('0') if fta else '',
+                'orb': orb, 'drb': drb, 'trb': orb + drb, 'ast': rng.randint(2, 14),
+                'stl': rng.randint(0, 3), 'blk': rng.randint(0, 2), 'tov': rng.randint(0, 6), 'pf': rng.randint(0, 5),
+                'pts': 2 * (fg - fg3) + 3 * fg3 + ft, 'game_score': f"{rng.uniform(0, 35):.1f}",
+                'plus_minus': f"{rng.randint(-20, 20):+d}",
+            }
+            cells.extend(f'<td class="right " data-stat="{stat}">{values[stat]}</td>' for stat in STAT_COLUMNS)
+
+        rows.append(f'<tr id="{table_id}.{season}.{i + 1}">{"".join(cells)}</tr>')
+    return rows
+
+
+def _filler(rng: random.Random, section: str) -> str:
+    """Navigation and other page content surrounding the game log table."""
+    blocks = []
+    for i in range(60):
+        links = ''.join(f'<li><a href="/{section}/{i}/{j}.html">Link {rng.randint(0, 10 ** 6)}</a></li>'
+                        for j in range(25))
+        blocks.append(f'<div class="{section}_block" id="{section}_{i}"><p>Section {i}</p><ul>{links}</ul></div>')
+    return ''.join(blocks)
+
+
+def synthesize(logs: List[Tuple[str, int]] = SYNTHETIC_LOGS, queries: List[str] = SYNTHETIC_SEARCHES) -> List[str]:
+    """
+    Write synthesized game log and search result fixtures.
+
+    Returns:
+        Paths of the written fixtures
+    """
+    pages = [(fixture_path(game_log_url(player_id, season)), synthesize_game_log(player_id, season))
+             for player_id, season in logs]
+    pages += [(search_fixture_path(query), synthesize_search_page(query)) for query in queries]
+
+    paths = []
+    for path, html in pages:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(html)
+        paths.append(path)
+    return paths
+
+
+def record(logs: List[Tuple[str, int]], queries: List[str] = ()) -> List[str]:
+    """
+    Download game log and search result pages from basketball-reference.com into
+    the fixtures directory.
+
+    Returns:
+        Paths of the written fixtures
+    """
+    from src.scrapers.basketball_reference import BasketballReferenceScaper
+
+    scraper = BasketballReferenceScaper(use_cache=False)
+    pages = [(game_log_url(player_id, season), fixture_path(game_log_url(player_id, season)))
+             for player_id, season in logs]
+    pages += [(f"/search/search.fcgi?search={query}", search_fixture_path(query)) for query in queries]
+
+    paths = []
+    for url, path in pages:
+        response = scraper._get(f"{scraper.BASE_URL}{url}")
+        if response.status_code != 200:
+            print(f"Skipping {url} (Status code: {response.status_code})")
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(response.content)
+        paths.append(path)
+    return paths
+
+
+def ensure_fixtures() -> List[str]:
+    """
+    Get all game log fixtures, synthesizing them if none have been recorded.
+
+    Returns:
+        Paths of the game log fixtures
+    """
+    paths = []
+    for root, _, files in os.walk(FIXTURES_DIR):
+        if os.sep + 'gamelog' in root:
+            paths.extend(os.path.join(root, name) for name in files if name.endswith('.html'))
+    return sorted(paths) or synthesize()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage HTML fixtures for the benchmarks')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('synthesize', help='Generate synthetic game log and search result pages')
+    record_parser = subparsers.add_parser('record', help='Download pages from basketball-reference.com')
+    record_parser.add_argument('pages', nargs='+',
+                               help='Game logs as PLAYER_ID:SEASON (e.g., youngtr01:2025) or searches as search:QUERY')
+
+    args = parser.parse_args()
+    if args.command == 'synthesize':
+        paths = synthesize()
+    else:
+        pages = [page.split(':', 1) for page in args.pages]
+        logs = [(player_id, int(season)) for player_id, season in pages if player_id != 'search']
+        queries = [query for kind, query in pages if kind == 'search']
+        paths = record(logs, queries)
+
+    for path in paths:
+        print(f"Wrote {os.path.relpath(path, FIXTURES_DIR)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""
+Compare concurrent-request throughput of the Flask and ASGI serving modes.
+
+Both servers are started as subprocesses against the local stub upstream
+(``benchmarks.stub_server``), each with an empty cache directory, the rate
+limiter opened up and an upstream connection pool large enough for the load,
+and receive the same burst of concurrent analyze requests. Every request asks
+for a different player, so each one waits on the stub's latency instead of
+being answered from the caches.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.load_test --requests 200 --concurrency 50 --latency 0.5
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.stub_server import StubServer, game_log_page
+from src.main import get_current_season
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVER_COMMANDS = {
+    'flask': [sys.executable, '-m', 'flask', '--app', 'src.api', 'run', '--port', '{port}', '--with-threads'],
+    'asgi': [sys.executable, '-m', 'uvicorn', 'src.asgi:app', '--port', '{port}', '--log-level', 'warning'],
+}
+
+
+def player_id(i: int) -> str:
+    return f"loadtest{i:05d}"
+
+
+def start_server(mode: str, port: int, upstream_url: str, cache_dir: str, pool_size: int) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        NBAPROPS_BASE_URL=upstream_url,
+        NBAPROPS_CACHE_DIR=cache_dir,
+        NBAPROPS_RATE_LIMIT_RPM='1000000',
+        NBAPROPS_RATE_LIMIT_BURST='100000',
+        NBAPROPS_HTTP_POOL_SIZE=str(pool_size),
+    )
+    command = [part.format(port=port) for part in SERVER_COMMANDS[mode]]
+    return subprocess.Popen(command, cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_until_ready(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/api/test", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not start within {timeout:.0f}s")
+
+
+async def run_load(base_url: str, requests: int, concurrency: int, seasons: str) -> Dict[str, float]:
+    """Send ``requests`` analyze requests, at most ``concurrency`` at a time."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one(client: httpx.AsyncClient, i: int):
+        nonlocal errors
+        body = {"playerName": f"Load Test {i}", "playerId": player_id(i), "seasons": seasons,
+                "gamesCount": 10, "betLines": {"points": 20.5}}
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await client.post(f"{base_url}/api/player/analyze", json=body)
+                if response.status_code != 200 or 'stats' not in response.json():
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(timeout=120.0, limits=limits) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(one(client, i) for i in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'elapsed': elapsed,
+        'throughput': requests / elapsed,
+        'p50': statistics.median(latencies),
+        'p95': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        'errors': errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the Flask and ASGI serving modes')
+    parser.add_argument('--requests', type=int, default=200, help='Total number of analyze requests')
+    parser.add_argument('--concurrency', type=int, default=50, help='Requests in flight at once')
+    parser.add_argument('--latency', type=float, default=0.5, help='Seconds the stub upstream takes per page')
+    parser.add_argument('--seasons', choices=['current', 'both'], default='current',
+                        help='Seasons per analysis (each season is one upstream page)')
+    parser.add_argument('--modes', nargs='+', choices=list(SERVER_COMMANDS), default=list(SERVER_COMMANDS),
+                        help='Serving modes to test')
+    parser.add_argument('--port', type=int, default=5055, help='Port for the server under test')
+    args = parser.parse_args()
+
+    # Build the stub's pages up front so the load test process does not compete for CPU
+    seasons = [get_current_season()] if args.seasons == 'current' else [get_current_season(), get_current_season() - 1]
+    for i in range(args.requests):
+        for season in seasons:
+            game_log_page(player_id(i), season)
+
+    upstream = StubServer(latency=args.latency).start()
+    print(f"Stub upstream on {upstream.url} with {args.latency}s latency; "
+          f"{args.requests} requests, {args.concurrency} concurrent\n")
+    print(f"{'mode':<8}{'elapsed (s)':>14}{'req/s':>10}{'p50 (s)':>10}{'p95 (s)':>10}{'errors':>8}")
+
+    try:
+        for mode in args.modes:
+            with tempfile.TemporaryDirectory() as cache_dir:
+                server = start_server(mode, args.port, upstream.url, cache_dir, args.concurrency * 2)
+                try:
+                    base_url = f"http://127.0.0.1:{args.port}"
+                    wait_until_ready(base_url)
+                    result = asyncio.run(run_load(base_url, args.requests, args.concurrency, args.seasons))
+                finally:
+                    server.terminate()
+                    server.wait(timeout=10)
+            print(f"{mode:<8}{result['elapsed']:>14.2f}{result['throughput']:>10.1f}"
+                  f"{result['p50']:>10.2f}{result['p95']:>10.2f}{result['errors']:>8d}")
+    finally:
+        upstream.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
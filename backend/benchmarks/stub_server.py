@@ -0,0 +1,132 @@
+"""
+Local stand-in for basketball-reference.com used by the offline benchmarks.
+
+Game log and search result pages are served from the recorded fixtures when
+present and are synthesized otherwise, so any player ID, season or search query
+can be requested. A fixed
+latency is added to every response to mimic the real site. Point the API at the
+stub with ``NBAPROPS_BASE_URL``:
+
+    python -m benchmarks.stub_server --port 8765 --latency 0.3
+    NBAPROPS_BASE_URL=http://127.0.0.1:8765 python -m src.api
+"""
+import argparse
+import os
+import re
+import sys
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.fixtures import fixture_path, search_fixture_path, synthesize_game_log, synthesize_search_page
+
+GAME_LOG_PATH = re.compile(r'^/players/[a-z]/([a-z0-9]+)/gamelog/(\d{4})$')
+SEARCH_PATH = '/search/search.fcgi'
+
+
+@lru_cache(maxsize=1024)
+def game_log_page(player_id: str, season: int) -> bytes:
+    """Get a game log page from the fixtures, or synthesize one."""
+    path = fixture_path(f"/players/{player_id[0]}/{player_id}/gamelog/{season}")
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            return f.read()
+    return synthesize_game_log(player_id, season).encode('utf-8')
+
+
+@lru_cache(maxsize=1024)
+def search_page(query: str) -> bytes:
+    """Get a search results page from the fixtures, or synthesize one."""
+    path = search_fixture_path(query)
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            return f.read()
+    return synthesize_search_page(query).encode('utf-8')
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        self.server.count_request()
+
+        url = urlsplit(self.path)
+        match = GAME_LOG_PATH.match(url.path)
+        if match:
+            self._send(200, game_log_page(match.group(1), int(match.group(2))))
+            return
+
+        if url.path == SEARCH_PATH:
+            self._send(200, search_page(parse_qs(url.query).get('search', [''])[0]))
+            return
+
+        path = fixture_path(self.path)
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                self._send(200, f.read())
+            return
+
+        self._send(404, b'<html><body>Page not found</body></html>')
+
+    def _send(self, status: int, body: bytes):
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    """Threaded stub server with a per-response latency and a request counter."""
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, latency: float = 0.3):
+        super().__init__(('127.0.0.1', port), StubHandler)
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def start(self) -> 'StubServer':
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, name='stub-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve basketball-reference.com fixtures locally')
+    parser.add_argument('--port', type=int, default=8765, help='Port to listen on')
+    parser.add_argument('--latency', type=float, default=0.3, help='Seconds added to every response')
+    args = parser.parse_args()
+
+    server = StubServer(args.port, args.latency)
+    print(f"Serving fixtures on {server.url} with {args.latency}s latency")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,600 @@
+import asyncio
+import re
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.analysis_cache import AnalysisCache, CachedAnalysis
+from src.analytics import RollingWindows, SplitWindows, ewma, parse_windows, per_36, rest_days, split_masks, to_json_values
+from src.instrumentation import timed
+from src.main import get_current_season, generate_season_years
+from src.scrapers.basketball_reference import BasketballReferenceScaper
+from src.scrapers.game_log_store import GameLogQuery
+from src.serialization import game_log_columns, game_log_records
+from src.stat_expressions import StatExpression, evaluate_stats, parse_stat_expression
+from src.stats import calculate_stats, parse_bet_lines
+
+# Stat categories analyzed for prop bets in every analysis
+STAT_CATEGORIES = ['points', 'rebounds', 'assists']
+
+# Most stats (categories, combos and extra stats) analyzed in one request
+MAX_STATS = 50
+
+# Most games (gamesCount) and days (lastDays) one request can cover
+MAX_GAMES = 500
+MAX_LAST_DAYS = 3 * 366
+
+# Rolling windows (in games) and EWMA span of analytics requests that do not set them
+DEFAULT_WINDOWS = [5, 10, 20]
+DEFAULT_EWMA_SPAN = 10.0
+
+# Largest rolling window, and the most games analytics are computed over
+MAX_WINDOW = 82
+MAX_ANALYTICS_GAMES = MAX_GAMES
+
+
+class AnalysisError(Exception):
+    """An analysis request that cannot be served, with the HTTP status to report"""
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class AnalysisRequest(NamedTuple):
+    """Validated parameters of one analysis request"""
+    player_name: str
+    player_id: Optional[str]
+    opponent: Optional[str]
+    location: str
+    games_count: int
+    season_years: List[int]
+    bet_lines: List[np.ndarray]
+    # Optional date range ("YYYY-MM-DD"), inclusive
+    since: Optional[str] = None
+    until: Optional[str] = None
+    # Analyzed stats, one per bet line array
+    stats: Tuple[StatExpression, ...] = tuple(parse_stat_expression(category) for category in STAT_CATEGORIES)
+
+
+class AnalyticsRequest(NamedTuple):
+    """Validated parameters of one analytics request"""
+    analysis: AnalysisRequest
+    windows: List[int]
+    ewma_span: float
+
+
+def get_season_years(seasons_option):
+    """
+    Get the season years for the "seasons" option of an analysis request
+    """
+    if seasons_option == 'current':
+        return [get_current_season()]
+    return generate_season_years(2)  # current and previous season
+
+
+def parse_analysis_request(data) -> AnalysisRequest:
+    """
+    Validate the body of an analysis request.
+
+    Raises AnalysisError for invalid requests.
+    """
+    if not isinstance(data, dict):
+        raise AnalysisError("The request must be a JSON object", 400)
+    if not data.get('playerName'):
+        raise AnalysisError("Player name is required", 400)
+    if not isinstance(data['playerName'], str):
+        raise AnalysisError("Player name must be a string", 400)
+    if data.get('playerId') is not None and not isinstance(data['playerId'], str):
+        raise AnalysisError("playerId must be a string", 400)
+
+    # Extract player name without years in parentheses
+    player_name = data.get('playerName')
+    # Remove any text in parentheses, typically years like "(2019-2025)"
+    player_name = re.sub(r'\s*\([^)]*\)', '', player_name).strip()
+
+    opponent = data.get('opponent', None)
+    if opponent == 'ANY':
+        opponent = None
+
+    # Get bet lines from request. Each line may be a number, a list of
+    # numbers or a {"start", "stop", "step"} ladder.
+    bet_lines = data.get('betLines') or {}
+    if not isinstance(bet_lines, dict):
+        raise AnalysisError("betLines must be an object of stat names to lines", 400)
+    extra_stats = data.get('stats') or []
+    if not isinstance(extra_stats, (str, list)):
+        raise AnalysisError("stats must be a stat name or a list of them", 400)
+    stats = parse_stats(list(bet_lines) + ([extra_stats] if isinstance(extra_stats, str) else list(extra_stats)))
+    try:
+        lines = [parse_bet_lines(bet_lines.get(stat.name, 0)) for stat in stats]
+    except ValueError as e:
+        raise AnalysisError(str(e), 400)
+
+    # "lastDays": 30 is a shortcut for games since 30 days ago
+    since = parse_date(data.get('since'), 'since')
+    if data.get('lastDays') is not None:
+        last_days = parse_count(data['lastDays'], 'lastDays', 0, MAX_LAST_DAYS)
+        since = (pd.Timestamp.today().normalize() - pd.Timedelta(days=last_days)).strftime('%Y-%m-%d')
+
+    return AnalysisRequest(
+        player_name=player_name,
+        player_id=data.get('playerId'),
+        opponent=opponent,
+        location=data.get('location', 'ANY'),
+        games_count=parse_count(data.get('gamesCount', 10), 'gamesCount', 1, MAX_GAMES),
+        # Generate season years based on request
+        season_years=get_season_years(data.get('seasons', 'current')),
+        bet_lines=lines,
+        since=since,
+        until=parse_date(data.get('until'), 'until'),
+        stats=stats
+    )
+
+
+def parse_count(value, field, minimum, maximum) -> int:
+    """
+    Validate a whole number option of an analysis request.
+
+    Raises AnalysisError if the value is not a number in ``[minimum, maximum]``.
+    """
+    try:
+        if isinstance(value, bool):
+            raise TypeError(value)
+        count = int(value)
+    except (TypeError, ValueError, OverflowError):
+        raise AnalysisError(f"{field} must be a number, got {value!r}", 400)
+    if not minimum <= count <= maximum:
+        raise AnalysisError(f"{field} must be between {minimum} and {maximum}", 400)
+    return count
+
+
+def parse_stats(names: List[Any]) -> Tuple[StatExpression, ...]:
+    """
+    Parse the stats of an analysis request: ``STAT_CATEGORIES`` followed by the
+    other stats with bet lines or listed in ``stats`` (e.g., "pts+trb+ast", "PRA"
+    or "fg3"; see ``parse_stat_expression``).
+
+    Raises AnalysisError for unknown stats or too many of them.
+    """
+    if not all(isinstance(name, str) for name in names):
+        raise AnalysisError("Stats must be names or expressions such as \"pts+trb+ast\"", 400)
+    names = list(dict.fromkeys(STAT_CATEGORIES + names))
+    if len(names) > MAX_STATS:
+        raise AnalysisError(f"At most {MAX_STATS} stats can be analyzed per request", 400)
+    try:
+        return tuple(parse_stat_expression(name) for name in names)
+    except ValueError as e:
+        raise AnalysisError(str(e), 400)
+
+
+def parse_analytics_request(data) -> AnalyticsRequest:
+    """
+    Validate the body of an analytics request.
+
+    Takes the player, seasons and filters of an analysis request; ``gamesCount``
+    defaults to every game (up to ``MAX_ANALYTICS_GAMES``).
+
+    Raises AnalysisError for invalid requests.
+    """
+    analysis = parse_analysis_request(data)
+    try:
+        windows = parse_windows(data.get('windows'), DEFAULT_WINDOWS, MAX_WINDOW)
+    except ValueError as e:
+        raise AnalysisError(str(e), 400)
+    games_count = parse_count(data.get('gamesCount', MAX_ANALYTICS_GAMES), 'gamesCount', 1, MAX_ANALYTICS_GAMES)
+    try:
+        ewma_span = float(data.get('ewmaSpan', DEFAULT_EWMA_SPAN))
+    except (TypeError, ValueError, OverflowError):
+        raise AnalysisError("ewmaSpan must be a number", 400)
+    if not np.isfinite(ewma_span) or ewma_span < 1:
+        raise AnalysisError("ewmaSpan must be at least 1", 400)
+    return AnalyticsRequest(analysis._replace(games_count=games_count), windows, ewma_span)
+
+
+def parse_date(value, field) -> Optional[str]:
+    """
+    Validate an optional date of an analysis request.
+
+    Raises AnalysisError if the value is not a date.
+    """
+    if value is None or value == '':
+        return None
+    try:
+        return pd.Timestamp(value).strftime('%Y-%m-%d')
+    except (TypeError, ValueError):
+        raise AnalysisError(f"Invalid {field} date: {value!r}", 400)
+
+
+def summarize_games(analysis: AnalysisRequest, games_df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Build the analysis response for the games returned by the scraper.
+
+    Raises AnalysisError when no games match the filters.
+    """
+    if games_df.empty:
+        # If no data found, return a user-friendly error message
+        raise AnalysisError(f"No games found for {analysis.player_name} with the specified filters.", 404)
+
+    with timed('stats'):
+        # Transform data to match frontend expectations, one column at a time
+        columns = game_log_columns(games_df)
+        game_logs = game_log_records(columns)
+
+        # Evaluate every stat and combo, then calculate statistics for all of them in one pass
+        values = evaluate_stats(games_df, analysis.stats)
+        stats = dict(zip((stat.name for stat in analysis.stats), calculate_stats(values, analysis.bet_lines)))
+
+    # Return the analyzed data
+    return {
+        "playerName": analysis.player_name,
+        "gameLogs": game_logs,
+        "stats": stats
+    }
+
+
+def summarize_analytics(analytics: AnalyticsRequest, games_df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Build the analytics response for the games returned by the scraper.
+
+    Per-game series (rolling means, standard deviations and per-36 rates for each
+    window, and the EWMA) are in chronological order, aligned with ``dates``.
+    Splits are reported over all games and over the last N games of each window.
+
+    Raises AnalysisError when no games match the filters.
+    """
+    analysis = analytics.analysis
+    if games_df.empty:
+        raise AnalysisError(f"No games found for {analysis.player_name} with the specified filters.", 404)
+
+    with timed('stats'):
+        # Oldest game first, one column per stat
+        games_df = games_df.iloc[::-1]
+        columns = game_log_columns(games_df)
+        values = evaluate_stats(games_df, analysis.stats)
+        names = [stat.name for stat in analysis.stats]
+        minutes = columns['minutes']
+
+        rolling = RollingWindows(values, minutes)
+        series = {window: (rolling.mean(window), rolling.std(window), rolling.per_36(window))
+                  for window in analytics.windows}
+        averages = ewma(values, analytics.ewma_span)
+        overall = {"average": values.mean(axis=0), "std": values.std(axis=0), "per36": per_36(values, minutes)}
+
+        stats = {}
+        for j, stat in enumerate(names):
+            stats[stat] = {
+                **{name: round_value(summary[j]) for name, summary in overall.items()},
+                "ewma": to_json_values(averages[:, j]),
+                "rolling": {
+                    str(window): {"mean": to_json_values(means[:, j]), "std": to_json_values(stds[:, j]),
+                                  "per36": to_json_values(rates[:, j])}
+                    for window, (means, stds, rates) in series.items()
+                },
+            }
+
+        splits = SplitWindows(values, minutes, split_masks(columns['location'], rest_days(columns['date'])))
+        split_windows = {"all": splits.summarize()}
+        split_windows.update((str(window), splits.summarize(window)) for window in analytics.windows)
+
+    return {
+        "playerName": analysis.player_name,
+        "games": len(values),
+        "dates": columns['date'].tolist(),
+        "windows": analytics.windows,
+        "ewmaSpan": analytics.ewma_span,
+        "stats": stats,
+        "splits": {
+            window: {
+                split: {"games": summary["games"],
+                        **{stat: {name: round_value(summary[name][j]) for name in ('average', 'std', 'per36')}
+                           for j, stat in enumerate(names)}}
+                for split, summary in summaries.items()
+            }
+            for window, summaries in split_windows.items()
+        },
+    }
+
+
+def round_value(value, decimals: int = 2) -> Optional[float]:
+    """Round a statistic for a response, with NaN as None"""
+    value = float(value)
+    return None if np.isnan(value) else round(value, decimals)
+
+
+def resolve_player(analysis: AnalysisRequest, scraper) -> AnalysisRequest:
+    """
+    Fill in the verified player ID of an analysis request.
+
+    Raises AnalysisError if the name cannot be resolved.
+    """
+    # Use the player ID if provided, otherwise resolve the name to a verified ID
+    player_id = analysis.player_id or scraper.resolve_player_id(analysis.player_name)
+    if not player_id:
+        raise AnalysisError(f"Could not find a player named {analysis.player_name}.", 404)
+    return analysis._replace(player_id=player_id)
+
+
+def location_filter(analysis: AnalysisRequest) -> Optional[str]:
+    """Get the game location to filter by, or None for any location"""
+    return None if analysis.location == 'ANY' else analysis.location
+
+
+def season_games_query(analysis: AnalysisRequest) -> GameLogQuery:
+    """Get the query for the games of one season that an analysis request can use"""
+    return BasketballReferenceScaper.games_query(analysis.games_count, opponent=analysis.opponent,
+                                                 location=location_filter(analysis), since=analysis.since,
+                                                 until=analysis.until)
+
+
+def summarize_season(season: int, games_df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Build the progress report of one season of a streamed analysis: the season's
+    games matching the request, in the same format as the response's ``gameLogs``.
+    """
+    game_logs = game_log_records(game_log_columns(games_df)) if not games_df.empty else []
+    return {"season": season, "games": len(game_logs), "gameLogs": game_logs}
+
+
+def fetch_games(analysis: AnalysisRequest, scraper) -> pd.DataFrame:
+    """Get the games matching an analysis request's opponent, location, dates, seasons and games count"""
+    if analysis.opponent:
+        return scraper.get_games_against_opponent(
+            player_name=analysis.player_name,
+            opponent=analysis.opponent,
+            seasons=analysis.season_years,
+            last_n_games=analysis.games_count,
+            player_id=analysis.player_id,
+            location=location_filter(analysis),
+            since=analysis.since,
+            until=analysis.until
+        )
+    return scraper.get_recent_games(
+        player_name=analysis.player_name,
+        seasons=analysis.season_years,
+        last_n_games=analysis.games_count,
+        player_id=analysis.player_id,
+        location=location_filter(analysis),
+        since=analysis.since,
+        until=analysis.until
+    )
+
+
+def run_cached_analysis(data, scraper, cache: AnalysisCache) -> CachedAnalysis:
+    """
+    Analyze player performance for one analysis request, reusing a cached
+    response while the game logs it was computed from are unchanged.
+
+    Raises AnalysisError for invalid requests or when no games match.
+    """
+    analysis = resolve_player(parse_analysis_request(data), scraper)
+    return get_cached_result(analysis, analysis_cache_key(analysis), summarize_games, scraper, cache)
+
+
+def run_cached_analytics(data, scraper, cache: AnalysisCache) -> CachedAnalysis:
+    """
+    Compute rolling-window and split analytics for one analytics request,
+    reusing a cached response while its game logs are unchanged.
+
+    Raises AnalysisError for invalid requests or when no games match.
+    """
+    analytics = parse_analytics_request(data)
+    analytics = analytics._replace(analysis=resolve_player(analytics.analysis, scraper))
+    return get_cached_result(analytics.analysis, analytics_cache_key(analytics),
+                             lambda analysis, games_df: summarize_analytics(analytics, games_df), scraper, cache)
+
+
+def get_cached_result(analysis: AnalysisRequest, key: str,
+                      summarize: Callable[[AnalysisRequest, pd.DataFrame], Dict[str, Any]],
+                      scraper, cache: AnalysisCache) -> CachedAnalysis:
+    """
+    Get a cached response, computing it from the request's games with
+    ``summarize`` if it is missing or its game logs have new games.
+    """
+    cached = cache.get(key, scraper.game_log_generation, allow_expired=True)
+    if cached is not None and cached.is_expired:
+        # Pick up new games; the response is only recomputed if any were added
+        for season in open_seasons(analysis, scraper):
+            scraper.get_game_log_by_id(analysis.player_id, season, columns=['date_game'])
+        cached = revalidate_analysis(cache, key, cached, analysis, scraper)
+    if cached is None:
+        result = summarize(analysis, fetch_games(analysis, scraper))
+        cached = store_analysis(cache, key, analysis, result, scraper)
+    return cached
+
+
+async def resolve_player_async(analysis: AnalysisRequest, scraper) -> AnalysisRequest:
+    """Same as ``resolve_player``, for ``AsyncBasketballReferenceScraper``."""
+    player_id = analysis.player_id or await scraper.resolve_player_id(analysis.player_name)
+    if not player_id:
+        raise AnalysisError(f"Could not find a player named {analysis.player_name}.", 404)
+    return analysis._replace(player_id=player_id)
+
+
+async def fetch_games_async(analysis: AnalysisRequest, scraper) -> pd.DataFrame:
+    """Same as ``fetch_games``, for ``AsyncBasketballReferenceScraper``."""
+    if analysis.opponent:
+        return await scraper.get_games_against_opponent(
+            player_name=analysis.player_name,
+            opponent=analysis.opponent,
+            seasons=analysis.season_years,
+            last_n_games=analysis.games_count,
+            player_id=analysis.player_id,
+            location=location_filter(analysis),
+            since=analysis.since,
+            until=analysis.until
+        )
+    return await scraper.get_recent_games(
+        player_name=analysis.player_name,
+        seasons=analysis.season_years,
+        last_n_games=analysis.games_count,
+        player_id=analysis.player_id,
+        location=location_filter(analysis),
+        since=analysis.since,
+        until=analysis.until
+    )
+
+
+async def run_cached_analysis_async(data, scraper, cache: AnalysisCache) -> CachedAnalysis:
+    """Same as ``run_cached_analysis``, for ``AsyncBasketballReferenceScraper``."""
+    analysis = await resolve_player_async(parse_analysis_request(data), scraper)
+    return await get_cached_result_async(analysis, analysis_cache_key(analysis), summarize_games, scraper, cache)
+
+
+async def run_cached_analytics_async(data, scraper, cache: AnalysisCache) -> CachedAnalysis:
+    """Same as ``run_cached_analytics``, for ``AsyncBasketballReferenceScraper``."""
+    analytics = parse_analytics_request(data)
+    analytics = analytics._replace(analysis=await resolve_player_async(analytics.analysis, scraper))
+    return await get_cached_result_async(analytics.analysis, analytics_cache_key(analytics),
+                                         lambda analysis, games_df: summarize_analytics(analytics, games_df),
+                                         scraper, cache)
+
+
+async def get_cached_result_async(analysis: AnalysisRequest, key: str,
+                                  summarize: Callable[[AnalysisRequest, pd.DataFrame], Dict[str, Any]],
+                                  scraper, cache: AnalysisCache) -> CachedAnalysis:
+    """
+    Same as ``get_cached_result``, for ``AsyncBasketballReferenceScraper``.
+
+    The cache lookups and stores read game log metadata from disk (and may use a
+    SQLite cache file), so they run in worker threads, as does ``summarize``.
+    """
+    cached = await asyncio.to_thread(cache.get, key, scraper.game_log_generation, allow_expired=True)
+    if cached is not None and cached.is_expired:
+        seasons = await asyncio.to_thread(open_seasons, analysis, scraper)
+        await asyncio.gather(*(scraper.get_game_log_by_id(analysis.player_id, season, columns=['date_game'])
+                               for season in seasons))
+        cached = await asyncio.to_thread(revalidate_analysis, cache, key, cached, analysis, scraper)
+    if cached is None:
+        games_df = await fetch_games_async(analysis, scraper)
+        result = await asyncio.to_thread(summarize, analysis, games_df)
+        cached = await asyncio.to_thread(store_analysis, cache, key, analysis, result, scraper)
+    return cached
+
+
+def analysis_cache_key(analysis: AnalysisRequest) -> str:
+    """Build the analysis cache key from the canonicalized request parameters"""
+    return AnalysisCache.make_key({
+        **games_key_params(analysis),
+        "stats": [stat.name for stat in analysis.stats],
+        "betLines": [lines.tolist() for lines in analysis.bet_lines],
+    })
+
+
+def analytics_cache_key(analytics: AnalyticsRequest) -> str:
+    """Build the analytics cache key from the canonicalized request parameters"""
+    return AnalysisCache.make_key({
+        **games_key_params(analytics.analysis),
+        "report": "analytics",
+        "stats": [stat.name for stat in analytics.analysis.stats],
+        "windows": analytics.windows,
+        "ewmaSpan": analytics.ewma_span,
+    })
+
+
+def games_key_params(analysis: AnalysisRequest) -> Dict[str, Any]:
+    """Get the cache key parameters that select a request's games"""
+    return {
+        "playerName": analysis.player_name,
+        "playerId": analysis.player_id,
+        "opponent": analysis.opponent,
+        "location": analysis.location,
+        "gamesCount": analysis.games_count,
+        "since": analysis.since,
+        "until": analysis.until,
+        "seasons": analysis.season_years,
+    }
+
+
+def store_analysis(cache: AnalysisCache, key: str, analysis: AnalysisRequest, result, scraper) -> CachedAnalysis:
+    """
+    Cache a computed analysis with the versions of the game logs it used.
+
+    Analyses that use a game log that is not final yet (see ``open_seasons``) also
+    expire, so that log is checked for new games before the analysis is reused.
+    """
+    dependencies = [(analysis.player_id, season, scraper.game_log_generation(analysis.player_id, season))
+                    for season in analysis.season_years]
+    return cache.put(key, result, dependencies, analysis_ttl(analysis, scraper))
+
+
+def revalidate_analysis(cache: AnalysisCache, key: str, cached: CachedAnalysis, analysis: AnalysisRequest,
+                        scraper) -> Optional[CachedAnalysis]:
+    """Renew an expired cached analysis if the game logs it used are unchanged (see ``AnalysisCache.revalidate``)"""
+    return cache.revalidate(key, cached, scraper.game_log_generation, analysis_ttl(analysis, scraper))
+
+
+def open_seasons(analysis: AnalysisRequest, scraper) -> List[int]:
+    """
+    Get the requested seasons whose game logs can still change.
+
+    That is decided by the stored logs, which record whether they were fetched
+    after their season ended, not by today's date: a log stored during its season
+    stays open until it has been refreshed once after the season rolled over.
+    Seasons without a stored log are open too.
+    """
+    return [season for season in analysis.season_years
+            if not scraper.game_log_is_final(analysis.player_id, season)]
+
+
+def analysis_ttl(analysis: AnalysisRequest, scraper) -> Optional[float]:
+    """Get how long a cached analysis stays valid before its game logs are checked for new games"""
+    return BasketballReferenceScaper.CURRENT_SEASON_TTL if open_seasons(analysis, scraper) else None
+
+
+def fallback_analysis(player_name):
+    """Mock analysis returned when an unexpected error prevents a real one"""
+    return {
+        "playerName": player_name,
+        "gameLogs": [
+            {
+                "date": "2025-03-08",
+                "opponent": "BOS",
+                "location": "H",
+                "points": 22.0,
+                "rebounds": 14.0,
+                "assists": 9.0,
+                "minutes": 36.0,
+                "result": "W"
+            },
+            {
+                "date": "2025-03-06",
+                "opponent": "NYK",
+                "location": "A",
+                "points": 31.0,
+                "rebounds": 12.0,
+                "assists": 8.0,
+                "minutes": 38.0,
+                "result": "L"
+            }
+        ],
+        "stats": {
+            "points": {
+                "average": 28.3,
+                "median": 27.5,
+                "min": 17.0,
+                "max": 40.0,
+                "overPercentage": 60.0,
+                "lastFiveAvg": 28.4,
+                "trend": "up"
+            },
+            "rebounds": {
+                "average": 10.5,
+                "median": 10.5,
+                "min": 5.0,
+                "max": 17.0,
+                "overPercentage": 70.0,
+                "lastFiveAvg": 12.0,
+                "trend": "stable"
+            },
+            "assists": {
+                "average": 6.4,
+                "median": 6.0,
+                "min": 3.0,
+                "max": 11.0,
+                "overPercentage": 40.0,
+                "lastFiveAvg": 5.8,
+                "trend": "down"
+            }
+        }
+    }
@@ -0,0 +1,306 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from src.instrumentation import record_cache
+from src.serialization import dumps, loads
+
+DEFAULT_MAX_ENTRIES = 1024
+
+# (player_id, season, generation of the stored game log or None)
+Dependency = Tuple[str, int, Optional[str]]
+
+
+class CachedAnalysis(NamedTuple):
+    """A computed analysis response and the game log versions it was computed from"""
+    result: Dict[str, Any]
+    # The result serialized to JSON, so cache hits skip the encoding
+    body: bytes
+    etag: str
+    dependencies: List[Dependency]
+    expires_at: Optional[float]
+
+    @property
+    def is_final(self) -> bool:
+        """Whether the analysis only depends on final game logs and never expires."""
+        return self.expires_at is None
+
+    @property
+    def is_expired(self) -> bool:
+        """Whether the current-season game logs must be checked for new games before reuse."""
+        return self.expires_at is not None and time.time() > self.expires_at
+
+
+class AnalysisCache:
+    """
+    LRU cache of computed analysis responses keyed by the canonical request.
+
+    Each entry records the generation of every stored game log it was computed
+    from. A lookup re-reads those generations, so an entry is dropped as soon as
+    new game data lands in the store. Entries that depend on game logs that are not
+    final yet also expire after ``ttl`` seconds; once those logs have been
+    refreshed, ``revalidate`` keeps the entry (and its ETag) if no games were added.
+    Whether an entry is final is decided when it is stored or revalidated.
+
+    Entries are kept in memory; if ``path`` is given they are also written to a
+    SQLite file, so several processes (e.g. multiple API workers) share them.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, path: Optional[str] = None):
+        """
+        Args:
+            max_entries: Maximum number of entries kept in memory (and in the file)
+            path: Optional path of a SQLite file shared between processes
+        """
+        self.max_entries = max_entries
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.revalidations = 0
+
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[str, CachedAnalysis]' = OrderedDict()
+        self._conn = None
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS analyses (
+                    key TEXT PRIMARY KEY,
+                    body BLOB NOT NULL,
+                    etag TEXT NOT NULL,
+                    dependencies TEXT NOT NULL,
+                    expires_at REAL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute('CREATE INDEX IF NOT EXISTS analyses_accessed_at ON analyses (accessed_at)')
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(params: Dict[str, Any]) -> str:
+        """
+        Build a cache key from canonicalized request parameters.
+
+        Args:
+            params: JSON-serializable request parameters
+
+        Returns:
+            Hex digest of the parameters serialized with sorted keys
+        """
+        canonical = json.dumps(params, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def get(self, key: str, generation: Callable[[str, int], Optional[str]],
+            allow_expired: bool = False) -> Optional[CachedAnalysis]:
+        """
+        Look up a valid entry.
+
+        Args:
+            key: Cache key (see ``make_key``)
+            generation: Function returning the current generation of a stored game
+                        log for (player_id, season), or None if it is not stored
+            allow_expired: Return expired entries (see ``CachedAnalysis.is_expired``)
+                           so the caller can ``revalidate`` them
+
+        Returns:
+            Cached analysis, or None if there is no entry or it is out of date
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None:
+            entry = self._load(key)
+
+        if entry is None:
+            self._record('miss')
+            return None
+
+        expired = entry.is_expired and not allow_expired
+        if expired or not self._is_current(entry, generation):
+            self.invalidate(key)
+            self._record('miss', invalidated=True)
+            return None
+
+        # Expired entries are counted when they are revalidated
+        if not entry.is_expired:
+            self._record('hit')
+        return entry
+
+    def put(self, key: str, result: Dict[str, Any], dependencies: List[Dependency],
+            ttl: Optional[float] = None) -> CachedAnalysis:
+        """
+        Store a computed analysis.
+
+        Args:
+            key: Cache key (see ``make_key``)
+            result: Analysis response
+            dependencies: Game logs the result was computed from, with their generations
+            ttl: Seconds until the entry expires, or None to keep it until a dependency changes
+
+        Returns:
+            The stored entry, including its ETag
+        """
+        body = dumps(result)
+        etag = hashlib.sha1(body).hexdigest()
+        expires_at = time.time() + ttl if ttl is not None else None
+        entry = CachedAnalysis(result, body, etag, [tuple(dependency) for dependency in dependencies], expires_at)
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+            if self._conn is not None:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO analyses (key, body, etag, dependencies, expires_at, accessed_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (key, sqlite3.Binary(body), etag, json.dumps(entry.dependencies), expires_at, time.time())
+                )
+                self._evict()
+                self._conn.commit()
+
+        return entry
+
+    def revalidate(self, key: str, entry: CachedAnalysis, generation: Callable[[str, int], Optional[str]],
+                   ttl: Optional[float]) -> Optional[CachedAnalysis]:
+        """
+        Renew an expired entry after its game logs have been brought up to date.
+
+        Args:
+            key: Cache key (see ``make_key``)
+            entry: Expired entry returned by ``get``
+            generation: Function returning the current generation of a stored game log
+            ttl: Seconds until the renewed entry expires again
+
+        Returns:
+            The renewed entry with the same body and ETag, or None if a game log
+            changed and the analysis has to be recomputed
+        """
+        if not self._is_current(entry, generation):
+            self.invalidate(key)
+            self._record('miss', invalidated=True)
+            return None
+
+        expires_at = time.time() + ttl if ttl is not None else None
+        entry = entry._replace(expires_at=expires_at)
+        with self._lock:
+            self._entries[key] = entry
+            if self._conn is not None:
+                self._conn.execute('UPDATE analyses SET expires_at = ?, accessed_at = ? WHERE key = ?',
+                                   (expires_at, time.time(), key))
+                self._conn.commit()
+        self._record('revalidated')
+        return entry
+
+    def invalidate(self, key: str) -> None:
+        """Remove an entry."""
+        with self._lock:
+            self._entries.pop(key, None)
+            if self._conn is not None:
+                self._conn.execute('DELETE FROM analyses WHERE key = ?', (key,))
+                self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            if self._conn is not None:
+                self._conn.execute('DELETE FROM analyses')
+                self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss counters and the number of entries in memory."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'invalidations': self.invalidations,
+                    'revalidations': self.revalidations, 'entries': len(self._entries)}
+
+    def _record(self, result: str, invalidated: bool = False) -> None:
+        """
+        Count a lookup.
+
+        Args:
+            result: "hit", "miss" or "revalidated" (which also counts as a hit)
+            invalidated: Whether the lookup dropped an out-of-date entry
+        """
+        with self._lock:
+            if result == 'miss':
+                self.misses += 1
+            else:
+                self.hits += 1
+            if result == 'revalidated':
+                self.revalidations += 1
+            if invalidated:
+                self.invalidations += 1
+        record_cache('analysis', result)
+
+    @staticmethod
+    def _is_current(entry: CachedAnalysis, generation: Callable[[str, int], Optional[str]]) -> bool:
+        """Check that every game log the entry depends on is unchanged."""
+        return all(generation(player_id, season) == stored for player_id, season, stored in entry.dependencies)
+
+    def _load(self, key: str) -> Optional[CachedAnalysis]:
+        """Read an entry from the shared file into memory."""
+        if self._conn is None:
+            return None
+
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT body, etag, dependencies, expires_at FROM analyses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute('UPDATE analyses SET accessed_at = ? WHERE key = ?', (time.time(), key))
+            self._conn.commit()
+
+            body, etag, dependencies, expires_at = row
+            body = bytes(body)
+            entry = CachedAnalysis(loads(body), body, etag, [tuple(d) for d in json.loads(dependencies)], expires_at)
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def _evict(self) -> None:
+        """Delete least recently used rows until the file holds ``max_entries``. Must hold the lock."""
+        count = self._conn.execute('SELECT COUNT(*) FROM analyses').fetchone()[0]
+        if count > self.max_entries:
+            self._conn.execute(
+                'DELETE FROM analyses WHERE key IN (SELECT key FROM analyses ORDER BY accessed_at LIMIT ?)',
+                (count - self.max_entries,)
+            )
+
+
+_shared_cache: Optional[AnalysisCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_analysis_cache() -> AnalysisCache:
+    """
+    Get the process-wide analysis cache, creating it on first use.
+
+    The number of entries can be configured with ``NBAPROPS_ANALYSIS_CACHE_SIZE``.
+    Setting ``NBAPROPS_ANALYSIS_CACHE_FILE`` shares the cache across processes.
+
+    Returns:
+        Shared analysis cache
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = AnalysisCache(
+                max_entries=int(os.environ.get('NBAPROPS_ANALYSIS_CACHE_SIZE', DEFAULT_MAX_ENTRIES)),
+                path=os.environ.get('NBAPROPS_ANALYSIS_CACHE_FILE') or None,
+            )
+        return _shared_cache
@@ -0,0 +1,319 @@
+"""
+Rolling-window and split analytics over a player's game log arrays.
+
+The functions take arrays in chronological order (oldest game first) with one
+row per game and one column per stat. Window statistics come from prefix sums
+(cumulative sums with a leading zero row), so a window of any size costs O(games)
+however long it is, and every window of a request reuses the same prefix sums.
+"""
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Minutes that per-36 rates are scaled to
+PER_MINUTES = 36.0
+
+# Rest day buckets of the rest-day splits; the last bucket includes longer rests
+REST_DAY_BUCKETS = (0, 1, 2, 3)
+
+
+def as_matrix(values) -> np.ndarray:
+    """Convert one stat (games,) or several stats (games, stats) to a float (games, stats) matrix."""
+    values = np.asarray(values, dtype=np.float64)
+    return values[:, np.newaxis] if values.ndim == 1 else values
+
+
+def prefix_sums(values: np.ndarray) -> np.ndarray:
+    """
+    Cumulative sums along the games axis with a leading row of zeros.
+
+    The sum of rows ``start:end`` is ``sums[end] - sums[start]``.
+    """
+    sums = np.zeros((values.shape[0] + 1,) + values.shape[1:])
+    np.cumsum(values, axis=0, out=sums[1:])
+    return sums
+
+
+def window_bounds(n_games: int, window: int) -> tuple:
+    """
+    Get the prefix sum rows bounding the window that ends at each game.
+
+    Returns:
+        ``(start, end)`` index arrays; the window ending at game ``i`` covers
+        rows ``start[i]:end[i]`` (fewer than ``window`` games at the start)
+    """
+    end = np.arange(1, n_games + 1)
+    return np.maximum(end - window, 0), end
+
+
+class RollingWindows:
+    """
+    Rolling means, standard deviations and per-36 rates of a (games, stats) matrix.
+
+    The prefix sums are built once; each window size is then a handful of
+    vectorized subtractions. Missing values (NaN) are skipped, so a window's
+    mean is over the games in it that have a value.
+    """
+
+    def __init__(self, values, minutes=None):
+        """
+        Args:
+            values: Stats of shape (games,) or (games, stats), oldest game first
+            minutes: Optional minutes played per game, needed for ``per_36``
+        """
+        values = as_matrix(values)
+        self.n_games, self.n_stats = values.shape
+        valid = ~np.isnan(values)
+        filled = np.where(valid, values, 0.0)
+
+        # Sums of squares are taken around each stat's mean so they do not lose precision
+        counts = valid.sum(axis=0)
+        self.center = np.divide(filled.sum(axis=0), counts, out=np.zeros(self.n_stats), where=counts > 0)
+        centered = np.where(valid, filled - self.center, 0.0)
+
+        self._counts = prefix_sums(valid.astype(np.float64))
+        self._sums = prefix_sums(centered)
+        self._squares = prefix_sums(centered ** 2)
+        self._minutes = prefix_sums(np.nan_to_num(np.asarray(minutes, dtype=np.float64))) if minutes is not None else None
+
+    def _window(self, sums: np.ndarray, window: int) -> np.ndarray:
+        if window < 1:
+            raise ValueError(f"Window size must be at least 1, got {window}")
+        start, end = window_bounds(self.n_games, window)
+        return sums[end] - sums[start]
+
+    def _incomplete(self, window: int, min_periods: Optional[int]) -> np.ndarray:
+        """Mask of the (game, stat) windows with fewer than ``min_periods`` values."""
+        min_periods = window if min_periods is None else min_periods
+        return self._window(self._counts, window) < min_periods
+
+    def mean(self, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+        """
+        Rolling mean over the last ``window`` games at each game.
+
+        Args:
+            window: Number of games in the window
+            min_periods: Values needed for a result (default: ``window``); NaN otherwise
+
+        Returns:
+            Array of shape (games, stats)
+        """
+        counts = self._window(self._counts, window)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = self._window(self._sums, window) / counts + self.center
+        means[self._incomplete(window, min_periods) | (counts == 0)] = np.nan
+        return means
+
+    def std(self, window: int, min_periods: Optional[int] = None, ddof: int = 0) -> np.ndarray:
+        """
+        Rolling standard deviation over the last ``window`` games at each game.
+
+        Args:
+            window: Number of games in the window
+            min_periods: Values needed for a result (default: ``window``); NaN otherwise
+            ddof: Delta degrees of freedom (0 for the population standard deviation)
+
+        Returns:
+            Array of shape (games, stats)
+        """
+        counts = self._window(self._counts, window)
+        sums = self._window(self._sums, window)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            variance = (self._window(self._squares, window) - sums ** 2 / counts) / (counts - ddof)
+        std = np.sqrt(np.maximum(variance, 0.0))
+        std[self._incomplete(window, min_periods) | (counts <= ddof)] = np.nan
+        return std
+
+    def per_36(self, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+        """
+        Rolling per-36-minute rates: the window's stat totals over its minutes played.
+
+        Args:
+            window: Number of games in the window
+            min_periods: Values needed for a result (default: ``window``); NaN otherwise
+
+        Returns:
+            Array of shape (games, stats), NaN where no minutes were played
+        """
+        if self._minutes is None:
+            raise ValueError("Per-36 rates need the minutes played")
+        totals = self._window(self._sums, window) + self.center * self._window(self._counts, window)
+        minutes = self._window(self._minutes, window)[:, None]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rates = np.where(minutes > 0, totals / minutes * PER_MINUTES, np.nan)
+        rates[self._incomplete(window, min_periods)] = np.nan
+        return rates
+
+
+def ewma(values, span: float) -> np.ndarray:
+    """
+    Exponentially weighted moving average at each game.
+
+    Args:
+        values: Stats of shape (games,) or (games, stats), oldest game first
+        span: Decay in games (``alpha = 2 / (span + 1)``), at least 1
+
+    Returns:
+        Array of shape (games, stats); missing values are skipped
+    """
+    if span < 1:
+        raise ValueError(f"EWMA span must be at least 1, got {span}")
+    return pd.DataFrame(as_matrix(values)).ewm(span=span, ignore_na=True).mean().to_numpy()
+
+
+def per_36(values, minutes) -> np.ndarray:
+    """
+    Per-36-minute rates: the stat totals over the minutes played.
+
+    Args:
+        values: Stats of shape (games,) or (games, stats)
+        minutes: Minutes played per game
+
+    Returns:
+        Array of shape (stats,), NaN if no minutes were played
+    """
+    totals = np.nansum(as_matrix(values), axis=0)
+    total_minutes = np.nansum(np.asarray(minutes, dtype=np.float64))
+    return totals / total_minutes * PER_MINUTES if total_minutes > 0 else np.full(totals.shape, np.nan)
+
+
+def rest_days(dates) -> np.ndarray:
+    """
+    Days of rest before each game (0 for the second night of a back-to-back).
+
+    Args:
+        dates: Game dates, oldest game first
+
+    Returns:
+        Float array, NaN for the first game (and games without a date)
+    """
+    days = pd.to_datetime(pd.Series(dates)).to_numpy().astype('datetime64[D]')
+    rest = np.full(days.size, np.nan)
+    if days.size > 1:
+        gaps = np.diff(days).astype(np.float64)
+        rest[1:] = np.where(np.isnat(days[1:]) | np.isnat(days[:-1]), np.nan, gaps - 1)
+    return rest
+
+
+def split_masks(locations, rest: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Build the games of each split.
+
+    Args:
+        locations: "H" or "A" per game
+        rest: Days of rest per game (see ``rest_days``)
+
+    Returns:
+        Dictionary mapping split names ("home", "away", "backToBack", "rested" and
+        "restDays0" ... "restDays3Plus") to boolean game masks
+    """
+    locations = np.asarray(locations, dtype=object)
+    masks = {
+        "home": locations == 'H',
+        "away": locations == 'A',
+        "backToBack": rest == 0,
+        "rested": rest >= 1,
+    }
+    for days in REST_DAY_BUCKETS[:-1]:
+        masks[f"restDays{days}"] = rest == days
+    masks[f"restDays{REST_DAY_BUCKETS[-1]}Plus"] = rest >= REST_DAY_BUCKETS[-1]
+    return masks
+
+
+class SplitWindows:
+    """
+    Split averages over the last N games for any N.
+
+    Each split's stats are accumulated into prefix sums in one pass over the
+    (splits, games, stats) masked arrays, so the splits of the last N games are
+    a subtraction of the totals and the prefix at ``games - N``.
+    """
+
+    def __init__(self, values, minutes, masks: Dict[str, np.ndarray]):
+        """
+        Args:
+            values: Stats of shape (games,) or (games, stats), oldest game first
+            minutes: Minutes played per game
+            masks: Split name -> boolean game mask (see ``split_masks``)
+        """
+        values = as_matrix(values)
+        self.names = list(masks)
+        self.n_games = values.shape[0]
+        selected = np.stack([masks[name] for name in self.names]).astype(np.float64)[:, :, None]
+        valid = ~np.isnan(values)
+        filled = np.where(valid, values, 0.0)
+        minutes = np.nan_to_num(np.asarray(minutes, dtype=np.float64))[:, None]
+
+        # (splits, games + 1, columns): game counts, stat counts, sums, squares and minutes
+        self._games = prefix_sums(np.moveaxis(selected, 1, 0))
+        self._counts = prefix_sums(np.moveaxis(selected * valid, 1, 0))
+        self._sums = prefix_sums(np.moveaxis(selected * filled, 1, 0))
+        self._squares = prefix_sums(np.moveaxis(selected * filled ** 2, 1, 0))
+        self._minutes = prefix_sums(np.moveaxis(selected * minutes, 1, 0))
+
+    def summarize(self, last_n: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Summarize each split over the last ``last_n`` games (all games by default).
+
+        Returns:
+            Dictionary mapping each split to its game count and, per stat column,
+            arrays of averages, standard deviations and per-36 rates
+        """
+        end = self.n_games
+        start = max(end - last_n, 0) if last_n is not None else 0
+
+        def total(sums):
+            return sums[end] - sums[start]
+
+        games = total(self._games)[:, 0]
+        counts = total(self._counts)
+        sums = total(self._sums)
+        minutes = total(self._minutes)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            average = sums / counts
+            std = np.sqrt(np.maximum(total(self._squares) / counts - average ** 2, 0.0))
+            rates = np.where(minutes > 0, sums / minutes * PER_MINUTES, np.nan)
+        return {
+            name: {"games": int(games[i]), "average": average[i], "std": std[i], "per36": rates[i]}
+            for i, name in enumerate(self.names)
+        }
+
+
+def parse_windows(windows: Optional[Sequence[Any]], default: Sequence[int], max_window: int) -> List[int]:
+    """
+    Validate the rolling window sizes of a request.
+
+    Args:
+        windows: Window sizes given by the client, or None
+        default: Window sizes used when none are given
+        max_window: Largest accepted window
+
+    Returns:
+        Sorted distinct window sizes
+
+    Raises:
+        ValueError: If a window is not an integer between 1 and ``max_window``
+    """
+    if windows is None:
+        return list(default)
+    if not isinstance(windows, (list, tuple)) or not windows:
+        raise ValueError("Windows must be a non-empty list of game counts")
+    parsed = set()
+    for window in windows:
+        if isinstance(window, bool) or not isinstance(window, (int, float)):
+            raise ValueError(f"Invalid window: {window!r}")
+        # Checked first, so NaN and infinite windows are rejected before the integer check
+        if not 1 <= window <= max_window:
+            raise ValueError(f"Windows must be between 1 and {max_window} games")
+        if int(window) != window:
+            raise ValueError(f"Invalid window: {window!r}")
+        parsed.add(int(window))
+    return sorted(parsed)
+
+
+def to_json_values(values: np.ndarray, decimals: int = 2) -> list:
+    """Round an array for a response, with NaN as None."""
+    rounded = np.round(values, decimals).astype(object)
+    rounded[np.isnan(values)] = None
+    return rounded.tolist()
@@ -1,290 +1,312 @@
-from flask import Flask, request, jsonify
+import atexit
+import logging
+import time
+from flask import Flask, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
-import pandas as pd
-import numpy as np
-import json
-import re
-from src.scrapers.basketball_reference import BasketballReferenceScaper
-from src.main import get_current_season, generate_season_years
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from src.scrapers.player_index import LOADING_RETRY_AFTER, get_shared_player_index
+from src.scraper_service import get_scraper, stop_scraper
+from src.analysis import (
+    AnalysisError, fallback_analysis, get_season_years, parse_analysis_request, resolve_player, run_cached_analysis,
+    run_cached_analytics, season_games_query, summarize_season
+)
+from src.analysis_cache import get_shared_analysis_cache
+from src.serialization import dumps
+from src.instrumentation import (
+    configure_logging, end_request, metrics, record_request, start_request, with_request_timings
+)
+
+configure_logging()
+logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 # Setup CORS properly
 CORS(app, resources={r"/*": {"origins": "*"}})
 
-# Initialize the scraper
-scraper = BasketballReferenceScaper()
+# One scraper (connection pool and warmed caches) serves every request. It starts on the
+# first request with the scraper settings in app.config (e.g. app.config['SCRAPER_WORKERS'])
+# or NBAPROPS_* environment variables, and is closed when the process exits.
+atexit.register(stop_scraper)
 
-# Hardcoded players for search (temporary solution) - keeping as fallback
-PLAYERS = [
-    {"id": "jamesle01", "name": "LeBron James", "team": "Los Angeles Lakers", "position": "SF"},
-    {"id": "curryst01", "name": "Stephen Curry", "team": "Golden State Warriors", "position": "PG"},
-    {"id": "duranke01", "name": "Kevin Durant", "team": "Phoenix Suns", "position": "SF"},
-    {"id": "antetgi01", "name": "Giannis Antetokounmpo", "team": "Milwaukee Bucks", "position": "PF"},
-    {"id": "doncilu01", "name": "Luka Dončić", "team": "Dallas Mavericks", "position": "PG"},
-    {"id": "jokicni01", "name": "Nikola Jokić", "team": "Denver Nuggets", "position": "C"},
-    {"id": "embiijo01", "name": "Joel Embiid", "team": "Philadelphia 76ers", "position": "C"},
-    {"id": "lillada01", "name": "Damian Lillard", "team": "Milwaukee Bucks", "position": "PG"},
-    {"id": "tatumja01", "name": "Jayson Tatum", "team": "Boston Celtics", "position": "SF"},
-    {"id": "moranja01", "name": "Ja Morant", "team": "Memphis Grizzlies", "position": "PG"},
-    {"id": "youngtr01", "name": "Trae Young", "team": "Atlanta Hawks", "position": "PG"},
-    {"id": "edwaran01", "name": "Anthony Edwards", "team": "Minnesota Timberwolves", "position": "SG"},
-    {"id": "foxde01", "name": "De'Aaron Fox", "team": "Sacramento Kings", "position": "PG"},
-    {"id": "georgpa01", "name": "Paul George", "team": "Philadelphia 76ers", "position": "SF"},
-    {"id": "bookede01", "name": "Devin Booker", "team": "Phoenix Suns", "position": "SG"}
-]
+# Maximum number of items in one batch analysis request
+MAX_BATCH_ITEMS = 250
 
-# Helper function to convert time format (MM:SS) to minutes as float
-def convert_minutes(minutes_str):
-    if pd.isna(minutes_str):
-        return 0.0
-    
-    if isinstance(minutes_str, (int, float)):
-        return float(minutes_str)
-    
-    # Check if the string is in MM:SS format
-    if isinstance(minutes_str, str) and ':' in minutes_str:
-        try:
-            parts = minutes_str.split(':')
-            if len(parts) == 2:
-                minutes = int(parts[0])
-                seconds = int(parts[1])
-                return minutes + (seconds / 60.0)
-        except (ValueError, IndexError):
-            pass
-    
-    # If we can't parse it, return 0
-    return 0.0
+# Streaming formats and their response MIME types
+STREAM_FORMATS = {'ndjson': 'application/x-ndjson', 'sse': 'text/event-stream'}
+
+# Local player index for autocomplete searches, refreshed in the background
+player_index = get_shared_player_index()
+
+# Computed analysis responses, invalidated when their game logs change
+analysis_cache = get_shared_analysis_cache()
+
+@app.before_request
+def start_timing():
+    """Collect the stage timings of the request for its Server-Timing header"""
+    g.timing_token = start_request()
+
+@app.after_request
+def add_server_timing(response):
+    """
+    Report the request's stage timings in a Server-Timing header and record it
+    in the metrics. Streamed responses are timed until their headers are sent.
+    """
+    token = g.pop('timing_token', None)
+    if token is None:
+        return response
+    timings = end_request(token)
+    response.headers['Server-Timing'] = timings.server_timing()
+    # Let the frontend (on another origin) read the header
+    response.headers['Timing-Allow-Origin'] = '*'
+    route = request.url_rule.rule if request.url_rule else 'other'
+    record_request(route, request.method, response.status_code, time.perf_counter() - timings.started)
+    return response
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Aggregated request, stage and cache metrics in the Prometheus text format"""
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
 
 @app.route('/api/players/search', methods=['GET'])
 def search_players():
-    """Search for players using Basketball Reference scraper"""
+    """Search for players in the local player index"""
     query = request.args.get('q', '').strip()
     
     if not query or len(query) < 2:
         return jsonify([])
     
     try:
-        # Use the scraper to search for players
-        results = scraper.search_players(query)
+        scraper = get_scraper(app.config)
+        
+        # Build the index, or rebuild it once it is stale, in the background
+        player_index.ensure_fresh(scraper)
         
-        # If no results, fall back to hardcoded players
-        if not results:
-            fallback_results = [p for p in PLAYERS if query.lower() in p["name"].lower()]
-            return jsonify(fallback_results)
-            
-        return jsonify(results)
+        # Searches are only answered from the index, never by searching the site per keystroke
+        if len(player_index) == 0:
+            response = jsonify({"error": "The player index is loading, try again shortly"})
+            response.headers['Retry-After'] = str(LOADING_RETRY_AFTER)
+            return response, 503
+        
+        return jsonify(player_index.search(query))
     except Exception as e:
-        print(f"Error in player search API: {e}")
-        # Fall back to hardcoded players in case of error
-        fallback_results = [p for p in PLAYERS if query.lower() in p["name"].lower()]
-        return jsonify(fallback_results)
+        logger.error(f"Error in player search API: {e}")
+        return jsonify([])
 
 @app.route('/api/test', methods=['GET'])
 def test():
     """Test endpoint to verify API is working"""
     return jsonify({"status": "API is working"})
 
-def calculate_stats(game_logs, stat, bet_line):
+def get_stream_format():
     """
-    Calculate statistics for a specific stat category
-    """
-    values = [game[stat] for game in game_logs]
-    
-    average = sum(values) / len(values) if values else 0
-    sorted_values = sorted(values)
-    median = sorted_values[len(sorted_values) // 2] if sorted_values else 0
-    min_val = min(values) if values else 0
-    max_val = max(values) if values else 0
-    
-    # Calculate over percentage based on bet line
-    over_count = sum(1 for v in values if v > bet_line)
-    over_percentage = (over_count / len(values)) * 100 if values else 0
-    
-    # Calculate trend based on last 5 games vs previous 5
-    last_five = values[:5]
-    prev_five = values[5:10]
-    
-    last_five_avg = sum(last_five) / len(last_five) if last_five else 0
-    prev_five_avg = sum(prev_five) / len(prev_five) if prev_five else last_five_avg
+    Get the streaming format requested by the client, if any.
     
-    if last_five_avg > prev_five_avg + 1:
-        trend = 'up'
-    elif last_five_avg < prev_five_avg - 1:
-        trend = 'down'
+    Streaming is requested with a ``stream=ndjson`` or ``stream=sse`` query
+    parameter, or with an ``Accept: application/x-ndjson`` or
+    ``Accept: text/event-stream`` header.
+    """
+    stream_format = request.args.get('stream', '').lower()
+    if stream_format in STREAM_FORMATS:
+        return stream_format
+    for name, mimetype in STREAM_FORMATS.items():
+        if request.accept_mimetypes.best == mimetype:
+            return name
+    return None
+
+def encode_event(event, stream_format):
+    """Encode one event dictionary as an NDJSON line or a Server-Sent Event."""
+    payload = dumps(event).decode('utf-8')
+    if stream_format == 'sse':
+        return f"event: {event['event']}\ndata: {payload}\n\n"
+    return payload + "\n"
+
+def stream_events(events, stream_format):
+    """Build a streaming response that sends each event as soon as it is produced."""
+    body = (encode_event(event, stream_format) for event in events)
+    response = Response(stream_with_context(body), mimetype=STREAM_FORMATS[stream_format])
+    # Keep proxies from buffering the stream
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+def stream_analysis(data, scraper):
+    """
+    Run one analysis, yielding a "season" event with each season's matching
+    games as soon as its game log is ready, then a final "result" (or "error")
+    event with the statistics over the most recent games of all seasons.
+    """
+    try:
+        analysis = resolve_player(parse_analysis_request(data), scraper)
+        
+        logs = [(analysis.player_id, season) for season in analysis.season_years]
+        query = season_games_query(analysis)
+        for (_, season), games_df in scraper.iter_game_logs(logs, columns=scraper.RELEVANT_COLUMNS, query=query):
+            yield {"event": "season", **summarize_season(season, games_df)}
+        
+        # Every season is in the game log store now, so this does not scrape again
+        cached = run_cached_analysis({**data, 'playerId': analysis.player_id}, scraper, analysis_cache)
+        yield {"event": "result", "result": cached.result}
+    except AnalysisError as e:
+        yield {"event": "error", "error": str(e), "statusCode": e.status_code}
+    except Exception as e:
+        logger.exception(f"Error in streamed analysis: {e}")
+        yield {"event": "error", "error": str(e), "statusCode": 500}
+
+def analysis_response(cached):
+    """
+    Build the response for a (possibly cached) analysis with ETag and
+    Cache-Control headers, or a 304 if the client's If-None-Match matches.
+    """
+    if cached.etag in request.if_none_match:
+        response = Response(status=304)
     else:
-        trend = 'stable'
-    
-    return {
-        "average": round(average, 1),
-        "median": median,
-        "min": min_val,
-        "max": max_val,
-        "overPercentage": round(over_percentage, 1),
-        "lastFiveAvg": round(last_five_avg, 1),
-        "trend": trend
-    }
+        response = Response(cached.body, mimetype='application/json')
+    response.set_etag(cached.etag)
+    # Completed seasons never change; anything with the current season must be revalidated
+    response.headers['Cache-Control'] = 'private, max-age=86400' if cached.is_final else 'private, no-cache'
+    return response
 
 @app.route('/api/player/analyze', methods=['POST'])
 def analyze_player():
-    """Analyze player performance based on request parameters"""
+    """
+    Analyze player performance based on request parameters.
+    
+    With ``?stream=ndjson`` or ``?stream=sse`` the response is streamed: one
+    "season" event per season as its game log is ready, then a "result" event.
+    """
+    data = None
     try:
         data = request.json
+        scraper = get_scraper(app.config)
         
-        if not data or 'playerName' not in data:
-            return jsonify({"error": "Player name is required"}), 400
-        
-        # Extract player name without years in parentheses
-        player_name = data.get('playerName')
-        # Remove any text in parentheses, typically years like "(2019-2025)"
-        player_name = re.sub(r'\s*\([^)]*\)', '', player_name).strip()
-        
-        # Check if player ID is provided
-        player_id = data.get('playerId')
-        
-        opponent = data.get('opponent', None)
-        if opponent == 'ANY':
-            opponent = None
+        stream_format = get_stream_format()
+        if stream_format:
+            return stream_events(stream_analysis(data, scraper), stream_format)
         
-        location = data.get('location', 'ANY')
-        games_count = int(data.get('gamesCount', 10))
-        seasons_option = data.get('seasons', 'current')
-        
-        # Generate season years based on request
-        if seasons_option == 'current':
-            season_years = [get_current_season()]
-        else:
-            season_years = generate_season_years(2)  # current and previous season
-        
-        # Initialize the scraper
-        scraper = BasketballReferenceScaper()
-        
-        # Get games data based on parameters
-        if opponent and opponent != 'ANY':
-            games_df = scraper.get_games_against_opponent(
-                player_name=player_name,
-                opponent=opponent,
-                seasons=season_years,
-                last_n_games=games_count,
-                player_id=player_id
-            )
-        else:
-            games_df = scraper.get_recent_games(
-                player_name=player_name,
-                seasons=season_years,
-                last_n_games=games_count,
-                player_id=player_id
-            )
-        
-        # Filter by location if specified
-        if location != 'ANY' and not games_df.empty and 'game_location' in games_df.columns:
-            games_df = games_df[games_df['game_location'] == location]
-            games_df = games_df.head(games_count)  # Limit to requested games count
-        
-        if games_df.empty:
-            # If no data found, return a user-friendly error message
-            return jsonify({
-                "error": f"No games found for {player_name} with the specified filters."
-            }), 404
-        
-        # Transform data to match frontend expectations
-        game_logs = []
-        for _, game in games_df.iterrows():
-            # Handle minutes played conversion
-            minutes = 0
-            if 'mp' in game and not pd.isna(game['mp']):
-                minutes = convert_minutes(game['mp'])
-            
-            game_log = {
-                "date": game['date_game'],
-                "opponent": game['opp_id'],
-                "location": game['game_location'] if 'game_location' in game else 'H',
-                "points": float(game['pts']) if 'pts' in game and not pd.isna(game['pts']) else 0,
-                "rebounds": float(game['trb']) if 'trb' in game and not pd.isna(game['trb']) else 0,
-                "assists": float(game['ast']) if 'ast' in game and not pd.isna(game['ast']) else 0,
-                "minutes": minutes,
-                "result": 'W'  # Default to win since we don't have this info
-            }
-            game_logs.append(game_log)
-        
-        # Get bet lines from request
-        bet_lines = data.get('betLines', {
-            'points': 0,
-            'rebounds': 0,
-            'assists': 0
-        })
-        
-        # Calculate statistics for each category
-        stats = {
-            "points": calculate_stats(game_logs, 'points', bet_lines.get('points', 0)),
-            "rebounds": calculate_stats(game_logs, 'rebounds', bet_lines.get('rebounds', 0)),
-            "assists": calculate_stats(game_logs, 'assists', bet_lines.get('assists', 0))
-        }
-        
-        # Return the analyzed data
-        return jsonify({
-            "playerName": player_name,
-            "gameLogs": game_logs,
-            "stats": stats
-        })
+        return analysis_response(run_cached_analysis(data, scraper, analysis_cache))
         
+    except AnalysisError as e:
+        return jsonify({"error": str(e)}), e.status_code
     except Exception as e:
-        print(f"Error in analyze_player: {str(e)}")
+        logger.exception(f"Error in analyze_player: {str(e)}")
         # If we encounter an error, return mock data as a fallback
         player_name = data.get('playerName') if data and 'playerName' in data else "Unknown Player"
-        return jsonify({
-            "playerName": player_name,
-            "gameLogs": [
-                {
-                    "date": "2025-03-08",
-                    "opponent": "BOS",
-                    "location": "H",
-                    "points": 22.0,
-                    "rebounds": 14.0,
-                    "assists": 9.0,
-                    "minutes": 36.0,
-                    "result": "W"
-                },
-                {
-                    "date": "2025-03-06",
-                    "opponent": "NYK",
-                    "location": "A",
-                    "points": 31.0,
-                    "rebounds": 12.0,
-                    "assists": 8.0,
-                    "minutes": 38.0,
-                    "result": "L"
-                }
-            ],
-            "stats": {
-                "points": {
-                    "average": 28.3,
-                    "median": 27.5,
-                    "min": 17.0,
-                    "max": 40.0,
-                    "overPercentage": 60.0,
-                    "lastFiveAvg": 28.4,
-                    "trend": "up"
-                },
-                "rebounds": {
-                    "average": 10.5,
-                    "median": 10.5,
-                    "min": 5.0,
-                    "max": 17.0,
-                    "overPercentage": 70.0,
-                    "lastFiveAvg": 12.0,
-                    "trend": "stable"
-                },
-                "assists": {
-                    "average": 6.4,
-                    "median": 6.0,
-                    "min": 3.0,
-                    "max": 11.0,
-                    "overPercentage": 40.0,
-                    "lastFiveAvg": 5.8,
-                    "trend": "down"
-                }
-            }
-        })
+        return jsonify(fallback_analysis(player_name))
+
+@app.route('/api/player/analytics', methods=['POST'])
+def player_analytics():
+    """
+    Rolling means, standard deviations, EWMAs, per-36 rates and home/away and
+    rest-day splits of a player's games, for each requested window size.
+    """
+    try:
+        scraper = get_scraper(app.config)
+        return analysis_response(run_cached_analytics(request.json, scraper, analysis_cache))
+    except AnalysisError as e:
+        return jsonify({"error": str(e)}), e.status_code
+    except Exception as e:
+        logger.exception(f"Error in player_analytics: {e}")
+        return jsonify({"error": "Could not compute analytics"}), 500
+
+def resolve_player_ids(names, scraper):
+    """
+    Resolve player names to IDs concurrently.
+    
+    Returns a dictionary mapping each name to its player ID, or None if it
+    could not be resolved.
+    """
+    if not names:
+        return {}
+    resolve = with_request_timings(scraper.resolve_player_id)
+    with ThreadPoolExecutor(max_workers=max(1, min(len(names), scraper.max_workers))) as executor:
+        futures = {name: executor.submit(resolve, name) for name in names}
+    
+    player_ids = {}
+    for name, future in futures.items():
+        try:
+            player_ids[name] = future.result()
+        except Exception as e:
+            logger.error(f"Error resolving player {name}: {e}")
+            player_ids[name] = None
+    return player_ids
+
+def analyze_item(index, item, scraper):
+    """Analyze one batch item, returning its result or error entry."""
+    try:
+        return {"index": index, "status": "ok", "result": run_cached_analysis(item, scraper, analysis_cache).result}
+    except AnalysisError as e:
+        return {"index": index, "status": "error", "error": str(e), "statusCode": e.status_code}
+    except Exception as e:
+        logger.exception(f"Error in analyze_batch item {index}: {e}")
+        return {"index": index, "status": "error", "error": str(e), "statusCode": 500}
+
+def stream_batch(items, scraper):
+    """
+    Analyze batch items concurrently, yielding an "item" event as each one
+    finishes and a final "done" event.
+    
+    Results are sent and released as they complete instead of being collected,
+    and items that share a game log still fetch it once (single-flight).
+    """
+    executor = ThreadPoolExecutor(max_workers=max(1, min(len(items), scraper.max_workers)))
+    try:
+        analyze = with_request_timings(analyze_item)
+        futures = [executor.submit(analyze, index, item, scraper) for index, item in enumerate(items)]
+        for future in as_completed(futures):
+            yield {"event": "item", **future.result()}
+        yield {"event": "done", "count": len(items)}
+    finally:
+        # Stop analyzing if the client went away
+        executor.shutdown(wait=False, cancel_futures=True)
+
+@app.route('/api/player/analyze/batch', methods=['POST'])
+def analyze_batch():
+    """
+    Analyze many player/prop combinations in one request.
+    
+    The body is {"items": [...]} where each item has the same fields as an
+    /api/player/analyze request. Each distinct player name is resolved once and
+    game logs shared by several items are fetched once, concurrently, before the
+    items are analyzed. Each result reports its own status, so one failing (or
+    malformed) item does not fail the batch.
+    
+    With ``?stream=ndjson`` or ``?stream=sse`` each item's result is streamed
+    as soon as it is ready, in completion order.
+    """
+    data = request.json or {}
+    items = data.get('items')
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "A non-empty list of items is required"}), 400
+    if len(items) > MAX_BATCH_ITEMS:
+        return jsonify({"error": f"At most {MAX_BATCH_ITEMS} items can be analyzed per batch"}), 400
+    
+    scraper = get_scraper(app.config)
+    stream_format = get_stream_format()
+    if stream_format:
+        return stream_events(stream_batch(items, scraper), stream_format)
+    
+    # Resolve each distinct player name once, then collect the distinct (player_id, season)
+    # game logs needed by the batch. Invalid items are left for analyze_item to reject.
+    names = {item['playerName'] for item in items
+             if isinstance(item, dict) and not item.get('playerId') and isinstance(item.get('playerName'), str)}
+    player_ids = resolve_player_ids(names, scraper)
+    
+    batch = []
+    logs = []
+    for item in items:
+        if isinstance(item, dict) and not item.get('playerId') and isinstance(item.get('playerName'), str):
+            player_id = player_ids.get(item['playerName'])
+            if player_id:
+                item = {**item, 'playerId': player_id}
+        batch.append(item)
+        if isinstance(item, dict) and item.get('playerId'):
+            logs.extend((item['playerId'], season) for season in get_season_years(item.get('seasons', 'current')))
+    
+    scraper.prefetch_game_logs(logs)
+    
+    results = [analyze_item(index, item, scraper) for index, item in enumerate(batch)]
+    
+    return Response(dumps({"results": results}), mimetype='application/json')
 
 @app.route('/api/player/odds', methods=['POST'])
 def get_player_odds_endpoint():
@@ -295,4 +317,6 @@ def get_player_odds_endpoint():
     }), 410
 
 if __name__ == '__main__':
+    # Start building the player index now rather than on the first search
+    player_index.ensure_fresh(get_scraper(app.config))
     app.run(debug=True, port=5001, host='0.0.0.0') 
\ No newline at end of file
@@ -0,0 +1,193 @@
+"""
+Async (ASGI) serving mode for the API.
+
+Exposes the same routes as the Flask app in ``src.api`` with an asyncio scraper,
+so many slow upstream-bound requests share one process without a thread per
+request. Run it with:
+
+    uvicorn src.asgi:app --port 5001
+"""
+import logging
+import time
+from contextlib import asynccontextmanager
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.datastructures import MutableHeaders
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from src.analysis import AnalysisError, fallback_analysis, run_cached_analysis_async, run_cached_analytics_async
+from src.analysis_cache import CachedAnalysis, get_shared_analysis_cache
+from src.instrumentation import (
+    configure_logging, current_request, end_request, metrics, record_request, start_request
+)
+from src.scrapers.async_basketball_reference import AsyncBasketballReferenceScraper
+from src.scrapers.player_index import LOADING_RETRY_AFTER, get_shared_player_index
+from src.scraper_service import scraper_settings, start_scraper, stop_scraper
+
+configure_logging()
+logger = logging.getLogger(__name__)
+
+# Local player index for autocomplete searches, refreshed in the background
+player_index = get_shared_player_index()
+
+# Computed analysis responses, invalidated when their game logs change
+analysis_cache = get_shared_analysis_cache()
+
+
+async def search_players(request: Request) -> JSONResponse:
+    """Search for players in the local player index"""
+    query = request.query_params.get('q', '').strip()
+
+    if not query or len(query) < 2:
+        return JSONResponse([])
+
+    scraper = request.app.state.scraper
+    try:
+        # Build the index, or rebuild it once it is stale, in a background thread
+        player_index.ensure_fresh(scraper.scraper)
+
+        # Searches are only answered from the index, never by searching the site per keystroke
+        if len(player_index) == 0:
+            return JSONResponse({"error": "The player index is loading, try again shortly"}, status_code=503,
+                                headers={'Retry-After': str(LOADING_RETRY_AFTER)})
+
+        return JSONResponse(player_index.search(query))
+    except Exception as e:
+        logger.error(f"Error in player search API: {e}")
+        return JSONResponse([])
+
+
+async def test(request: Request) -> JSONResponse:
+    """Test endpoint to verify API is working"""
+    return JSONResponse({"status": "API is working"})
+
+
+async def get_metrics(request: Request) -> Response:
+    """Aggregated request, stage and cache metrics in the Prometheus text format"""
+    return Response(metrics.render(), media_type='text/plain; version=0.0.4')
+
+
+def analysis_response(request: Request, cached: CachedAnalysis) -> Response:
+    """
+    Build the response for a (possibly cached) analysis with ETag and
+    Cache-Control headers, or a 304 if the client's If-None-Match matches.
+    """
+    etag = f'"{cached.etag}"'
+    headers = {
+        'ETag': etag,
+        # Completed seasons never change; anything with the current season must be revalidated
+        'Cache-Control': 'private, max-age=86400' if cached.is_final else 'private, no-cache',
+    }
+    if_none_match = request.headers.get('if-none-match', '')
+    if etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*':
+        return Response(status_code=304, headers=headers)
+    return Response(cached.body, headers=headers, media_type='application/json')
+
+
+async def analyze_player(request: Request) -> Response:
+    """Analyze player performance based on request parameters"""
+    data = None
+    try:
+        data = await request.json()
+        cached = await run_cached_analysis_async(data, request.app.state.scraper, analysis_cache)
+        return analysis_response(request, cached)
+
+    except AnalysisError as e:
+        return JSONResponse({"error": str(e)}, status_code=e.status_code)
+    except Exception as e:
+        logger.exception(f"Error in analyze_player: {str(e)}")
+        # If we encounter an error, return mock data as a fallback
+        player_name = data.get('playerName') if isinstance(data, dict) and 'playerName' in data else "Unknown Player"
+        return JSONResponse(fallback_analysis(player_name))
+
+
+async def player_analytics(request: Request) -> Response:
+    """
+    Rolling means, standard deviations, EWMAs, per-36 rates and home/away and
+    rest-day splits of a player's games, for each requested window size.
+    """
+    try:
+        data = await request.json()
+        cached = await run_cached_analytics_async(data, request.app.state.scraper, analysis_cache)
+        return analysis_response(request, cached)
+    except AnalysisError as e:
+        return JSONResponse({"error": str(e)}, status_code=e.status_code)
+    except Exception as e:
+        logger.exception(f"Error in player_analytics: {e}")
+        return JSONResponse({"error": "Could not compute analytics"}, status_code=500)
+
+
+class ServerTimingMiddleware:
+    """
+    Collect each request's stage timings, report them in a Server-Timing header
+    and record the request in the metrics.
+    """
+
+    def __init__(self, app, routes):
+        self.app = app
+        # Raw paths are only used as metric labels if they are known routes
+        self.route_paths = {route.path for route in routes}
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        token = start_request()
+        timings = current_request()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                headers = MutableHeaders(scope=message)
+                headers.append('Server-Timing', timings.server_timing())
+                # Let the frontend (on another origin) read the header
+                headers.append('Timing-Allow-Origin', '*')
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            end_request(token)
+            route = scope['path'] if scope['path'] in self.route_paths else 'other'
+            record_request(route, scope['method'], status, time.perf_counter() - timings.started)
+
+
+@asynccontextmanager
+async def lifespan(app: Starlette):
+    # One scraper (and HTTP connection pools) for the lifetime of the process, configured
+    # with NBAPROPS_* environment variables
+    settings = scraper_settings()
+    app.state.scraper = AsyncBasketballReferenceScraper(start_scraper(settings), pool_size=settings['HTTP_POOL_SIZE'],
+                                                        max_retries=settings['HTTP_MAX_RETRIES'])
+    # Start building the player index now rather than on the first search
+    player_index.ensure_fresh(app.state.scraper.scraper)
+    try:
+        yield
+    finally:
+        await app.state.scraper.aclose()
+        stop_scraper()
+
+
+routes = [
+    Route('/api/players/search', search_players, methods=['GET']),
+    Route('/api/player/analyze', analyze_player, methods=['POST']),
+    Route('/api/player/analytics', player_analytics, methods=['POST']),
+    Route('/api/test', test, methods=['GET']),
+    Route('/metrics', get_metrics, methods=['GET']),
+]
+
+app = Starlette(
+    routes=routes,
+    middleware=[
+        Middleware(ServerTimingMiddleware, routes=routes),
+        Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*']),
+    ],
+    lifespan=lifespan,
+)
@@ -0,0 +1,310 @@
+"""
+Per-request stage timings, process-wide metrics and logging setup.
+
+Code on the request path reports how long each stage took (``timed`` or
+``observe``) and counts events such as cache hits or downloaded bytes (``count``).
+Everything is aggregated into process-wide Prometheus metrics, served by the
+APIs at ``/metrics``. While a request is being timed (``start_request``), stage
+times and counts are also collected for that request and returned to the client
+in a ``Server-Timing`` header.
+"""
+import bisect
+import contextlib
+import contextvars
+import functools
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Histogram bucket upper bounds in seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Metric names and their help texts
+STAGE_SECONDS = 'nbaprops_stage_seconds'
+REQUEST_SECONDS = 'nbaprops_request_seconds'
+REQUESTS_TOTAL = 'nbaprops_requests_total'
+UPSTREAM_REQUESTS_TOTAL = 'nbaprops_upstream_requests_total'
+UPSTREAM_BYTES_TOTAL = 'nbaprops_upstream_bytes_total'
+ROWS_PARSED_TOTAL = 'nbaprops_rows_parsed_total'
+CACHE_REQUESTS_TOTAL = 'nbaprops_cache_requests_total'
+
+METRIC_HELP = {
+    STAGE_SECONDS: 'Time spent in each stage of request handling (rate_limit, fetch, parse, store_read, ...)',
+    REQUEST_SECONDS: 'Time to handle an API request',
+    REQUESTS_TOTAL: 'API requests by route and status',
+    UPSTREAM_REQUESTS_TOTAL: 'Requests sent to basketball-reference.com by status',
+    UPSTREAM_BYTES_TOTAL: 'Bytes downloaded from basketball-reference.com',
+    ROWS_PARSED_TOTAL: 'Game log rows parsed from HTML',
+    CACHE_REQUESTS_TOTAL: 'Cache lookups by cache (http, game_log, analysis) and result',
+}
+
+# Frozen label set: sorted (name, value) pairs
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class _Histogram:
+    """Bucket counts, sum and count of the observations of one label set."""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+
+class MetricsRegistry:
+    """
+    Thread-safe counters and latency histograms with Prometheus text exposition.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Args:
+            buckets: Histogram bucket upper bounds in seconds, ascending
+        """
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, _Histogram]] = {}
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        """Add ``value`` to a counter."""
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        """Record a duration in a histogram."""
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(self.buckets)
+            histogram.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            histogram.sum += seconds
+            histogram.count += 1
+
+    def counter_value(self, name: str, **labels: str) -> float:
+        """Get the current value of a counter (0 if it was never incremented)."""
+        with self._lock:
+            return self._counters.get(name, {}).get(_labels(labels), 0)
+
+    def reset(self) -> None:
+        """Remove all recorded values."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Returns:
+            Metrics text, one sample per line
+        """
+        lines: List[str] = []
+        with self._lock:
+            for name in sorted(self._counters):
+                lines.extend(_header(name, 'counter'))
+                for key, value in sorted(self._counters[name].items()):
+                    lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+
+            for name in sorted(self._histograms):
+                lines.extend(_header(name, 'histogram'))
+                for key, histogram in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(self.buckets + (float('inf'),), histogram.counts):
+                        cumulative += count
+                        le = '+Inf' if bound == float('inf') else _format_value(bound)
+                        lines.append(f"{name}_bucket{_format_labels(key + (('le', le),))} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {_format_value(histogram.sum)}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+
+def _labels(labels: Dict[str, str]) -> Labels:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _header(name: str, metric_type: str) -> List[str]:
+    return [f"# HELP {name} {METRIC_HELP.get(name, name)}", f"# TYPE {name} {metric_type}"]
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) and not float(value).is_integer() else str(int(value))
+
+
+class RequestTimings:
+    """Stage durations and counts collected while handling one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        # Stage -> total seconds, in the order the stages first ran
+        self.stages: Dict[str, float] = {}
+        self.counts: Dict[str, float] = {}
+
+    def add_stage(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def add_count(self, name: str, value: float) -> None:
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + value
+
+    def server_timing(self) -> str:
+        """
+        Format the timings as a ``Server-Timing`` header value.
+
+        Stages are reported with their total duration in milliseconds, counts
+        (bytes, rows, cache hits...) as descriptions, and the time since the
+        request started as ``total``.
+        """
+        total = (time.perf_counter() - self.started) * 1000
+        with self._lock:
+            entries = [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in self.stages.items()]
+            entries += [f'{name};desc="{_format_value(value)}"' for name, value in self.counts.items()]
+        entries.append(f"total;dur={total:.1f}")
+        return ', '.join(entries)
+
+
+metrics = MetricsRegistry()
+
+_current_request: contextvars.ContextVar[Optional[RequestTimings]] = contextvars.ContextVar(
+    'nbaprops_request_timings', default=None
+)
+
+
+def start_request() -> contextvars.Token:
+    """
+    Start collecting the stage timings of the current request.
+
+    Returns:
+        Token to pass to ``end_request``
+    """
+    return _current_request.set(RequestTimings())
+
+
+def end_request(token: contextvars.Token) -> Optional[RequestTimings]:
+    """
+    Stop collecting stage timings for the current request.
+
+    Returns:
+        The request's timings
+    """
+    timings = _current_request.get()
+    _current_request.reset(token)
+    return timings
+
+
+def current_request() -> Optional[RequestTimings]:
+    """Get the timings of the request being handled, or None outside of a timed request."""
+    return _current_request.get()
+
+
+def observe(stage: str, seconds: float) -> None:
+    """
+    Record the duration of a stage.
+
+    Args:
+        stage: Stage name (e.g., "fetch" or "parse")
+        seconds: Duration
+    """
+    metrics.observe(STAGE_SECONDS, seconds, stage=stage)
+    timings = _current_request.get()
+    if timings is not None:
+        timings.add_stage(stage, seconds)
+
+
+@contextlib.contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """Record the duration of the ``with`` block as a stage."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - start)
+
+
+def count(name: str, value: float = 1, server_timing: Optional[str] = None, **labels: str) -> None:
+    """
+    Increment a counter.
+
+    Args:
+        name: Metric name (e.g., ``UPSTREAM_BYTES_TOTAL``)
+        value: Amount to add
+        server_timing: Name to report the count under in the current request's
+                       ``Server-Timing`` header, or None to only aggregate it
+        **labels: Metric labels
+    """
+    metrics.inc(name, value, **labels)
+    if server_timing:
+        timings = _current_request.get()
+        if timings is not None:
+            timings.add_count(server_timing, value)
+
+
+def record_request(route: str, method: str, status: int, seconds: float) -> None:
+    """
+    Record a handled API request.
+
+    Args:
+        route: Route pattern (e.g., "/api/player/analyze"), not the raw path
+        method: HTTP method
+        status: Response status code
+        seconds: Time until the response started
+    """
+    metrics.observe(REQUEST_SECONDS, seconds, route=route, method=method)
+    metrics.inc(REQUESTS_TOTAL, route=route, method=method, status=status)
+
+
+def record_cache(cache: str, result: str) -> None:
+    """
+    Count a cache lookup.
+
+    Args:
+        cache: Cache name ("http", "game_log" or "analysis")
+        result: "hit", "miss", "revalidated" or "stale" (served after a failed revalidation)
+    """
+    count(CACHE_REQUESTS_TOTAL, server_timing=f"{cache}_cache_{result}", cache=cache, result=result)
+
+
+def with_request_timings(fn: Callable) -> Callable:
+    """
+    Wrap a function so that it reports to the calling request's timings when it
+    runs on another thread (e.g., in a thread pool).
+    """
+    timings = _current_request.get()
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        token = _current_request.set(timings)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current_request.reset(token)
+    return wrapper
+
+
+def configure_logging(level: Optional[str] = None) -> None:
+    """
+    Send log messages to stderr with timestamps.
+
+    Args:
+        level: Log level name; defaults to ``NBAPROPS_LOG_LEVEL`` or "INFO"
+    """
+    level = level or os.environ.get('NBAPROPS_LOG_LEVEL', 'INFO')
+    logging.basicConfig(level=level.upper(), format='%(asctime)s %(levelname)s %(name)s: %(message)s')
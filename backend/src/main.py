@@ -4,6 +4,7 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 from src.scrapers.basketball_reference import BasketballReferenceScaper
+from src.instrumentation import configure_logging
 
 def get_current_season():
     """
@@ -111,6 +112,7 @@ def main():
     parser.add_argument('--current-only', action='store_true', help='Only analyze current season')
     
     args = parser.parse_args()
+    configure_logging()
     
     # Generate the list of season years
     if args.current_only:
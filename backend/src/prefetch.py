@@ -0,0 +1,207 @@
+"""
+Prefetch game logs into the local game log store before users ask for them.
+
+Usage (from the backend directory):
+
+    python -m src.prefetch youngtr01 jamesle01 --seasons 2
+    python -m src.prefetch --team BOS --team NYK
+
+Requests go through the shared rate limiter. Progress is checkpointed to a state
+file after every game log, so an interrupted run resumes where it stopped when
+started again with the same players and seasons. Only logs that were stored or
+that the site confirmed do not exist are checkpointed; logs that failed (network
+errors, 429 or 5xx responses) are recorded separately and retried by the next
+run, and logs that can still change are checked again (and refetched once stale).
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.instrumentation import configure_logging
+from src.main import get_current_season, generate_season_years
+from src.scrapers.basketball_reference import BasketballReferenceScaper
+from src.scrapers.response_cache import DEFAULT_CACHE_DIR
+
+# Basketball Reference player IDs, e.g. "youngtr01"
+PLAYER_ID_PATTERN = re.compile(r'^[a-z][a-z.\'-]*\d{2}$')
+
+
+def default_state_path() -> str:
+    cache_dir = os.environ.get('NBAPROPS_CACHE_DIR', DEFAULT_CACHE_DIR)
+    return os.path.join(cache_dir, 'prefetch_state.json')
+
+
+def resolve_players(scraper: BasketballReferenceScaper, players: List[str], teams: List[str]) -> List[str]:
+    """
+    Get the player IDs to prefetch.
+
+    Args:
+        scraper: Scraper used to resolve names and fetch rosters
+        players: Player IDs or names
+        teams: Team abbreviations whose current roster should be included
+
+    Returns:
+        Unique player IDs, in the order given
+    """
+    player_ids = []
+    for player in players:
+        if PLAYER_ID_PATTERN.match(player):
+            player_ids.append(player)
+            continue
+        player_id = scraper.resolve_player_id(player)
+        if player_id:
+            player_ids.append(player_id)
+        else:
+            print(f"Warning: Could not find a player named {player}, skipping")
+
+    if teams:
+        wanted = {team.upper() for team in teams}
+        roster = [player for player in scraper.get_league_players(get_current_season())
+                  if player['team'] in wanted]
+        if not roster:
+            print(f"Warning: No players found for {', '.join(sorted(wanted))}")
+        player_ids.extend(player['id'] for player in roster)
+
+    return list(dict.fromkeys(player_ids))
+
+
+def load_state(path: str, job_id: str) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, int]]:
+    """
+    Load the progress of an earlier run of the same job.
+
+    Returns:
+        Tuple of the finished logs, mapping "player_id:season" to ``{"games": n,
+        "final": bool}``, and the failed logs, mapping "player_id:season" to the
+        number of failed attempts
+    """
+    try:
+        with open(path, encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}, {}
+    if state.get('job') != job_id:
+        return {}, {}
+    # Entries of older state files (plain game counts) are checked again
+    done = {key: entry for key, entry in state.get('done', {}).items() if isinstance(entry, dict)}
+    return done, state.get('failed', {})
+
+
+def save_state(path: str, job_id: str, done: Dict[str, Dict[str, Any]], failed: Dict[str, int]) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'job': job_id, 'updated_at': time.time(), 'done': done, 'failed': failed}, f)
+    os.replace(tmp_path, path)
+
+
+def prefetch(scraper: BasketballReferenceScaper, logs: List[Tuple[str, int]],
+             state_path: Optional[str] = None) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, int]]:
+    """
+    Fetch, parse and store game logs, resuming an earlier run of the same logs.
+
+    Logs finished by an earlier run are skipped if they are final (fetched after
+    their season ended); the others go through the game log store again, which
+    answers fresh logs without a request and refreshes stale ones. Failed logs
+    are retried.
+
+    Args:
+        scraper: Scraper whose game log store receives the logs
+        logs: (player_id, season) pairs to prefetch
+        state_path: Checkpoint file (defaults to ``prefetch_state.json`` in the cache directory)
+
+    Returns:
+        Tuple of the finished logs, mapping "player_id:season" to ``{"games": n,
+        "final": bool}``, and the logs that failed, mapping "player_id:season" to
+        the number of failed attempts
+    """
+    state_path = state_path or default_state_path()
+    job_id = hashlib.sha1(json.dumps(sorted(logs)).encode('utf-8')).hexdigest()
+    done, failed = load_state(state_path, job_id)
+    pending = [log for log in logs if not done.get(f"{log[0]}:{log[1]}", {}).get('final')]
+
+    if len(pending) < len(logs):
+        print(f"Resuming: {len(logs) - len(pending)} of {len(logs)} game logs already prefetched")
+    if failed:
+        print(f"Retrying {len(failed)} game logs that failed in an earlier run")
+
+    started = time.monotonic()
+    for i, ((player_id, season), game_log) in enumerate(scraper.iter_game_logs(pending, columns=['date_game']), 1):
+        key = f"{player_id}:{season}"
+        outcome = scraper.game_log_status(player_id, season)
+        if outcome == 'failed':
+            done.pop(key, None)
+            failed[key] = failed.get(key, 0) + 1
+            status = "failed, will be retried"
+        else:
+            # A missing log of a completed season stays missing; one of a current season may appear
+            final = (scraper.game_log_is_final(player_id, season) if outcome == 'stored'
+                     else scraper.season_is_complete(season))
+            done[key] = {'games': len(game_log), 'final': final}
+            failed.pop(key, None)
+            status = f"{len(game_log)} games" if outcome == 'stored' else "no game log"
+        save_state(state_path, job_id, done, failed)
+
+        elapsed = time.monotonic() - started
+        remaining = elapsed / i * (len(pending) - i)
+        print(f"[{len(logs) - len(pending) + i}/{len(logs)}] {player_id} {season - 1}-{season}: {status} "
+              f"({elapsed:.0f}s elapsed, ~{remaining:.0f}s left)")
+
+    if not failed and all(entry['final'] for entry in done.values()):
+        # Nothing left to retry or refresh, so the next run starts from scratch
+        try:
+            os.remove(state_path)
+        except OSError:
+            pass
+    return done, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Prefetch game logs into the local cache')
+    parser.add_argument('players', nargs='*', help='Player IDs (e.g., "youngtr01") or full names')
+    parser.add_argument('--team', action='append', default=[],
+                        help='Team abbreviation (e.g., "BOS") whose current roster is prefetched; can be repeated')
+    parser.add_argument('--seasons', type=int, default=1,
+                        help='Number of seasons to prefetch (e.g., 2 for current and previous season)')
+    parser.add_argument('--workers', type=int, default=4, help='Game logs fetched concurrently')
+    parser.add_argument('--state-file', default=None,
+                        help='Checkpoint file used to resume interrupted runs')
+
+    args = parser.parse_args()
+    if not args.players and not args.team:
+        parser.error('Give at least one player or --team')
+    configure_logging()
+
+    scraper = BasketballReferenceScaper(max_workers=args.workers)
+    player_ids = resolve_players(scraper, args.players, args.team)
+    if not player_ids:
+        print("No players to prefetch.")
+        return 1
+
+    season_years = generate_season_years(args.seasons)
+    logs = [(player_id, season) for player_id in player_ids for season in season_years]
+    seasons_str = ", ".join([f"{s-1}-{s}" for s in season_years])
+    print(f"Prefetching {len(logs)} game logs for {len(player_ids)} players for seasons: {seasons_str}...")
+
+    try:
+        done, failed = prefetch(scraper, logs, args.state_file)
+    except KeyboardInterrupt:
+        print("\nInterrupted; run the same command again to resume.")
+        return 130
+
+    missing = sum(1 for entry in done.values() if entry['games'] == 0)
+    print(f"Done: {len(done) - missing} game logs stored, {missing} not found, {len(failed)} failed.")
+    if failed:
+        print("Run the same command again to retry the failed game logs.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
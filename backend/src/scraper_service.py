@@ -0,0 +1,144 @@
+"""
+Long-lived scraper shared by every request an API process serves.
+
+The scraper owns the HTTP connection pool and is wired to the process-wide rate
+limiter, response cache, game log store and player resolver, so all of them stay
+warm across requests. The APIs start it when they start (or on first use) and
+close it when they shut down:
+
+    start_scraper(config)   # e.g. the Flask app's config
+    scraper = get_scraper()
+    stop_scraper()
+
+Settings are read from the given config mapping first, then from the
+``NBAPROPS_<SETTING>`` environment variable, then from the defaults below.
+"""
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+from src.scrapers.basketball_reference import BasketballReferenceScaper
+from src.scrapers.game_log_parser import DEFAULT_ENGINE
+from src.scrapers.http_session import (
+    DEFAULT_MAX_RETRIES, DEFAULT_POOL_SIZE, DEFAULT_TIMEOUT, create_session
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes', 'on')
+    return bool(value)
+
+
+# Setting -> (parser, default)
+SETTINGS: Dict[str, Tuple[Callable[[Any], Any], Any]] = {
+    # Maximum number of pooled keep-alive connections to the site
+    'HTTP_POOL_SIZE': (int, DEFAULT_POOL_SIZE),
+    # Read timeout in seconds
+    'HTTP_TIMEOUT': (float, DEFAULT_TIMEOUT[1]),
+    # Retries on connection errors, 429 and 5xx responses
+    'HTTP_MAX_RETRIES': (int, DEFAULT_MAX_RETRIES),
+    # Game logs fetched concurrently for one request
+    'SCRAPER_WORKERS': (int, 4),
+    # Game log parser engine ("fast", "lxml", "strainer" or "html.parser")
+    'PARSER_ENGINE': (str, DEFAULT_ENGINE),
+    # Append only new games to out-of-date stored game logs
+    'INCREMENTAL_REFRESH': (_parse_bool, True),
+}
+
+_scraper: Optional[BasketballReferenceScaper] = None
+_scraper_lock = threading.Lock()
+
+
+def scraper_settings(config: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Resolve the scraper settings.
+
+    Args:
+        config: Optional mapping of settings (e.g., a Flask app's config), taking
+                precedence over ``NBAPROPS_<SETTING>`` environment variables
+
+    Returns:
+        Dictionary mapping each setting in ``SETTINGS`` to its parsed value
+    """
+    config = config or {}
+    settings = {}
+    for name, (parse, default) in SETTINGS.items():
+        value = config.get(name, os.environ.get(f"NBAPROPS_{name}"))
+        settings[name] = default if value is None else parse(value)
+    return settings
+
+
+def create_scraper(config: Optional[Mapping[str, Any]] = None) -> BasketballReferenceScaper:
+    """
+    Create a scraper with its own connection pool and the shared caches and rate limiter.
+
+    Args:
+        config: Optional settings (see ``scraper_settings``)
+
+    Returns:
+        New scraper; close it with ``BasketballReferenceScaper.close``
+    """
+    settings = scraper_settings(config)
+    session = create_session(settings['HTTP_POOL_SIZE'])
+    logger.info(f"Starting scraper with {settings['SCRAPER_WORKERS']} workers, {settings['HTTP_POOL_SIZE']} "
+                f"connections and the {settings['PARSER_ENGINE']} parser")
+    return BasketballReferenceScaper(
+        session=session,
+        max_retries=settings['HTTP_MAX_RETRIES'],
+        timeout=(DEFAULT_TIMEOUT[0], settings['HTTP_TIMEOUT']),
+        max_workers=settings['SCRAPER_WORKERS'],
+        parser_engine=settings['PARSER_ENGINE'],
+        incremental_refresh=settings['INCREMENTAL_REFRESH'],
+    )
+
+
+def start_scraper(config: Optional[Mapping[str, Any]] = None) -> BasketballReferenceScaper:
+    """
+    Start the shared scraper, replacing (and closing) a running one.
+
+    Args:
+        config: Optional settings (see ``scraper_settings``)
+
+    Returns:
+        Shared scraper
+    """
+    global _scraper
+    scraper = create_scraper(config)
+    with _scraper_lock:
+        previous, _scraper = _scraper, scraper
+    if previous is not None:
+        previous.close()
+    return scraper
+
+
+def get_scraper(config: Optional[Mapping[str, Any]] = None) -> BasketballReferenceScaper:
+    """
+    Get the shared scraper, starting it on first use.
+
+    Args:
+        config: Settings used if the scraper has not been started yet
+
+    Returns:
+        Shared scraper
+    """
+    global _scraper
+    scraper = _scraper
+    if scraper is not None:
+        return scraper
+    with _scraper_lock:
+        if _scraper is None:
+            _scraper = create_scraper(config)
+        return _scraper
+
+
+def stop_scraper() -> None:
+    """Close the shared scraper's connections. The next ``get_scraper`` starts a new one."""
+    global _scraper
+    with _scraper_lock:
+        scraper, _scraper = _scraper, None
+    if scraper is not None:
+        scraper.close()
@@ -0,0 +1,332 @@
+import asyncio
+import logging
+import re
+from typing import Dict, List, Optional, Union
+
+import httpx
+import pandas as pd
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from src.scrapers.basketball_reference import BasketballReferenceScaper, DateLike, _game_log_flights
+from src.scrapers.game_log_store import GameLogQuery
+from src.scrapers.http_session import DEFAULT_POOL_SIZE, DEFAULT_MAX_RETRIES, DEFAULT_BACKOFF_FACTOR
+from src.instrumentation import timed
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncBasketballReferenceScraper:
+    """
+    Asyncio version of the basketball-reference.com scraper.
+
+    Requests go through a pooled ``httpx.AsyncClient`` and wait for the shared rate
+    limiter on the event loop instead of blocking a thread, so many slow requests
+    can be in flight in one thread. The response cache, game log store, player ID
+    resolver, URL layout, retry policy, single-flight registry and parsing are those
+    of the wrapped synchronous scraper; cache and store I/O and HTML parsing run in
+    worker threads so they do not stall the event loop.
+    """
+
+    def __init__(self, scraper: Optional[BasketballReferenceScaper] = None,
+                 client: Optional[httpx.AsyncClient] = None, pool_size: int = DEFAULT_POOL_SIZE,
+                 max_retries: int = DEFAULT_MAX_RETRIES, backoff_factor: float = DEFAULT_BACKOFF_FACTOR):
+        """
+        Args:
+            scraper: Synchronous scraper providing the caches, rate limiter and parsers.
+                     Defaults to a scraper using the shared instances.
+            client: Optional httpx client to use. Defaults to a pooled client that
+                    follows redirects and uses the scraper's headers and timeout.
+            pool_size: Maximum number of pooled keep-alive connections
+            max_retries: Number of retries on connection errors, 429 and 5xx responses
+            backoff_factor: Exponential backoff factor between retries (in seconds)
+        """
+        self.scraper = scraper or BasketballReferenceScaper()
+        self.client = client or httpx.AsyncClient(
+            headers=self.scraper.headers,
+            timeout=_httpx_timeout(self.scraper.timeout),
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            follow_redirects=True,
+        )
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+
+    async def aclose(self) -> None:
+        """Close the HTTP client's connections."""
+        await self.client.aclose()
+
+    async def _get(self, url: str, ttl: Optional[float] = None) -> requests.Response:
+        """
+        Make a GET request, served from the response cache when possible.
+
+        Async counterpart of ``BasketballReferenceScaper._get``, sharing its cache
+        steps, which read and write the SQLite response cache in a worker thread.
+
+        Args:
+            url: URL to fetch
+            ttl: Seconds the response stays fresh in the cache, or None to never expire
+
+        Returns:
+            HTTP response as a ``requests.Response``, with ``queue_wait`` attached
+        """
+        cached, response = await asyncio.to_thread(self.scraper._cache_lookup, url)
+        if response is not None:
+            return response
+
+        try:
+            response = await self._fetch(url, self.scraper._request_headers(cached))
+        except httpx.TransportError as e:
+            if not cached:
+                raise
+            return await asyncio.to_thread(self.scraper._stale_response, cached, type(e).__name__, 0.0)
+        return await asyncio.to_thread(self.scraper._cache_response, url, ttl, cached, response)
+
+    async def _fetch(self, url: str, headers: Dict[str, str]) -> requests.Response:
+        """
+        Make a rate-limited GET request, retrying connection errors, 429 and 5xx
+        responses with exponential backoff.
+
+        Every attempt waits for its own rate limiter token, and the retry decisions
+        are those of ``BasketballReferenceScaper._fetch`` (see ``_retry_delay``).
+
+        Args:
+            url: URL to fetch
+            headers: Request headers
+
+        Returns:
+            HTTP response as a ``requests.Response``, with the total rate limit
+            queue wait attached as ``queue_wait``
+        """
+        scraper = self.scraper
+        queue_wait = 0.0
+        for attempt in range(self.max_retries + 1):
+            queue_wait += scraper._record_queue_wait(url, await scraper.rate_limiter.acquire_async())
+            try:
+                with timed('fetch'):
+                    response = await self.client.get(url, headers=headers)
+            except httpx.TransportError as e:
+                delay = scraper._retry_delay(url, attempt, self.max_retries, self.backoff_factor, error=e)
+            else:
+                delay = scraper._retry_delay(url, attempt, self.max_retries, self.backoff_factor,
+                                             response=response)
+                if delay is None:
+                    break
+            await asyncio.sleep(delay)
+
+        converted = _to_requests_response(response)
+        converted.queue_wait = queue_wait
+        return converted
+
+    async def search_players(self, query: str) -> List[Dict[str, str]]:
+        """
+        Search for players by name on basketball-reference.com.
+
+        Args:
+            query: Player name to search for
+
+        Returns:
+            List of dictionaries containing player information
+        """
+        if not query or len(query) < 2:
+            return []
+
+        # Clean the query - remove any text in parentheses
+        clean_query = re.sub(r'\s*\([^)]*\)', '', query).strip()
+        logger.debug(f"Searching for player: '{clean_query}'")
+
+        try:
+            search_url = f"{self.scraper.BASE_URL}/search/search.fcgi?search={clean_query}"
+            response = await self._get(search_url, ttl=self.scraper.SEARCH_TTL)
+
+            if response.status_code != 200:
+                logger.warning(f"Could not access {search_url} (Status code: {response.status_code})")
+                return []
+
+            with timed('parse_search'):
+                return await asyncio.to_thread(self.scraper._parse_search_results, response)
+
+        except Exception as e:
+            logger.exception(f"Error searching for players: {e}")
+            return []
+
+    async def resolve_player_id(self, player_name: str) -> Optional[str]:
+        """
+        Resolve a player's name to their verified basketball-reference.com ID.
+
+        Args:
+            player_name: Full name of the player (e.g., "Trae Young")
+
+        Returns:
+            Player ID (e.g., "youngtr01"), or None if no player matches the name
+        """
+        resolver = self.scraper.player_resolver
+        # The resolver saves new names to disk, so it runs in a worker thread
+        player_id = await asyncio.to_thread(resolver.resolve, player_name)
+        if player_id:
+            return player_id
+
+        # Not cached or indexed: search the site, then let the resolver pick and remember the match
+        results = await self.search_players(player_name)
+        return await asyncio.to_thread(resolver.resolve, player_name, lambda _: results)
+
+    async def get_game_log_by_id(self, player_id: str, season: int = 2025, columns: Optional[List[str]] = None,
+                                 query: Optional[GameLogQuery] = None) -> pd.DataFrame:
+        """
+        Get a player's game log for a specific season using their player ID directly.
+
+        Stored logs are read from the game log store in a worker thread; otherwise the
+        page is scraped once, even if several requests (sync or async) ask for it at
+        the same time.
+
+        Args:
+            player_id: Basketball Reference player ID (e.g., "youngtr01")
+            season: Season year (e.g., 2025 for 2024-2025 season)
+            columns: Optional list of columns to return
+            query: Optional games to return (by opponent, location, date range...)
+
+        Returns:
+            DataFrame containing the player's game log data
+        """
+        stored = await asyncio.to_thread(self.scraper._load_stored_game_log, player_id, season, columns, query)
+        if stored is not None:
+            return stored
+
+        game_log, shared = await _game_log_flights.do_async(
+            (player_id, season), lambda: self._scrape_and_store_game_log(player_id, season))
+        if shared:
+            logger.debug(f"Shared in-flight game log fetch for {player_id} ({season})")
+            game_log = game_log.copy()
+
+        return self.scraper._filter_game_log(game_log, columns, query)
+
+    def game_log_generation(self, player_id: str, season: int) -> Optional[str]:
+        """Get the version of a stored game log (see ``BasketballReferenceScaper.game_log_generation``)."""
+        return self.scraper.game_log_generation(player_id, season)
+
+    def game_log_is_final(self, player_id: str, season: int) -> bool:
+        """Check whether a stored game log is final (see ``BasketballReferenceScaper.game_log_is_final``)."""
+        return self.scraper.game_log_is_final(player_id, season)
+
+    async def _scrape_and_store_game_log(self, player_id: str, season: int) -> pd.DataFrame:
+        """
+        Download, parse and store a player's game log for a specific season.
+
+        Args:
+            player_id: Basketball Reference player ID (e.g., "youngtr01")
+            season: Season year (e.g., 2025 for 2024-2025 season)
+
+        Returns:
+            DataFrame containing the player's game log data
+        """
+        url = self.scraper._game_log_url(player_id, season)
+        # Decided before fetching: only a page fetched after the season ended is final
+        final = self.scraper.season_is_complete(season)
+        stored_meta = await asyncio.to_thread(self.scraper._refreshable_meta, player_id, season)
+        if stored_meta is not None:
+            # Only the games played since the stored copy are parsed and appended
+            logger.debug(f"Refreshing game log with ID: {player_id}, URL: {url}")
+            try:
+                response = await self._get(url, ttl=self.scraper._season_ttl(season))
+            except httpx.HTTPError as e:
+                logger.error(f"Error fetching data: {e}")
+                response = None
+            return await asyncio.to_thread(self.scraper._apply_game_log_update, response, player_id, season,
+                                           stored_meta, final)
+
+        logger.debug(f"Getting game log with ID: {player_id}, URL: {url}")
+
+        try:
+            response = await self._get(url, ttl=self.scraper._season_ttl(season))
+            return await asyncio.to_thread(self._parse_and_store, response, player_id, season, final)
+        except httpx.HTTPError as e:
+            logger.error(f"Error fetching data: {e}")
+        except Exception as e:
+            logger.exception(f"Unexpected error: {e}")
+        self.scraper._record_failed_fetch(player_id, season)
+        return pd.DataFrame()
+
+    def _parse_and_store(self, response: requests.Response, player_id: str, season: int,
+                         final: bool) -> pd.DataFrame:
+        """Parse a game log page and save it in the game log store (runs in a worker thread)."""
+        game_log = self.scraper._parse_game_log_response(response, player_id, season)
+        self.scraper._store_game_log(player_id, season, game_log, final)
+        return game_log
+
+    async def _fetch_season_logs(self, player_name: str, seasons: List[int], player_id: str,
+                                 columns: Optional[List[str]] = None,
+                                 query: Optional[GameLogQuery] = None) -> List[pd.DataFrame]:
+        """
+        Fetch a player's game logs for several seasons concurrently.
+
+        Returns:
+            List of game log DataFrames in the same order as ``seasons``
+        """
+        for season in seasons:
+            logger.debug(f"Fetching data for {player_name} for {season-1}-{season} season...")
+        return list(await asyncio.gather(*(self.get_game_log_by_id(player_id, season, columns=columns, query=query)
+                                           for season in seasons)))
+
+    async def get_recent_games(self, player_name: str, seasons: Union[List[int], int] = [2025],
+                               last_n_games: int = 10, player_id: str = None, location: str = None,
+                               since: DateLike = None, until: DateLike = None) -> pd.DataFrame:
+        """
+        Get a player's most recent games with complete stats, without filtering by opponent.
+
+        See ``BasketballReferenceScaper.get_recent_games``.
+        """
+        if isinstance(seasons, int):
+            seasons = [seasons]
+
+        if not player_id:
+            player_id = await self.resolve_player_id(player_name)
+            if not player_id:
+                logger.warning(f"Could not find a player named {player_name}")
+                return pd.DataFrame()
+
+        query = self.scraper.games_query(last_n_games, location=location, since=since, until=until)
+        season_logs = await self._fetch_season_logs(player_name, sorted(seasons, reverse=True), player_id,
+                                                    columns=self.scraper.RELEVANT_COLUMNS, query=query)
+        return self.scraper._select_recent_games(season_logs, player_name, last_n_games)
+
+    async def get_games_against_opponent(self, player_name: str, opponent: str,
+                                         seasons: Union[List[int], int] = [2025, 2024],
+                                         last_n_games: int = 10, player_id: str = None, location: str = None,
+                                         since: DateLike = None, until: DateLike = None) -> pd.DataFrame:
+        """
+        Get a player's most recent games with complete stats against a specific opponent.
+
+        See ``BasketballReferenceScaper.get_games_against_opponent``.
+        """
+        if isinstance(seasons, int):
+            seasons = [seasons]
+
+        if not player_id:
+            player_id = await self.resolve_player_id(player_name)
+            if not player_id:
+                logger.warning(f"Could not find a player named {player_name}")
+                return pd.DataFrame()
+
+        query = self.scraper.games_query(last_n_games, opponent=opponent, location=location,
+                                         since=since, until=until)
+        season_logs = await self._fetch_season_logs(player_name, sorted(seasons, reverse=True), player_id,
+                                                    columns=self.scraper.RELEVANT_COLUMNS, query=query)
+        return self.scraper._select_games_against_opponent(season_logs, player_name, opponent, last_n_games)
+
+
+def _httpx_timeout(timeout: Union[float, tuple]) -> httpx.Timeout:
+    """Convert a requests-style timeout (seconds or a (connect, read) tuple) for httpx."""
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+def _to_requests_response(response: httpx.Response) -> requests.Response:
+    """Wrap an httpx response as a ``requests.Response`` for the shared cache and parsers."""
+    converted = requests.Response()
+    converted.status_code = response.status_code
+    converted._content = response.content
+    converted.url = str(response.url)
+    converted.headers = CaseInsensitiveDict(response.headers)
+    converted.encoding = requests.utils.get_encoding_from_headers(converted.headers)
+    return converted
@@ -1,22 +1,336 @@
+import logging
+import os
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import pandas as pd
-import numpy as np
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Iterator, Optional, Tuple, Union
 import time
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date
+from src.scrapers.http_session import (
+    get_shared_session, retry_delay, DEFAULT_POOL_SIZE, DEFAULT_MAX_RETRIES, DEFAULT_BACKOFF_FACTOR,
+    DEFAULT_TIMEOUT
+)
+from src.scrapers.rate_limiter import TokenBucketRateLimiter, get_shared_rate_limiter
+from src.scrapers.response_cache import CachedResponse, ResponseCache, get_shared_response_cache
+from src.scrapers.game_log_store import GameLogQuery, GameLogStore, filter_game_log, get_shared_game_log_store
+from src.scrapers.game_log_parser import parse_game_log, COUNTING_STATS, DEFAULT_ENGINE
+from src.scrapers.player_resolver import PlayerIdResolver, get_shared_player_resolver
+from src.scrapers.single_flight import SingleFlight
+from src.scrapers.expiring_set import ExpiringSet
+from src.instrumentation import (
+    ROWS_PARSED_TOTAL, UPSTREAM_BYTES_TOTAL, UPSTREAM_REQUESTS_TOTAL, count, observe, record_cache, timed,
+    with_request_timings
+)
+
+logger = logging.getLogger(__name__)
+
+# Concurrent requests for the same game log page share one fetch across all scraper instances
+_game_log_flights = SingleFlight()
+
+# Dates accepted by the game filters: "YYYY-MM-DD" strings, dates or timestamps
+DateLike = Union[str, date, pd.Timestamp, None]
 
 class BasketballReferenceScaper:
     """
     Scraper for basketball-reference.com to get player game logs and statistics.
+    
+    Instances hold no per-request state (the session's connection pool, the rate
+    limiter and the caches are thread-safe), so one scraper can serve every
+    request of a process (see ``src.scraper_service``).
     """
-    BASE_URL = "https://www.basketball-reference.com"
+    # Can be pointed at a mirror or a local stub server with NBAPROPS_BASE_URL
+    BASE_URL = os.environ.get('NBAPROPS_BASE_URL', "https://www.basketball-reference.com").rstrip('/')
+    # Cache lifetimes in seconds. Completed seasons never change, so their pages never expire.
+    CURRENT_SEASON_TTL = 15 * 60
+    SEARCH_TTL = 24 * 60 * 60
+    # How long, and for how many game logs, the outcome of a failed fetch or a missing log is
+    # remembered for ``game_log_status``
+    FETCH_OUTCOME_TTL = CURRENT_SEASON_TTL
+    MAX_FETCH_OUTCOMES = 10000
+    # Columns returned by get_recent_games and get_games_against_opponent, including every
+    # counting stat that props can be set on
+    RELEVANT_COLUMNS = ['date_game', 'season', 'opp_id', 'game_location', 'mp', 'reason'] + COUNTING_STATS
     
-    def __init__(self):
+    def __init__(self, session: Optional[requests.Session] = None, pool_size: int = DEFAULT_POOL_SIZE,
+                 max_retries: int = DEFAULT_MAX_RETRIES, backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+                 timeout: Union[float, tuple] = DEFAULT_TIMEOUT,
+                 rate_limiter: Optional[TokenBucketRateLimiter] = None, max_workers: int = 4,
+                 response_cache: Optional[ResponseCache] = None, use_cache: bool = True,
+                 game_log_store: Optional[GameLogStore] = None, parser_engine: str = DEFAULT_ENGINE,
+                 player_resolver: Optional[PlayerIdResolver] = None, incremental_refresh: bool = True):
+        """
+        Args:
+            session: Optional requests session to use, closed by ``close``. Defaults to
+                     the shared, pooled session so that connections are reused across
+                     scraper instances.
+            pool_size: Maximum number of pooled keep-alive connections per host
+            max_retries: Number of retries on connection errors, 429 and 5xx responses
+            backoff_factor: Exponential backoff factor between retries (in seconds)
+            timeout: Request timeout in seconds, or a (connect, read) tuple
+            rate_limiter: Optional rate limiter. Defaults to the process-wide limiter
+                          so all scraper instances share one request budget.
+            max_workers: Maximum number of seasons fetched concurrently
+            response_cache: Optional on-disk response cache. Defaults to the shared cache.
+            game_log_store: Optional store for parsed game logs. Defaults to the shared store.
+            use_cache: Set to False to always fetch and parse pages from the network
+            parser_engine: Game log parser engine ("fast", "lxml", "strainer" or the
+                           original full-page "html.parser")
+            player_resolver: Optional name to player ID resolver. Defaults to the shared resolver.
+            incremental_refresh: When a stored current-season log is out of date, only parse
+                                 and append the games played since its last stored game
+        """
         # Set a reasonable User-Agent to avoid being blocked
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
+        self._owns_session = session is not None
+        self.session = session or get_shared_session(pool_size)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
+        self.max_workers = max_workers
+        self.response_cache = (response_cache or get_shared_response_cache()) if use_cache else None
+        self.game_log_store = (game_log_store or get_shared_game_log_store()) if use_cache else None
+        self.parser_engine = parser_engine
+        self.player_resolver = player_resolver or get_shared_player_resolver()
+        self.incremental_refresh = incremental_refresh
+        # (player_id, season) pairs the site confirmed have no game log (404 or no games)
+        self._missing_game_logs = ExpiringSet(self.FETCH_OUTCOME_TTL, self.MAX_FETCH_OUTCOMES)
+        # (player_id, season) pairs whose last fetch or refresh failed; a stored copy is out of date
+        self._failed_fetches = ExpiringSet(self.FETCH_OUTCOME_TTL, self.MAX_FETCH_OUTCOMES)
+    
+    def close(self) -> None:
+        """Close the session passed to the scraper. The process-wide shared session stays open."""
+        if self._owns_session:
+            self.session.close()
+    
+    def _get(self, url: str, ttl: Optional[float] = None, background: bool = False) -> requests.Response:
+        """
+        Make a GET request, served from the response cache when possible.
+        
+        Fresh cache entries are returned without touching the network. Stale entries
+        are revalidated with a conditional request (ETag/Last-Modified) when the server
+        provided validators, so an unchanged page costs a 304 instead of a full download.
+        If the revalidation fails with a connection error or a 5xx response, the stale
+        entry is served instead (stale-if-error).
+        
+        Args:
+            url: URL to fetch
+            ttl: Seconds the response stays fresh in the cache, or None to never expire
+            background: Fetch at background priority (see ``TokenBucketRateLimiter``)
+            
+        Returns:
+            HTTP response (retries on 429/5xx are handled by ``_fetch``). The time
+            spent waiting for the rate limiter is available as ``response.queue_wait``.
+        """
+        cached, response = self._cache_lookup(url)
+        if response is not None:
+            return response
+        
+        try:
+            response = self._fetch(url, self._request_headers(cached), background)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if not cached:
+                raise
+            return self._stale_response(cached, type(e).__name__, 0.0)
+        return self._cache_response(url, ttl, cached, response)
+    
+    def _cache_lookup(self, url: str) -> Tuple[Optional[CachedResponse], Optional[requests.Response]]:
+        """
+        Look up a URL in the response cache (the first step of ``_get``).
+        
+        Returns:
+            The cache entry, if any, and the response to serve if the entry is fresh
+        """
+        cached = self.response_cache.get(url) if self.response_cache else None
+        if cached and cached.is_fresh:
+            self.response_cache.record_hit()
+            response = cached.to_response()
+            response.queue_wait = 0.0
+            return cached, response
+        return cached, None
+    
+    def _request_headers(self, cached: Optional[CachedResponse]) -> Dict[str, str]:
+        """Get the request headers, with the validators of a stale cache entry to revalidate it."""
+        headers = dict(self.headers)
+        if cached:
+            if cached.etag:
+                headers['If-None-Match'] = cached.etag
+            if cached.last_modified:
+                headers['If-Modified-Since'] = cached.last_modified
+        return headers
+    
+    def _cache_response(self, url: str, ttl: Optional[float], cached: Optional[CachedResponse],
+                        response: requests.Response) -> requests.Response:
+        """
+        Update the response cache with a fetched response (the last step of ``_get``).
+        
+        Args:
+            url: Requested URL
+            ttl: Seconds the response stays fresh in the cache, or None to never expire
+            cached: Stale cache entry that was revalidated, if any
+            response: Fetched response, with ``queue_wait`` attached
+            
+        Returns:
+            The response to serve: the cache entry after a 304 or a 5xx, otherwise ``response``
+        """
+        if not self.response_cache:
+            return response
+        if cached and response.status_code >= 500:
+            return self._stale_response(cached, f"status {response.status_code}", response.queue_wait)
+        if cached and response.status_code == 304:
+            self.response_cache.record_revalidation()
+            self.response_cache.refresh(url, ttl)
+            queue_wait = response.queue_wait
+            response = cached.to_response()
+            response.queue_wait = queue_wait
+        else:
+            self.response_cache.record_miss()
+            if response.status_code == 200:
+                self.response_cache.put(url, response, ttl)
+        return response
+    
+    def _stale_response(self, cached: CachedResponse, error: str, queue_wait: float) -> requests.Response:
+        """
+        Serve a stale cache entry because its revalidation failed.
+        
+        Args:
+            cached: Stale cache entry
+            error: Description of the failure, for the log
+            queue_wait: Time spent waiting for the rate limiter
+            
+        Returns:
+            The cached response, with ``queue_wait`` attached
+        """
+        logger.warning(f"Serving stale {cached.url} after {error}")
+        self.response_cache.record_stale()
+        response = cached.to_response()
+        response.queue_wait = queue_wait
+        return response
+    
+    def _get_cached(self, url: str) -> Optional[requests.Response]:
+        """
+        Get a URL's response from the response cache, fresh or stale, without touching the network.
+        
+        Returns:
+            Cached response, or None if the URL is not cached
+        """
+        cached = self.response_cache.get(url) if self.response_cache else None
+        if cached is None:
+            return None
+        self.response_cache.record_hit()
+        response = cached.to_response()
+        response.queue_wait = 0.0
+        return response
+    
+    def _fetch(self, url: str, headers: Dict[str, str], background: bool = False) -> requests.Response:
+        """
+        Make a rate-limited GET request through the pooled session, retrying connection
+        errors, 429 and 5xx responses with exponential backoff (see ``_retry_delay``).
+        
+        Every attempt waits for its own rate limiter token, so retries count against
+        the request budget like any other request.
+        
+        Args:
+            url: URL to fetch
+            headers: Request headers
+            background: Wait for a full rate limit bucket, so user requests go first
+            
+        Returns:
+            HTTP response with the total rate limit queue wait attached as ``queue_wait``
+        """
+        queue_wait = 0.0
+        for attempt in range(self.max_retries + 1):
+            queue_wait += self._record_queue_wait(url, self.rate_limiter.acquire(background))
+            try:
+                with timed('fetch'):
+                    response = self.session.get(url, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                delay = self._retry_delay(url, attempt, self.max_retries, self.backoff_factor, error=e)
+            else:
+                delay = self._retry_delay(url, attempt, self.max_retries, self.backoff_factor, response=response)
+                if delay is None:
+                    break
+            time.sleep(delay)
+        
+        response.queue_wait = queue_wait
+        return response
+    
+    @staticmethod
+    def _record_queue_wait(url: str, wait: float) -> float:
+        """Record the time a request waited for the rate limiter, returning it."""
+        observe('rate_limit', wait)
+        if wait > 0.01:
+            logger.info(f"Waited {wait:.2f}s in the rate limit queue for {url}")
+        return wait
+    
+    @staticmethod
+    def _retry_delay(url: str, attempt: int, max_retries: int, backoff_factor: float,
+                     response=None, error: Optional[Exception] = None) -> Optional[float]:
+        """
+        Record a finished request attempt and decide whether to retry it (see ``retry_delay``).
+        
+        Shared by the sync and async fetch loops.
+        
+        Args:
+            url: Requested URL
+            attempt: Number of the attempt, starting at 0
+            max_retries: Number of retries allowed after the first attempt
+            backoff_factor: Exponential backoff factor between retries (in seconds)
+            response: Response of the attempt (requests or httpx), if it got one
+            error: Connection error of the attempt, if it failed
+            
+        Returns:
+            Seconds to wait before the next attempt, or None to return ``response``
+            
+        Raises:
+            The attempt's error if it is not retried
+        """
+        if error is not None:
+            delay = retry_delay(attempt, max_retries, backoff_factor)
+            if delay is None:
+                raise error
+            logger.warning(f"Retrying {url} in {delay:.1f}s after {type(error).__name__}")
+            return delay
+        
+        count(UPSTREAM_REQUESTS_TOTAL, status=response.status_code)
+        count(UPSTREAM_BYTES_TOTAL, len(response.content), server_timing='bytes')
+        delay = retry_delay(attempt, max_retries, backoff_factor, response.status_code, response.headers)
+        if delay is not None:
+            logger.warning(f"Retrying {url} in {delay:.1f}s after status {response.status_code}")
+        return delay
+    
+    def _season_ttl(self, season: int) -> Optional[float]:
+        """
+        Get the cache lifetime for a season's pages.
+        
+        Args:
+            season: Season year (e.g., 2025 for 2024-2025 season)
+            
+        Returns:
+            Short TTL for the current (or a future) season, None for completed seasons
+        """
+        # Imported here because src.main imports this module
+        from src.main import get_current_season
+        
+        if season < get_current_season():
+            return None
+        return self.CURRENT_SEASON_TTL
+    
+    def season_is_complete(self, season: int) -> bool:
+        """
+        Check whether a season has ended, so a game log fetched now is final and never changes.
+        
+        Args:
+            season: Season year (e.g., 2025 for 2024-2025 season)
+            
+        Returns:
+            True for a completed season, False for the current (or a future) season
+        """
+        return self._season_ttl(season) is None
     
     def search_players(self, query: str) -> List[Dict[str, str]]:
         """
@@ -26,307 +340,403 @@ class BasketballReferenceScaper:
             query: Player name to search for
             
         Returns:
-            List of dictionaries containing player information
+            List of dictionaries containing player information: id, name, team,
+            position and the player's last season ("to", None if not listed)
         """
         if not query or len(query) < 2:
             return []
             
         # Clean the query - remove any text in parentheses
         clean_query = re.sub(r'\s*\([^)]*\)', '', query).strip()
-        print(f"Searching for player: '{clean_query}'")
+        logger.debug(f"Searching for player: '{clean_query}'")
             
         try:
-            # Add a small delay to avoid overwhelming the server
-            time.sleep(1)
-            
             # Format the search URL - basketball-reference uses a search page
             search_url = f"{self.BASE_URL}/search/search.fcgi?search={clean_query}"
             
             # Make HTTP request
-            response = requests.get(search_url, headers=self.headers)
+            response = self._get(search_url, ttl=self.SEARCH_TTL)
             
             # Check if we got a valid response
             if response.status_code != 200:
-                print(f"Warning: Could not access {search_url} (Status code: {response.status_code})")
+                logger.warning(f"Could not access {search_url} (Status code: {response.status_code})")
                 return []
-                
-            # Parse HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
             
-            # Check if we were redirected to a player page directly
-            # This happens if the search matches exactly one player
-            if 'players' in response.url:
-                player_id = response.url.split('/')[-1].split('.')[0]
-                
-                # Extract player info from the page
-                name_element = soup.find('h1', {'itemprop': 'name'})
-                if not name_element:
-                    print("Warning: Could not find player name on page")
-                    return []
-                    
-                player_name = name_element.text.strip()
-                # Remove any years in parentheses
-                player_name = re.sub(r'\s*\([^)]*\)', '', player_name).strip()
-                
-                # Try to find team and position
-                team = "Unknown"
-                position = "Unknown"
+            with timed('parse_search'):
+                return self._parse_search_results(response)
+            
+        except Exception as e:
+            logger.exception(f"Error searching for players: {e}")
+            return []
+    
+    def _parse_search_results(self, response: requests.Response) -> List[Dict[str, str]]:
+        """
+        Parse a player search response.
+        
+        Args:
+            response: Response of the search page, or of the player page it redirected to
+            
+        Returns:
+            List of dictionaries containing player information
+        """
+        # Parse HTML
+        soup = BeautifulSoup(response.content, 'html.parser')
+        
+        # Check if we were redirected to a player page directly
+        # This happens if the search matches exactly one player
+        if 'players' in response.url:
+            player_id = response.url.split('/')[-1].split('.')[0]
+            
+            # Extract player info from the page
+            name_element = soup.find('h1', {'itemprop': 'name'})
+            if not name_element:
+                logger.warning("Could not find player name on page")
+                return []
                 
-                # Look for the team info
-                team_info = soup.select_one('div#meta p:contains("Team:")')
-                if team_info:
-                    team_link = team_info.find('a')
-                    if team_link:
-                        team = team_link.text.strip()
+            player_name = name_element.text.strip()
+            # Remove any years in parentheses
+            player_name = re.sub(r'\s*\([^)]*\)', '', player_name).strip()
+            
+            # Try to find team and position
+            team = "Unknown"
+            position = "Unknown"
+            
+            # Look for the team info
+            team_info = soup.select_one('div#meta p:contains("Team:")')
+            if team_info:
+                team_link = team_info.find('a')
+                if team_link:
+                    team = team_link.text.strip()
+            
+            # Look for position info
+            position_info = soup.select_one('div#meta p:contains("Position:")')
+            if position_info:
+                position_text = position_info.text.strip()
+                position_match = re.search(r'Position:\s*(.*?)(?:\s*Shoots:|$)', position_text)
+                if position_match:
+                    position = position_match.group(1).strip()
+            
+            logger.debug(f"Found player: {player_name}, Team: {team}, Position: {position}")
+            return [{
+                "id": player_id,
+                "name": player_name,
+                "team": team,
+                "position": position,
+                "to": None
+            }]
+        
+        # Handle search results page (multiple matches)
+        search_results = []
+        
+        # Look for player section
+        player_section = soup.find('div', {'id': 'players'})
+        if not player_section:
+            logger.warning("No player section found in search results")
+            return []
+            
+        # Find all player entries
+        player_entries = player_section.find_all('div', {'class': 'search-item'})
+        logger.debug(f"Found {len(player_entries)} players in search results")
+        
+        for entry in player_entries:
+            # Get player name and link
+            name_div = entry.find('div', {'class': 'search-item-name'})
+            if not name_div:
+                continue
                 
-                # Look for position info
-                position_info = soup.select_one('div#meta p:contains("Position:")')
-                if position_info:
-                    position_text = position_info.text.strip()
-                    position_match = re.search(r'Position:\s*(.*?)(?:\s*Shoots:|$)', position_text)
-                    if position_match:
-                        position = position_match.group(1).strip()
+            name_link = name_div.find('a')
+            if not name_link:
+                continue
+            
+            player_name = name_link.text.strip()
+            # The last season in the years ("(2019-2025)") ranks players sharing a name
+            years = re.search(r'\((\d{4})-(\d{4})\)', player_name)
+            # Remove any years in parentheses
+            player_name = re.sub(r'\s*\([^)]*\)', '', player_name).strip()
+            
+            player_url = name_link['href']
+            player_id = player_url.split('/')[-1].split('.')[0]
+            
+            # Get player details
+            details_div = entry.find('div', {'class': 'search-item-url'})
+            if not details_div:
+                continue
                 
-                print(f"Found player: {player_name}, Team: {team}, Position: {position}")
-                return [{
-                    "id": player_id,
-                    "name": player_name,
-                    "team": team,
-                    "position": position
-                }]
-            
-            # Handle search results page (multiple matches)
-            search_results = []
-            
-            # Look for player section
-            player_section = soup.find('div', {'id': 'players'})
-            if not player_section:
-                print("Warning: No player section found in search results")
+            details = details_div.text.strip()
+            
+            # Try to extract team and position from details
+            team = "Unknown"
+            position = "Unknown"
+            
+            # Example format: "Position: Point Guard • Shoots: Right • 6-2, 185lb • Team: Golden State Warriors"
+            team_match = re.search(r'Team:\s*(.*?)(?:\s*\•|\s*$)', details)
+            if team_match:
+                team = team_match.group(1).strip()
+            
+            position_match = re.search(r'Position:\s*(.*?)(?:\s*\•|\s*$)', details)
+            if position_match:
+                # Convert full position to abbreviation
+                full_position = position_match.group(1).strip()
+                if 'Point Guard' in full_position or 'PG' in full_position:
+                    position = 'PG'
+                elif 'Shooting Guard' in full_position or 'SG' in full_position:
+                    position = 'SG'
+                elif 'Small Forward' in full_position or 'SF' in full_position:
+                    position = 'SF'
+                elif 'Power Forward' in full_position or 'PF' in full_position:
+                    position = 'PF'
+                elif 'Center' in full_position or 'C' in full_position:
+                    position = 'C'
+                else:
+                    position = full_position  # Keep as is if not recognized
+            
+            search_results.append({
+                "id": player_id,
+                "name": player_name,
+                "team": team,
+                "position": position,
+                "to": int(years.group(2)) if years else None
+            })
+        
+        # For active NBA players only, limit to 25 results
+        return search_results[:25]
+    
+    def get_player_directory(self, letter: str, background: bool = False,
+                             cached_only: bool = False) -> List[Dict[str, Any]]:
+        """
+        Get all players whose last name starts with a letter from the player directory.
+        
+        Args:
+            letter: First letter of the last name (e.g., "j")
+            background: Fetch at background priority, after user requests
+            cached_only: Only read the page from the response cache, even if it is stale
+            
+        Returns:
+            List of dictionaries with the player's id, name, position, first and last
+            season, and whether they are active
+        """
+        url = f"{self.BASE_URL}/players/{letter.lower()}/"
+        try:
+            if cached_only:
+                response = self._get_cached(url)
+                if response is None:
+                    return []
+            else:
+                response = self._get(url, ttl=self.SEARCH_TTL, background=background)
+            if response.status_code != 200:
+                logger.warning(f"Could not access {url} (Status code: {response.status_code})")
                 return []
-                
-            # Find all player entries
-            player_entries = player_section.find_all('div', {'class': 'search-item'})
-            print(f"Found {len(player_entries)} players in search results")
-            
-            for entry in player_entries:
-                # Get player name and link
-                name_div = entry.find('div', {'class': 'search-item-name'})
-                if not name_div:
-                    continue
-                    
-                name_link = name_div.find('a')
-                if not name_link:
+            
+            soup = BeautifulSoup(response.content, 'html.parser', parse_only=SoupStrainer('table', id='players'))
+            players = []
+            for row in soup.select('tbody tr'):
+                name_cell = row.find('th', {'data-stat': 'player'})
+                link = name_cell.find('a') if name_cell else None
+                if not link:
                     continue
                 
-                player_name = name_link.text.strip()
-                # Remove any years in parentheses
-                player_name = re.sub(r'\s*\([^)]*\)', '', player_name).strip()
-                
-                player_url = name_link['href']
-                player_id = player_url.split('/')[-1].split('.')[0]
-                
-                # Get player details
-                details_div = entry.find('div', {'class': 'search-item-url'})
-                if not details_div:
+                cells = {cell.get('data-stat'): cell.text.strip() for cell in row.find_all('td')}
+                players.append({
+                    "id": link['href'].split('/')[-1].split('.')[0],
+                    "name": link.text.strip(),
+                    "position": cells.get('pos') or "Unknown",
+                    "from": int(cells['year_min']) if cells.get('year_min', '').isdigit() else None,
+                    "to": int(cells['year_max']) if cells.get('year_max', '').isdigit() else None,
+                    # Active players are shown in bold
+                    "active": name_cell.find('strong') is not None
+                })
+            return players
+            
+        except requests.RequestException as e:
+            logger.error(f"Error fetching player directory: {e}")
+            return []
+    
+    def get_league_players(self, season: int, background: bool = False,
+                           cached_only: bool = False) -> List[Dict[str, str]]:
+        """
+        Get every player who appeared in a season with their latest team.
+        
+        Args:
+            season: Season year (e.g., 2025 for 2024-2025 season)
+            background: Fetch at background priority, after user requests
+            cached_only: Only read the page from the response cache, even if it is stale
+            
+        Returns:
+            List of dictionaries with the player's id, name, team abbreviation and position
+        """
+        url = f"{self.BASE_URL}/leagues/NBA_{season}_per_game.html"
+        try:
+            if cached_only:
+                response = self._get_cached(url)
+                if response is None:
+                    return []
+            else:
+                response = self._get(url, ttl=self.SEARCH_TTL, background=background)
+            if response.status_code != 200:
+                logger.warning(f"Could not access {url} (Status code: {response.status_code})")
+                return []
+            
+            soup = BeautifulSoup(response.content, 'html.parser',
+                                 parse_only=SoupStrainer('table', id='per_game_stats'))
+            players = {}
+            for row in soup.select('tbody tr'):
+                name_cell = row.find(attrs={'data-stat': 'player'})
+                link = name_cell.find('a') if name_cell else None
+                if not link:
                     continue
-                    
-                details = details_div.text.strip()
-                
-                # Try to extract team and position from details
-                team = "Unknown"
-                position = "Unknown"
                 
-                # Example format: "Position: Point Guard • Shoots: Right • 6-2, 185lb • Team: Golden State Warriors"
-                team_match = re.search(r'Team:\s*(.*?)(?:\s*\•|\s*$)', details)
-                if team_match:
-                    team = team_match.group(1).strip()
-                
-                position_match = re.search(r'Position:\s*(.*?)(?:\s*\•|\s*$)', details)
-                if position_match:
-                    # Convert full position to abbreviation
-                    full_position = position_match.group(1).strip()
-                    if 'Point Guard' in full_position or 'PG' in full_position:
-                        position = 'PG'
-                    elif 'Shooting Guard' in full_position or 'SG' in full_position:
-                        position = 'SG'
-                    elif 'Small Forward' in full_position or 'SF' in full_position:
-                        position = 'SF'
-                    elif 'Power Forward' in full_position or 'PF' in full_position:
-                        position = 'PF'
-                    elif 'Center' in full_position or 'C' in full_position:
-                        position = 'C'
-                    else:
-                        position = full_position  # Keep as is if not recognized
-                
-                search_results.append({
-                    "id": player_id,
-                    "name": player_name,
-                    "team": team,
-                    "position": position
-                })
+                cells = {cell.get('data-stat'): cell.text.strip() for cell in row.find_all('td')}
+                team = cells.get('team_id', '')
+                player_id = link['href'].split('/')[-1].split('.')[0]
+                # Traded players have a "TOT" row followed by one row per team; keep the last team
+                if team and team != 'TOT':
+                    players[player_id] = {
+                        "id": player_id,
+                        "name": link.text.strip(),
+                        "team": team,
+                        "position": cells.get('pos') or "Unknown"
+                    }
+            return list(players.values())
             
-            # For active NBA players only, limit to 25 results
-            return search_results[:25]
+        except requests.RequestException as e:
+            logger.error(f"Error fetching league players: {e}")
+            return []
+    
+    def resolve_player_id(self, player_name: str) -> Optional[str]:
+        """
+        Resolve a player's name to their verified basketball-reference.com ID.
+        
+        Args:
+            player_name: Full name of the player (e.g., "Trae Young")
             
-        except Exception as e:
-            print(f"Error searching for players: {e}")
-            import traceback
-            traceback.print_exc()
-            # Fallback to hardcoded players in case of error
-            fallback_players = [
-                {"id": "jamesle01", "name": "LeBron James", "team": "Los Angeles Lakers", "position": "SF"},
-                {"id": "curryst01", "name": "Stephen Curry", "team": "Golden State Warriors", "position": "PG"},
-                {"id": "duranke01", "name": "Kevin Durant", "team": "Phoenix Suns", "position": "SF"},
-                {"id": "antetgi01", "name": "Giannis Antetokounmpo", "team": "Milwaukee Bucks", "position": "PF"},
-                {"id": "doncilu01", "name": "Luka Dončić", "team": "Dallas Mavericks", "position": "PG"}
-            ]
-            return [p for p in fallback_players if clean_query.lower() in p["name"].lower()]
-    
-    def _format_player_url(self, player_name: str, season: int = 2025) -> str:
+        Returns:
+            Player ID (e.g., "youngtr01"), or None if no player matches the name
+        """
+        return self.player_resolver.resolve(player_name, search=self.search_players)
+    
+    def _game_log_url(self, player_id: str, season: int) -> str:
         """
         Format the URL for a player's game log on basketball-reference.com.
         
         Args:
-            player_name: Full name of the player (e.g., "Trae Young")
+            player_id: Basketball Reference player ID (e.g., "youngtr01")
             season: Season year (e.g., 2025 for 2024-2025 season)
             
         Returns:
-            Formatted URL for the player's game log
+            URL for the player's game log
         """
-        # Clean the player name - remove any text in parentheses
-        player_name = re.sub(r'\s*\([^)]*\)', '', player_name).strip()
-        print(f"Formatting URL for player: '{player_name}'")
-        
-        # Split the name into first and last name
-        name_parts = player_name.strip().split()
-        if len(name_parts) < 2:
-            raise ValueError(f"Player name must include first and last name: {player_name}")
-        
-        # Extract first and last name
-        first_name = name_parts[0].lower()
-        last_name = name_parts[-1].lower()
-        
-        # Format the player ID according to basketball-reference convention
-        # [first letter of last name]/[first five letters of last name][first two letters of first name]01
-        last_name_prefix = last_name[:5] if len(last_name) >= 5 else last_name
-        first_name_prefix = first_name[:2] if len(first_name) >= 2 else first_name
-        
-        player_id = f"{last_name[0]}/{last_name_prefix}{first_name_prefix}01"
-        
-        # Format the complete URL
-        url = f"{self.BASE_URL}/players/{player_id}/gamelog/{season}"
-        print(f"Generated URL: {url}")
-        return url
+        # First letter of ID + / + full ID + / + gamelog + / + season
+        return f"{self.BASE_URL}/players/{player_id[0]}/{player_id}/gamelog/{season}"
     
-    def get_game_log(self, player_name: str, season: int = 2025) -> pd.DataFrame:
+    def get_game_log(self, player_name: str, season: int = 2025,
+                     columns: Optional[List[str]] = None) -> pd.DataFrame:
         """
         Get a player's game log for a specific season.
         
         Args:
             player_name: Full name of the player (e.g., "Trae Young")
             season: Season year (e.g., 2025 for 2024-2025 season)
+            columns: Optional list of columns to return
             
         Returns:
             DataFrame containing the player's game log data
         """
-        url = self._format_player_url(player_name, season)
+        player_id = self.resolve_player_id(player_name)
+        if not player_id:
+            logger.warning(f"Could not find a player named {player_name}")
+            return pd.DataFrame()
         
-        try:
-            # Add a small delay to avoid overwhelming the server
-            time.sleep(1)
-            
-            # Make HTTP request
-            response = requests.get(url, headers=self.headers)
-            
-            # Check if we got a valid response
-            if response.status_code != 200:
-                print(f"Warning: Could not access {url} (Status code: {response.status_code})")
-                print("This could be due to an incorrect player name or player ID format.")
-                print("Please double-check the player name or try a different player.")
-                return pd.DataFrame()
-            
-            # Parse HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find the table containing the game log data
-            table_div = soup.find('div', {'id': 'div_pgl_basic'})
-            if not table_div:
-                print(f"Warning: Could not find game log data for {player_name}")
-                print("The player might not have played in the specified season or the page format has changed.")
-                return pd.DataFrame()
-            
-            # Extract table rows from tbody
-            tbody = table_div.find('tbody')
-            if not tbody:
-                print(f"Warning: Could not find game log table body for {player_name}")
-                return pd.DataFrame()
-                
-            rows = tbody.find_all('tr', class_=lambda c: c != 'thead')
+        return self.get_game_log_by_id(player_id, season, columns=columns)
+    
+    def _fetch_season_logs(self, player_name: str, seasons: List[int], player_id: str,
+                           columns: Optional[List[str]] = None,
+                           query: Optional[GameLogQuery] = None) -> List[pd.DataFrame]:
+        """
+        Fetch a player's game logs for several seasons concurrently.
+        
+        All requests still go through the shared rate limiter, so running them in
+        parallel only removes the idle time between them, not the request budget.
+        
+        Args:
+            player_name: Full name of the player (e.g., "Trae Young")
+            seasons: List of season years
+            player_id: Basketball Reference player ID
+            columns: Optional list of columns to return
+            query: Optional games to return from each season
             
-            # Process each row to extract game data
-            games_data = []
-            for row in rows:
-                # Skip header rows or rows without data
-                if 'class' in row.attrs and 'thead' in row.attrs['class']:
-                    continue
-                
-                # Skip rows for games that weren't played (e.g., "Did Not Play")
-                if not row.find('td', {'data-stat': 'date_game'}):
-                    continue
-                
-                # Check if the player actually played in the game
-                # Look for "Did Not Play", "Inactive", etc.
-                reason_cell = row.find('td', {'data-stat': 'reason'})
-                if reason_cell and reason_cell.text.strip() in ["Did Not Play", "Inactive", "Did Not Dress"]:
-                    # Add the game with NaN values for stats
-                    game_data = {
-                        'date_game': row.find('td', {'data-stat': 'date_game'}).text.strip(),
-                        'opp_id': row.find('td', {'data-stat': 'opp_id'}).text.strip() if row.find('td', {'data-stat': 'opp_id'}) else None,
-                        'game_location': row.find('td', {'data-stat': 'game_location'}).text.strip() if row.find('td', {'data-stat': 'game_location'}) else None,
-                        'pts': np.nan,
-                        'ast': np.nan,
-                        'trb': np.nan,
-                        'reason': reason_cell.text.strip()
-                    }
-                    game_data['season'] = f"{season-1}-{season}"
-                    games_data.append(game_data)
-                    continue
-                
-                game_data = {}
-                
-                # Extract basic game information
-                for cell in row.find_all('td'):
-                    stat_name = cell.get('data-stat')
-                    if stat_name:
-                        # Get the text value
-                        value = cell.text.strip()
-                        
-                        # Convert some values to appropriate types
-                        if stat_name in ['pts', 'ast', 'trb']:
-                            try:
-                                value = int(value) if value else np.nan
-                            except ValueError:
-                                value = np.nan
-                        
-                        game_data[stat_name] = value
-                
-                # Add season information to distinguish between seasons
-                game_data['season'] = f"{season-1}-{season}"
-                
-                games_data.append(game_data)
+        Returns:
+            List of game log DataFrames in the same order as ``seasons``
+        """
+        def fetch(season: int) -> pd.DataFrame:
+            logger.debug(f"Fetching data for {player_name} for {season-1}-{season} season...")
+            return self.get_game_log_by_id(player_id, season, columns=columns, query=query)
+        
+        if len(seasons) <= 1 or self.max_workers <= 1:
+            return [fetch(season) for season in seasons]
+        
+        with ThreadPoolExecutor(max_workers=min(len(seasons), self.max_workers)) as executor:
+            # map() yields results in input order, so seasons stay in the requested order
+            return list(executor.map(with_request_timings(fetch), seasons))
+    
+    def prefetch_game_logs(self, logs: List[tuple]) -> Dict[tuple, bool]:
+        """
+        Fetch and store several game logs concurrently.
+        
+        Duplicate (player_id, season) pairs are fetched once, and all requests share
+        the rate limiter. Later calls to ``get_game_log_by_id`` for these logs are
+        answered from the game log store.
+        
+        Args:
+            logs: List of (player_id, season) tuples
             
-            # Convert to DataFrame
-            return pd.DataFrame(games_data)
+        Returns:
+            Dictionary mapping each (player_id, season) to whether a game log was found
+        """
+        unique_logs = list(dict.fromkeys(logs))
+        if not unique_logs:
+            return {}
+        
+        def fetch(log: tuple) -> bool:
+            player_id, season = log
+            return not self.get_game_log_by_id(player_id, season, columns=['date_game']).empty
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(len(unique_logs), self.max_workers))) as executor:
+            return dict(zip(unique_logs, executor.map(with_request_timings(fetch), unique_logs)))
+    
+    def iter_game_logs(self, logs: List[tuple], columns: Optional[List[str]] = None,
+                       query: Optional[GameLogQuery] = None) -> Iterator[Tuple[tuple, pd.DataFrame]]:
+        """
+        Fetch several game logs concurrently, yielding each one as soon as it is ready.
+        
+        Duplicate (player_id, season) pairs are fetched once, and all requests share
+        the rate limiter. Logs are yielded in completion order, not input order.
+        
+        Args:
+            logs: List of (player_id, season) tuples
+            columns: Optional list of columns to return
+            query: Optional games to return from each log
             
-        except requests.RequestException as e:
-            print(f"Error fetching data: {e}")
-            return pd.DataFrame()
-        except Exception as e:
-            print(f"Unexpected error: {e}")
-            return pd.DataFrame()
+        Yields:
+            ((player_id, season), game log DataFrame) tuples
+        """
+        unique_logs = list(dict.fromkeys(logs))
+        if not unique_logs:
+            return
+        
+        executor = ThreadPoolExecutor(max_workers=max(1, min(len(unique_logs), self.max_workers)))
+        try:
+            fetch = with_request_timings(self.get_game_log_by_id)
+            futures = {executor.submit(fetch, player_id, season, columns, query): (player_id, season)
+                       for player_id, season in unique_logs}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            # Do not start the remaining fetches if the consumer stopped early
+            executor.shutdown(wait=False, cancel_futures=True)
     
     def get_recent_games(self, player_name: str, seasons: Union[List[int], int] = [2025], 
-                         last_n_games: int = 10, player_id: str = None) -> pd.DataFrame:
+                         last_n_games: int = 10, player_id: str = None, location: str = None,
+                         since: DateLike = None, until: DateLike = None) -> pd.DataFrame:
         """
         Get a player's most recent games without filtering by opponent.
         Will fetch enough games to return the requested number of games actually played
@@ -337,7 +747,12 @@ class BasketballReferenceScaper:
             seasons: List of season years or a single season year
                     (e.g., [2025, 2024] for both 2024-2025 and 2023-2024 seasons)
             last_n_games: Number of most recent games with complete stats to return (default: 10)
-            player_id: Optional Basketball Reference player ID to use instead of generating from name
+            player_id: Optional Basketball Reference player ID to use instead of resolving the name
+            location: Optional location ("H" for home or "A" for away games); the most
+                      recent games at that location are returned
+            since: Optional first date of games to include (e.g., "2025-02-20" for games
+                   since the All-Star break)
+            until: Optional last date of games to include
             
         Returns:
             DataFrame containing the player's recent game data
@@ -346,47 +761,73 @@ class BasketballReferenceScaper:
         if isinstance(seasons, int):
             seasons = [seasons]
         
-        # Get game logs for each season and combine them
-        all_games = []
-        for season in seasons:
-            print(f"Fetching data for {player_name} for {season-1}-{season} season...")
-            if player_id:
-                game_log = self.get_game_log_by_id(player_id, season)
-            else:
-                game_log = self.get_game_log(player_name, season)
+        # Resolve the player ID once for all seasons
+        if not player_id:
+            player_id = self.resolve_player_id(player_name)
+            if not player_id:
+                logger.warning(f"Could not find a player named {player_name}")
+                return pd.DataFrame()
+        
+        # Get the matching games of all seasons concurrently and combine them
+        query = self.games_query(last_n_games, location=location, since=since, until=until)
+        season_logs = self._fetch_season_logs(player_name, sorted(seasons, reverse=True), player_id,
+                                              columns=self.RELEVANT_COLUMNS, query=query)
+        return self._select_recent_games(season_logs, player_name, last_n_games)
+    
+    @staticmethod
+    def games_query(last_n_games: int, opponent: Optional[str] = None, location: Optional[str] = None,
+                    since: DateLike = None, until: DateLike = None) -> GameLogQuery:
+        """
+        Build the query for one season's most recent games with complete stats matching the
+        filters, as used by ``get_recent_games`` and ``get_games_against_opponent``.
+        """
+        return GameLogQuery(
+            opponent=opponent,
+            location=location,
+            since=pd.Timestamp(since) if since is not None else None,
+            until=pd.Timestamp(until) if until is not None else None,
+            played_only=True,
+            limit=last_n_games,
+        )
+    
+    def _select_recent_games(self, season_logs: List[pd.DataFrame], player_name: str,
+                             last_n_games: int) -> pd.DataFrame:
+        """
+        Combine season game logs and select the most recent games with complete stats.
+        
+        Args:
+            season_logs: Game logs of the games with complete stats, most recent first,
+                         one per season from the most recent season
+            player_name: Full name of the player, used in messages
+            last_n_games: Number of most recent games with complete stats to return
             
-            if not game_log.empty:
-                all_games.append(game_log)
+        Returns:
+            DataFrame containing the player's recent game data
+        """
+        all_games = [game_log for game_log in season_logs if not game_log.empty]
         
-        # Combine all season data
+        # Combine all season data; the logs are already in order, newest first
         if all_games:
             combined_games = pd.concat(all_games, ignore_index=True)
         else:
-            print(f"No game data found for {player_name} in the specified seasons.")
+            logger.info(f"No game data found for {player_name} in the specified seasons.")
             return pd.DataFrame()
         
-        # Sort by date (newest first)
-        if 'date_game' in combined_games.columns:
-            combined_games = combined_games.sort_values(by='date_game', ascending=False)
-        
-        # Filter for games with complete stats
-        valid_games = combined_games.dropna(subset=['pts', 'ast', 'trb'])
-        
         # Get the most recent N games with complete stats
-        valid_recent_games = valid_games.head(last_n_games)
+        valid_recent_games = combined_games.head(last_n_games)
         
         # If we don't have enough games with valid stats, fetch more
         if len(valid_recent_games) < last_n_games:
-            print(f"Only found {len(valid_recent_games)} games with complete stats out of requested {last_n_games}.")
+            logger.info(f"Only found {len(valid_recent_games)} games with complete stats out of requested {last_n_games}.")
         
         # Select only the columns we need
-        relevant_columns = ['date_game', 'season', 'opp_id', 'game_location', 'pts', 'ast', 'trb', 'mp', 'reason']
-        columns_to_keep = [col for col in relevant_columns if col in valid_recent_games.columns]
+        columns_to_keep = [col for col in self.RELEVANT_COLUMNS if col in valid_recent_games.columns]
         
         return valid_recent_games[columns_to_keep]
 
     def get_games_against_opponent(self, player_name: str, opponent: str, seasons: Union[List[int], int] = [2025, 2024], 
-                                 last_n_games: int = 10, player_id: str = None) -> pd.DataFrame:
+                                 last_n_games: int = 10, player_id: str = None, location: str = None,
+                                 since: DateLike = None, until: DateLike = None) -> pd.DataFrame:
         """
         Get a player's games against a specific opponent for one or more seasons.
         Will fetch enough games to return the requested number of games actually played
@@ -398,7 +839,10 @@ class BasketballReferenceScaper:
             seasons: List of season years or a single season year
                     (e.g., [2025, 2024] for both 2024-2025 and 2023-2024 seasons)
             last_n_games: Number of most recent games with complete stats to return (default: 10)
-            player_id: Optional Basketball Reference player ID to use instead of generating from name
+            player_id: Optional Basketball Reference player ID to use instead of resolving the name
+            location: Optional location ("H" for home or "A" for away games)
+            since: Optional first date of games to include
+            until: Optional last date of games to include
             
         Returns:
             DataFrame containing the player's game data against the specified opponent
@@ -407,59 +851,317 @@ class BasketballReferenceScaper:
         if isinstance(seasons, int):
             seasons = [seasons]
         
-        # Get game logs for each season and combine them
-        all_games = []
-        for season in seasons:
-            print(f"Fetching data for {player_name} for {season-1}-{season} season...")
-            if player_id:
-                game_log = self.get_game_log_by_id(player_id, season)
-            else:
-                game_log = self.get_game_log(player_name, season)
+        # Resolve the player ID once for all seasons
+        if not player_id:
+            player_id = self.resolve_player_id(player_name)
+            if not player_id:
+                logger.warning(f"Could not find a player named {player_name}")
+                return pd.DataFrame()
+        
+        # Stored logs are indexed by opponent and location, so only the matching games are read
+        query = self.games_query(last_n_games, opponent=opponent, location=location, since=since, until=until)
+        season_logs = self._fetch_season_logs(player_name, sorted(seasons, reverse=True), player_id,
+                                              columns=self.RELEVANT_COLUMNS, query=query)
+        return self._select_games_against_opponent(season_logs, player_name, opponent, last_n_games)
+    
+    def _select_games_against_opponent(self, season_logs: List[pd.DataFrame], player_name: str, opponent: str,
+                                       last_n_games: int) -> pd.DataFrame:
+        """
+        Combine season game logs of games against an opponent and select the most recent ones.
+        
+        Args:
+            season_logs: Game logs of the games with complete stats against the opponent,
+                         most recent first, one per season from the most recent season
+            player_name: Full name of the player, used in messages
+            opponent: Opponent team abbreviation (e.g., "BOS")
+            last_n_games: Number of most recent games with complete stats to return
             
-            if not game_log.empty:
-                all_games.append(game_log)
+        Returns:
+            DataFrame containing the player's game data against the specified opponent
+        """
+        opponent_games = [game_log for game_log in season_logs if not game_log.empty]
         
-        # Combine all season data
-        if all_games:
-            combined_games = pd.concat(all_games, ignore_index=True)
+        # Combine all season data; the logs are already in order, newest first
+        if opponent_games:
+            opponent_games = pd.concat(opponent_games, ignore_index=True)
         else:
-            print(f"No game data found for {player_name} in the specified seasons.")
+            logger.info(f"No games found for {player_name} against {opponent} in the specified seasons.")
             return pd.DataFrame()
         
-        # Filter for games against the specified opponent
-        if 'opp_id' in combined_games.columns:
-            opponent_games = combined_games[combined_games['opp_id'] == opponent]
+        # Get the most recent N games with complete stats
+        valid_recent_games = opponent_games.head(last_n_games)
+        
+        # If we don't have enough games with valid stats, print a message
+        if len(valid_recent_games) < last_n_games:
+            logger.info(f"Only found {len(valid_recent_games)} games with complete stats against {opponent} out of requested {last_n_games}.")
+        
+        # Select only the columns we need
+        columns_to_keep = [col for col in self.RELEVANT_COLUMNS if col in valid_recent_games.columns]
+        
+        return valid_recent_games[columns_to_keep]
+
+    def get_game_log_by_id(self, player_id: str, season: int = 2025, columns: Optional[List[str]] = None,
+                           query: Optional[GameLogQuery] = None) -> pd.DataFrame:
+        """
+        Get a player's game log for a specific season using their player ID directly.
+        
+        Parsed logs are kept in the local game log store, so a warm request skips both
+        the network and the HTML parse. Logs fetched after their season ended are stored
+        indefinitely; any other log (including one saved before its season ended) is
+        refreshed once its stored copy is older than the cache TTL, appending only the
+        games played since the last stored game.
+        Concurrent callers asking for the same page wait on a single in-flight fetch.
+        
+        Args:
+            player_id: Basketball Reference player ID (e.g., "youngtr01")
+            season: Season year (e.g., 2025 for 2024-2025 season)
+            columns: Optional list of columns to return. When the log is stored, only
+                     these columns are read from disk.
+            query: Optional games to return (by opponent, location, date range...).
+                   When the log is stored, only the matching rows are read.
             
-            if opponent_games.empty:
-                print(f"No games found for {player_name} against {opponent} in the specified seasons.")
-                return pd.DataFrame()
+        Returns:
+            DataFrame containing the player's game log data, most recent game first
+        """
+        stored = self._load_stored_game_log(player_id, season, columns, query)
+        if stored is not None:
+            return stored
+        
+        game_log, shared = _game_log_flights.do((player_id, season),
+                                                lambda: self._scrape_and_store_game_log(player_id, season))
+        if shared:
+            logger.debug(f"Shared in-flight game log fetch for {player_id} ({season})")
+            game_log = game_log.copy()
+        
+        return self._filter_game_log(game_log, columns, query)
+    
+    def _load_stored_game_log(self, player_id: str, season: int, columns: Optional[List[str]] = None,
+                              query: Optional[GameLogQuery] = None) -> Optional[pd.DataFrame]:
+        """
+        Read a game log from the game log store (the first step of ``get_game_log_by_id``).
+        
+        Returns:
+            The stored columns and games, or None if the log is not stored or out of date
+        """
+        if not self.game_log_store:
+            return None
+        with timed('store_read'):
+            stored = self.game_log_store.load(player_id, season, columns, max_age=self.CURRENT_SEASON_TTL,
+                                              query=query)
+        record_cache('game_log', 'hit' if stored is not None else 'miss')
+        return stored
+    
+    @staticmethod
+    def _filter_game_log(game_log: pd.DataFrame, columns: Optional[List[str]] = None,
+                         query: Optional[GameLogQuery] = None) -> pd.DataFrame:
+        """
+        Select columns and games of a freshly scraped game log, like ``GameLogStore.load`` does
+        for stored logs.
+        """
+        if query is not None:
+            game_log = filter_game_log(game_log, query)
+        
+        if columns:
+            game_log = game_log[[col for col in columns if col in game_log.columns]]
+        return game_log
+    
+    def game_log_generation(self, player_id: str, season: int) -> Optional[str]:
+        """
+        Get the version of a stored game log.
+        
+        The generation changes every time the log is re-scraped and stored, so it
+        can be used to invalidate results computed from the log.
+        
+        Args:
+            player_id: Basketball Reference player ID (e.g., "youngtr01")
+            season: Season year (e.g., 2025 for 2024-2025 season)
             
-            # Sort by date (newest first)
-            if 'date_game' in opponent_games.columns:
-                opponent_games = opponent_games.sort_values(by='date_game', ascending=False)
+        Returns:
+            Generation of the stored log, or None if it is not stored
+        """
+        if not self.game_log_store:
+            return None
+        meta = self.game_log_store.meta(player_id, season)
+        return meta['generation'] if meta else None
+    
+    def game_log_is_final(self, player_id: str, season: int) -> bool:
+        """
+        Check whether a stored game log was fetched after its season ended and can no longer change.
+        
+        Args:
+            player_id: Basketball Reference player ID (e.g., "youngtr01")
+            season: Season year (e.g., 2025 for 2024-2025 season)
             
-            # Filter for games with complete stats
-            valid_opponent_games = opponent_games.dropna(subset=['pts', 'ast', 'trb'])
+        Returns:
+            True for a final stored log, False if the log is not stored or not final
+        """
+        if not self.game_log_store:
+            return False
+        meta = self.game_log_store.meta(player_id, season)
+        return bool(meta and meta.get('final'))
+    
+    def game_log_status(self, player_id: str, season: int) -> str:
+        """
+        Get the outcome of fetching a game log.
+        
+        Failed fetches and missing logs are only remembered for ``FETCH_OUTCOME_TTL``
+        seconds (and for the ``MAX_FETCH_OUTCOMES`` most recent logs), so ask right
+        after fetching.
+        
+        Args:
+            player_id: Basketball Reference player ID (e.g., "youngtr01")
+            season: Season year (e.g., 2025 for 2024-2025 season)
             
-            # Get the most recent N games with complete stats
-            valid_recent_games = valid_opponent_games.head(last_n_games)
+        Returns:
+            "stored" if the log is in the game log store and up to date, "not_found" if
+            the site confirmed that there is no game log (404 or a page without games),
+            or "failed" otherwise (e.g., after a network error, 429 or 5xx response,
+            including a failed refresh of a stored log)
+        """
+        if (player_id, season) in self._failed_fetches:
+            return 'failed'
+        if self.game_log_generation(player_id, season) is not None:
+            return 'stored'
+        if (player_id, season) in self._missing_game_logs:
+            return 'not_found'
+        return 'failed'
+    
+    def _scrape_and_store_game_log(self, player_id: str, season: int) -> pd.DataFrame:
+        """
+        Scrape a game log and save it in the game log store.
+        
+        Args:
+            player_id: Basketball Reference player ID (e.g., "youngtr01")
+            season: Season year (e.g., 2025 for 2024-2025 season)
             
-            # If we don't have enough games with valid stats, print a message
-            if len(valid_recent_games) < last_n_games:
-                print(f"Only found {len(valid_recent_games)} games with complete stats against {opponent} out of requested {last_n_games}.")
+        Returns:
+            DataFrame containing the player's game log data
+        """
+        # Decided before fetching: only a page fetched after the season ended is final
+        final = self.season_is_complete(season)
+        stored_meta = self._refreshable_meta(player_id, season)
+        if stored_meta is not None:
+            return self._refresh_game_log(player_id, season, stored_meta, final)
+        
+        game_log = self._scrape_game_log_by_id(player_id, season)
+        self._store_game_log(player_id, season, game_log, final)
+        return game_log
+    
+    def _store_game_log(self, player_id: str, season: int, game_log: pd.DataFrame, final: bool) -> None:
+        """
+        Save a scraped game log in the game log store.
+        
+        Args:
+            player_id: Basketball Reference player ID (e.g., "youngtr01")
+            season: Season year (e.g., 2025 for 2024-2025 season)
+            game_log: Parsed game log; empty logs are not stored
+            final: Whether the page was fetched after the season ended
+        """
+        if self.game_log_store and not game_log.empty:
+            try:
+                with timed('store_write'):
+                    self.game_log_store.save(player_id, season, game_log, final=final)
+                self._failed_fetches.discard((player_id, season))
+            except OSError as e:
+                logger.warning(f"Could not store game log for {player_id} ({season}): {e}")
+    
+    def _record_failed_fetch(self, player_id: str, season: int) -> None:
+        """Remember that fetching a game log failed, so ``game_log_status`` reports it until it is stored."""
+        self._failed_fetches.add((player_id, season))
+    
+    def _refreshable_meta(self, player_id: str, season: int) -> Optional[Dict[str, Any]]:
+        """
+        Get the metadata of a stored game log that can be brought up to date incrementally.
+        
+        Returns:
+            Metadata of the stored log, or None if it has to be scraped in full
+        """
+        if not self.incremental_refresh or not self.game_log_store:
+            return None
+        meta = self.game_log_store.meta(player_id, season)
+        if meta is None or not meta.get('last_date'):
+            return None
+        return meta
+    
+    def _refresh_game_log(self, player_id: str, season: int, stored_meta: Dict[str, Any],
+                          final: bool = False) -> pd.DataFrame:
+        """
+        Bring a stored game log up to date by appending the games played since it was stored.
+        
+        The page still has to be downloaded (or revalidated), but only the rows after
+        the last stored game are parsed. If there are none, the stored log keeps its
+        generation, so results computed from it stay valid.
+        
+        Args:
+            player_id: Basketball Reference player ID (e.g., "youngtr01")
+            season: Season year (e.g., 2025 for 2024-2025 season)
+            stored_meta: Metadata of the stored log
+            final: Whether the page is fetched after the season ended
             
-            # Select only the columns we need
-            relevant_columns = ['date_game', 'season', 'opp_id', 'game_location', 'pts', 'ast', 'trb', 'mp', 'reason']
-            columns_to_keep = [col for col in relevant_columns if col in valid_recent_games.columns]
+        Returns:
+            DataFrame containing the player's complete game log data
+        """
+        url = self._game_log_url(player_id, season)
+        logger.debug(f"Refreshing game log with ID: {player_id}, URL: {url}")
+        
+        try:
+            response = self._get(url, ttl=self._season_ttl(season))
+        except requests.RequestException as e:
+            logger.error(f"Error fetching data: {e}")
+            response = None
+        return self._apply_game_log_update(response, player_id, season, stored_meta, final)
+    
+    def _apply_game_log_update(self, response: Optional[requests.Response], player_id: str, season: int,
+                               stored_meta: Dict[str, Any], final: bool = False) -> pd.DataFrame:
+        """
+        Parse the new rows of a game log page and append them to the stored log.
+        
+        If the page cannot be fetched or parsed, the stored log is returned as it is
+        and is not marked final, so it is refreshed again later, and
+        ``game_log_status`` reports the refresh as failed.
+        
+        Args:
+            response: Response of the game log page, or None if the request failed
+            player_id: Basketball Reference player ID (e.g., "youngtr01")
+            season: Season year (e.g., 2025 for 2024-2025 season)
+            stored_meta: Metadata of the stored log
+            final: Whether the page was fetched after the season ended
             
-            return valid_recent_games[columns_to_keep]
-        else:
-            print("Column 'opp_id' not found in game log data.")
-            return pd.DataFrame()
-
-    def get_game_log_by_id(self, player_id: str, season: int = 2025) -> pd.DataFrame:
+        Returns:
+            DataFrame containing the player's complete game log data
         """
-        Get a player's game log for a specific season using their player ID directly.
+        new_games = None
+        if response is not None and response.status_code == 200:
+            try:
+                with timed('parse'):
+                    new_games = parse_game_log(response.content, season, engine=self.parser_engine,
+                                               after_date=stored_meta['last_date'])
+                if new_games is not None:
+                    count(ROWS_PARSED_TOTAL, len(new_games), server_timing='rows')
+            except Exception as e:
+                logger.exception(f"Unexpected error: {e}")
+        
+        try:
+            if new_games is None:
+                logger.warning(f"Could not refresh game log for {player_id} ({season}), using the stored copy")
+                self._record_failed_fetch(player_id, season)
+                self.game_log_store.touch(player_id, season)
+                game_log = self.game_log_store.load(player_id, season)
+            else:
+                with timed('store_write'):
+                    game_log = self.game_log_store.append(player_id, season, new_games, final=final)
+                self._failed_fetches.discard((player_id, season))
+                if not new_games.empty:
+                    logger.info(f"Appended {len(new_games)} new games to the game log of {player_id} ({season})")
+        except OSError as e:
+            logger.warning(f"Could not store game log for {player_id} ({season}): {e}")
+            game_log = None
+        
+        return game_log if game_log is not None else pd.DataFrame()
+    
+    def _scrape_game_log_by_id(self, player_id: str, season: int) -> pd.DataFrame:
+        """
+        Download and parse a player's game log for a specific season.
         
         Args:
             player_id: Basketball Reference player ID (e.g., "youngtr01")
@@ -468,104 +1170,61 @@ class BasketballReferenceScaper:
         Returns:
             DataFrame containing the player's game log data
         """
-        # Format the player URL with the provided ID
-        # First letter of ID + / + full ID + / + gamelog + / + season
-        first_letter = player_id[0]
-        url = f"{self.BASE_URL}/players/{first_letter}/{player_id}/gamelog/{season}"
-        print(f"Getting game log with ID: {player_id}, URL: {url}")
+        url = self._game_log_url(player_id, season)
+        logger.debug(f"Getting game log with ID: {player_id}, URL: {url}")
         
         try:
-            # Add a small delay to avoid overwhelming the server
-            time.sleep(1)
-            
             # Make HTTP request
-            response = requests.get(url, headers=self.headers)
-            
-            # Check if we got a valid response
-            if response.status_code != 200:
-                print(f"Warning: Could not access {url} (Status code: {response.status_code})")
-                print("This could be due to an incorrect player ID.")
-                return pd.DataFrame()
-            
-            # Parse HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find the table containing the game log data
-            table_div = soup.find('div', {'id': 'div_pgl_basic'})
-            if not table_div:
-                print(f"Warning: Could not find game log data for player ID {player_id}")
-                print("The player might not have played in the specified season or the page format has changed.")
-                return pd.DataFrame()
-            
-            # Extract table rows from tbody
-            tbody = table_div.find('tbody')
-            if not tbody:
-                print(f"Warning: Could not find game log table body for player ID {player_id}")
-                return pd.DataFrame()
-                
-            rows = tbody.find_all('tr', class_=lambda c: c != 'thead')
-            
-            # Process each row to extract game data
-            games_data = []
-            for row in rows:
-                # Skip header rows or rows without data
-                if 'class' in row.attrs and 'thead' in row.attrs['class']:
-                    continue
-                
-                # Skip rows for games that weren't played (e.g., "Did Not Play")
-                if not row.find('td', {'data-stat': 'date_game'}):
-                    continue
-                
-                # Check if the player actually played in the game
-                # Look for "Did Not Play", "Inactive", etc.
-                reason_cell = row.find('td', {'data-stat': 'reason'})
-                if reason_cell and reason_cell.text.strip() in ["Did Not Play", "Inactive", "Did Not Dress"]:
-                    # Add the game with NaN values for stats
-                    game_data = {
-                        'date_game': row.find('td', {'data-stat': 'date_game'}).text.strip(),
-                        'opp_id': row.find('td', {'data-stat': 'opp_id'}).text.strip() if row.find('td', {'data-stat': 'opp_id'}) else None,
-                        'game_location': row.find('td', {'data-stat': 'game_location'}).text.strip() if row.find('td', {'data-stat': 'game_location'}) else None,
-                        'pts': np.nan,
-                        'ast': np.nan,
-                        'trb': np.nan,
-                        'reason': reason_cell.text.strip()
-                    }
-                    game_data['season'] = f"{season-1}-{season}"
-                    games_data.append(game_data)
-                    continue
-                
-                game_data = {}
-                
-                # Extract basic game information
-                for cell in row.find_all('td'):
-                    stat_name = cell.get('data-stat')
-                    if stat_name:
-                        # Get the text value
-                        value = cell.text.strip()
-                        
-                        # Convert some values to appropriate types
-                        if stat_name in ['pts', 'ast', 'trb']:
-                            try:
-                                value = int(value) if value else np.nan
-                            except ValueError:
-                                value = np.nan
-                        
-                        game_data[stat_name] = value
-                
-                # Add season information to distinguish between seasons
-                game_data['season'] = f"{season-1}-{season}"
-                
-                games_data.append(game_data)
-            
-            # Convert to DataFrame
-            return pd.DataFrame(games_data)
+            response = self._get(url, ttl=self._season_ttl(season))
+            return self._parse_game_log_response(response, player_id, season)
             
         except requests.RequestException as e:
-            print(f"Error fetching data: {e}")
-            return pd.DataFrame()
+            logger.error(f"Error fetching data: {e}")
         except Exception as e:
-            print(f"Unexpected error: {e}")
+            logger.exception(f"Unexpected error: {e}")
+        self._record_failed_fetch(player_id, season)
+        return pd.DataFrame()
+    
+    def _parse_game_log_response(self, response: requests.Response, player_id: str, season: int) -> pd.DataFrame:
+        """
+        Parse the response of a game log page.
+        
+        Args:
+            response: Response of the game log page
+            player_id: Basketball Reference player ID, used in messages
+            season: Season year (e.g., 2025 for 2024-2025 season)
+            
+        Returns:
+            DataFrame containing the player's game log data, empty if the page has none
+        """
+        # Check if we got a valid response
+        if response.status_code != 200:
+            logger.warning(f"Could not access {response.url} (Status code: {response.status_code}). "
+                           "This could be due to an incorrect player name or player ID.")
+            if response.status_code == 404:
+                self._missing_game_logs.add((player_id, season))
+                self._failed_fetches.discard((player_id, season))
+            else:
+                self._record_failed_fetch(player_id, season)
+            return pd.DataFrame()
+        
+        # Parse only the game log table into a typed DataFrame
+        with timed('parse'):
+            game_log = parse_game_log(response.content, season, engine=self.parser_engine)
+        if game_log is None:
+            logger.warning(f"Could not find game log data for player ID {player_id}. The player might not "
+                           "have played in the specified season or the page format has changed.")
+            self._missing_game_logs.add((player_id, season))
+            self._failed_fetches.discard((player_id, season))
             return pd.DataFrame()
+        
+        count(ROWS_PARSED_TOTAL, len(game_log), server_timing='rows')
+        if game_log.empty:
+            self._missing_game_logs.add((player_id, season))
+        else:
+            self._missing_game_logs.discard((player_id, season))
+        self._failed_fetches.discard((player_id, season))
+        return game_log
 
 # Usage example
 if __name__ == "__main__":
@@ -0,0 +1,57 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable
+
+
+class ExpiringSet:
+    """
+    Thread-safe set whose members expire, holding at most ``max_size`` of them.
+
+    Members are kept in the order they were last added, so expired members are
+    dropped from the front as new ones arrive, and when the set is full the least
+    recently added member makes room.
+    """
+
+    def __init__(self, ttl: float, max_size: int):
+        """
+        Args:
+            ttl: Seconds a member stays in the set after it was last added
+            max_size: Maximum number of members
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._expires: 'OrderedDict[Hashable, float]' = OrderedDict()
+
+    def add(self, key: Hashable) -> None:
+        """Add a member, or restart its lifetime if it is already in the set."""
+        now = time.monotonic()
+        with self._lock:
+            self._expires[key] = now + self.ttl
+            self._expires.move_to_end(key)
+            while self._expires:
+                oldest, expires = next(iter(self._expires.items()))
+                if expires > now and len(self._expires) <= self.max_size:
+                    break
+                del self._expires[oldest]
+
+    def discard(self, key: Hashable) -> None:
+        """Remove a member if it is in the set."""
+        with self._lock:
+            self._expires.pop(key, None)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            expires = self._expires.get(key)
+            if expires is None:
+                return False
+            if expires <= time.monotonic():
+                del self._expires[key]
+                return False
+            return True
+
+    def __len__(self) -> int:
+        now = time.monotonic()
+        with self._lock:
+            return sum(1 for expires in self._expires.values() if expires > now)
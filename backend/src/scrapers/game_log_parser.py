@@ -0,0 +1,303 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml.html
+except ImportError:  # pragma: no cover - lxml is optional
+    lxml = None
+
+# Reasons for which a game row is kept with empty stats
+DNP_REASONS = ["Did Not Play", "Inactive", "Did Not Dress"]
+
+# Columns kept for games the player did not play
+DNP_COLUMNS = ['date_game', 'opp_id', 'game_location', 'reason']
+
+# Stats converted to numbers after parsing (NaN for missing values)
+NUMERIC_STATS = ['game_season', 'gs', 'fg', 'fga', 'fg_pct', 'fg3', 'fg3a', 'fg3_pct', 'ft', 'fta', 'ft_pct',
+                 'orb', 'drb', 'trb', 'ast', 'stl', 'blk', 'tov', 'pf', 'pts', 'game_score', 'plus_minus']
+
+# Counting stats that props can be set on, alone or combined (e.g., "pts+trb+ast")
+COUNTING_STATS = ['pts', 'trb', 'ast', 'fg3', 'stl', 'blk', 'tov', 'fg', 'fga', 'fg3a', 'ft', 'fta',
+                  'orb', 'drb', 'pf']
+
+# Stats that are always present (as NaN) so games without stats can be filtered out
+REQUIRED_STATS = ['pts', 'ast', 'trb']
+
+# Location codes by the site's game_location marker ("@" away, "N" neutral site, empty at home)
+LOCATION_CODES = {'@': 'A', 'N': 'N', 'A': 'A', 'H': 'H'}
+
+GAME_LOG_DIV_ID = 'div_pgl_basic'
+
+# "fast" uses lxml when it is installed and a SoupStrainer-restricted parse otherwise.
+# "html.parser" is the original full-document BeautifulSoup parse and row walk.
+PARSER_ENGINES = ('fast', 'lxml', 'strainer', 'html.parser')
+DEFAULT_ENGINE = 'fast'
+
+
+def parse_game_log(html: bytes, season: int, engine: str = DEFAULT_ENGINE,
+                   after_date: Any = None) -> Optional[pd.DataFrame]:
+    """
+    Parse the basic game log table on a player's gamelog page.
+
+    Cells are collected column-wise and all stats are converted to numbers in one
+    vectorized step: counting stats and percentages become float columns (NaN for
+    missing values), ``mp`` becomes minutes played as a float and ``date_game``
+    becomes a ``datetime64`` column. Games are ordered most recent first.
+
+    Args:
+        html: Raw page content
+        season: Season year (e.g., 2025 for 2024-2025 season)
+        engine: One of ``PARSER_ENGINES``
+        after_date: Only parse games played after this date (e.g., "2025-01-31"). The table
+                    lists games oldest first, so rows are scanned from the bottom and
+                    the scan stops at the first older game.
+
+    Returns:
+        DataFrame with one row per game (empty if no game is newer than
+        ``after_date``), or None if the page does not contain a game log table
+    """
+    if engine == 'fast':
+        engine = 'lxml' if lxml is not None else 'strainer'
+    if after_date is not None:
+        # Compared with the table's "YYYY-MM-DD" date cells
+        after_date = pd.Timestamp(after_date).strftime('%Y-%m-%d')
+
+    if engine == 'lxml':
+        if lxml is None:
+            raise ValueError("The lxml parser engine requires the lxml package")
+        rows = _lxml_rows(html, after_date)
+    elif engine == 'strainer':
+        rows = _soup_rows(BeautifulSoup(html, 'html.parser', parse_only=SoupStrainer('div', id=GAME_LOG_DIV_ID)),
+                          after_date)
+    elif engine == 'html.parser':
+        games_data = _parse_legacy(BeautifulSoup(html, 'html.parser'))
+        if games_data is None:
+            return None
+        if after_date is not None:
+            games_data = [game for game in games_data if game.get('date_game', '') > after_date]
+        if not games_data:
+            return build_game_log_frame({}, season)
+        return build_game_log_frame(pd.DataFrame(games_data).to_dict('list'), season)
+    else:
+        raise ValueError(f"Unknown parser engine '{engine}', expected one of {PARSER_ENGINES}")
+
+    if rows is None:
+        return None
+
+    return build_game_log_frame(_collect_columns(rows), season)
+
+
+def build_game_log_frame(columns: Dict[str, List[Any]], season: int) -> pd.DataFrame:
+    """
+    Build a typed game log DataFrame from column-wise cell values.
+
+    Args:
+        columns: Raw cell values keyed by ``data-stat`` name, all of the same length,
+                 in the page's order (oldest game first)
+        season: Season year (e.g., 2025 for 2024-2025 season)
+
+    Returns:
+        Game log DataFrame, most recent game first
+    """
+    n_games = len(next(iter(columns.values()))) if columns else 0
+    for stat in REQUIRED_STATS:
+        columns.setdefault(stat, [None] * n_games)
+
+    data = {}
+    for stat, values in columns.items():
+        if stat in NUMERIC_STATS:
+            data[stat] = pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').astype(np.float64)
+        elif stat == 'mp':
+            data[stat] = parse_minutes(pd.Series(values, dtype=object))
+        elif stat == 'date_game':
+            data[stat] = pd.to_datetime(pd.Series(values, dtype=object), format='%Y-%m-%d',
+                                        errors='coerce').astype('datetime64[ns]')
+        else:
+            data[stat] = pd.Series(values, dtype=object).replace({None: np.nan})
+    if 'game_location' in data:
+        data['game_location'] = normalize_location(data['game_location'])
+    data['season'] = pd.Series([f"{season-1}-{season}"] * n_games, dtype=object)
+
+    games_df = pd.DataFrame(data)
+    if 'date_game' in games_df.columns:
+        # Every game has a date; a row whose date cannot be read is not a game
+        games_df = games_df[games_df['date_game'].notna()]
+        games_df = games_df.sort_values('date_game', ascending=False, kind='stable').reset_index(drop=True)
+    return games_df
+
+
+def normalize_location(values: pd.Series) -> pd.Series:
+    """
+    Convert game location markers to "H" (home), "A" (away) or "N" (neutral site).
+
+    Args:
+        values: The site's ``game_location`` values
+
+    Returns:
+        Location codes; games without a marker are home games
+    """
+    return values.map(LOCATION_CODES).fillna('H').astype(object)
+
+
+def parse_minutes(values: pd.Series) -> pd.Series:
+    """
+    Convert minutes played ("MM:SS" strings or plain numbers) to float minutes.
+
+    Args:
+        values: Minutes played values
+
+    Returns:
+        Float minutes, NaN where the value is missing or cannot be parsed
+    """
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        return values.astype(np.float64)
+
+    text = values.astype(object).where(values.notna(), None).astype(str)
+    parts = text.str.extract(r'^\s*(\d+):(\d+)\s*$').astype(np.float64)
+    minutes = parts[0] + parts[1] / 60.0
+    return minutes.fillna(pd.to_numeric(values, errors='coerce')).astype(np.float64)
+
+
+def _collect_columns(rows: Iterable[List[Tuple[str, str]]]) -> Dict[str, List[Optional[str]]]:
+    """
+    Collect row cells into preallocated per-stat column lists.
+
+    Rows without a date are skipped. Rows for games the player did not play keep
+    only the game information and the reason, so their stats stay missing.
+    """
+    rows = list(rows)
+    n_rows = len(rows)
+    columns: Dict[str, List[Optional[str]]] = {}
+
+    n_games = 0
+    for cells in rows:
+        values = dict(cells)
+        if 'date_game' not in values:
+            continue
+        if values.get('reason') in DNP_REASONS:
+            values = {stat: values[stat] for stat in DNP_COLUMNS if stat in values}
+
+        for stat, value in values.items():
+            column = columns.get(stat)
+            if column is None:
+                column = columns[stat] = [None] * n_rows
+            column[n_games] = value
+        n_games += 1
+
+    return {stat: column[:n_games] for stat, column in columns.items()}
+
+
+def _rows_after(rows: List[Any], after_date: Optional[str], date_of: Callable[[Any], Optional[str]]) -> List[Any]:
+    """
+    Get the rows at the bottom of the table dated after ``after_date``.
+
+    Rows without a date (e.g. repeated headers) do not stop the scan.
+    """
+    if after_date is None:
+        return rows
+
+    start = len(rows)
+    while start > 0:
+        date = date_of(rows[start - 1])
+        if date and date <= after_date:
+            break
+        start -= 1
+    return rows[start:]
+
+
+def _lxml_rows(html: bytes, after_date: Optional[str] = None) -> Optional[Iterable[List[Tuple[str, str]]]]:
+    """Extract (data-stat, text) pairs for every body row with lxml and XPath."""
+    document = lxml.html.fromstring(html)
+    tbodies = document.xpath(f'//div[@id="{GAME_LOG_DIV_ID}"]//tbody')
+    if not tbodies:
+        return None
+
+    def date_of(row) -> Optional[str]:
+        cells = row.xpath('td[@data-stat="date_game"]')
+        return cells[0].text_content().strip() if cells else None
+
+    rows = []
+    for row in _rows_after(list(tbodies[0].iterchildren('tr')), after_date, date_of):
+        if 'thead' in (row.get('class') or '').split():
+            continue
+        rows.append([(cell.get('data-stat'), cell.text_content().strip())
+                     for cell in row.iterchildren('td') if cell.get('data-stat')])
+    return rows
+
+
+def _soup_rows(soup: BeautifulSoup, after_date: Optional[str] = None) -> Optional[Iterable[List[Tuple[str, str]]]]:
+    """Extract (data-stat, text) pairs for every body row from a BeautifulSoup tree."""
+    table_div = soup.find('div', {'id': GAME_LOG_DIV_ID})
+    if not table_div:
+        return None
+
+    tbody = table_div.find('tbody')
+    if not tbody:
+        return None
+
+    def date_of(row) -> Optional[str]:
+        cell = row.find('td', {'data-stat': 'date_game'}, recursive=False)
+        return cell.text.strip() if cell else None
+
+    rows = []
+    for row in _rows_after(tbody.find_all('tr', recursive=False), after_date, date_of):
+        if 'thead' in (row.get('class') or []):
+            continue
+        rows.append([(cell.get('data-stat'), cell.text.strip())
+                     for cell in row.find_all('td', recursive=False) if cell.get('data-stat')])
+    return rows
+
+
+def _parse_legacy(soup: BeautifulSoup) -> Optional[List[Dict[str, Any]]]:
+    """Original row walk over a full-document BeautifulSoup tree, kept as the "html.parser" engine."""
+    # Find the table containing the game log data
+    table_div = soup.find('div', {'id': GAME_LOG_DIV_ID})
+    if not table_div:
+        return None
+    
+    # Extract table rows from tbody
+    tbody = table_div.find('tbody')
+    if not tbody:
+        return None
+        
+    rows = tbody.find_all('tr', class_=lambda c: c != 'thead')
+    
+    # Process each row to extract game data
+    games_data = []
+    for row in rows:
+        # Skip header rows or rows without data
+        if 'class' in row.attrs and 'thead' in row.attrs['class']:
+            continue
+        
+        # Skip rows for games that weren't played (e.g., "Did Not Play")
+        if not row.find('td', {'data-stat': 'date_game'}):
+            continue
+        
+        # Check if the player actually played in the game
+        # Look for "Did Not Play", "Inactive", etc.
+        reason_cell = row.find('td', {'data-stat': 'reason'})
+        if reason_cell and reason_cell.text.strip() in DNP_REASONS:
+            # Add the game with NaN values for stats
+            game_data = {
+                'date_game': row.find('td', {'data-stat': 'date_game'}).text.strip(),
+                'opp_id': row.find('td', {'data-stat': 'opp_id'}).text.strip() if row.find('td', {'data-stat': 'opp_id'}) else None,
+                'game_location': row.find('td', {'data-stat': 'game_location'}).text.strip() if row.find('td', {'data-stat': 'game_location'}) else None,
+                'reason': reason_cell.text.strip()
+            }
+            games_data.append(game_data)
+            continue
+        
+        game_data = {}
+        
+        # Extract basic game information
+        for cell in row.find_all('td'):
+            stat_name = cell.get('data-stat')
+            if stat_name:
+                game_data[stat_name] = cell.text.strip()
+        
+        games_data.append(game_data)
+    
+    return games_data
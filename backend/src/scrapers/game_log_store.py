@@ -0,0 +1,424 @@
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.scrapers.game_log_parser import REQUIRED_STATS
+from src.scrapers.response_cache import DEFAULT_CACHE_DIR
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Low-cardinality text columns stored as integer codes plus a category list
+CATEGORICAL_COLUMNS = ('opp_id', 'game_location')
+
+
+class GameLogQuery(NamedTuple):
+    """Games to select from a game log. Every filter is optional."""
+    opponent: Optional[str] = None
+    location: Optional[str] = None
+    # Date range, inclusive on both ends
+    since: Optional[pd.Timestamp] = None
+    until: Optional[pd.Timestamp] = None
+    # Only games with complete stats
+    played_only: bool = False
+    # Maximum number of games, most recent first
+    limit: Optional[int] = None
+
+
+def filter_game_log(games_df: pd.DataFrame, query: GameLogQuery) -> pd.DataFrame:
+    """
+    Select the games matching a query from a game log in memory.
+
+    Gives the same rows as ``GameLogStore.load`` does for a stored log.
+
+    Args:
+        games_df: Game log, most recent game first
+        query: Games to select
+
+    Returns:
+        Matching games, most recent first
+    """
+    if games_df.empty or query == GameLogQuery():
+        return games_df
+
+    matches = np.ones(len(games_df), dtype=bool)
+    for col, value in (('opp_id', query.opponent), ('game_location', query.location)):
+        if value is not None:
+            matches &= (games_df[col] == value).to_numpy() if col in games_df.columns else False
+    if query.since is not None:
+        matches &= (games_df['date_game'] >= query.since).to_numpy()
+    if query.until is not None:
+        matches &= (games_df['date_game'] <= query.until).to_numpy()
+    if query.played_only:
+        matches &= games_df.reindex(columns=REQUIRED_STATS).notna().all(axis=1).to_numpy()
+
+    games_df = games_df[matches]
+    return games_df.head(query.limit) if query.limit is not None else games_df
+
+
+class GameLogStore:
+    """
+    Local columnar store for parsed game logs.
+
+    Each (player_id, season) log is kept in its own directory as one ``.npy`` file
+    per column plus a ``meta.json`` describing the schema. Numeric columns keep
+    their dtype, ``opp_id`` and ``game_location`` are stored as categorical codes,
+    and the remaining text columns are stored as fixed-width unicode arrays with a
+    missing-value mask. Every file can be memory-mapped, so reading a handful of
+    columns only touches those columns on disk.
+
+    Writes go to new, generation-stamped files and become visible when
+    ``meta.json`` is atomically replaced, so readers never see a half-written log.
+    The generation only changes when the log's rows change: new games are added
+    with ``append`` and an unchanged log is marked as checked with ``touch``.
+
+    A log is ``final`` once it was written (or checked) after its season ended.
+    That is recorded when the log is written rather than worked out when it is
+    read, so a log saved while its season was still being played keeps expiring
+    until one refresh has picked up the season's last games.
+
+    Logs are stored most recent game first with ``date_game`` as ``datetime64``,
+    so date ranges are found by binary search and the last N games are a prefix.
+    Every version also gets an index from opponent and location to row positions
+    and a list of the games with complete stats, so a ``GameLogQuery`` only reads
+    the matching rows.
+
+    Writers hold a lock file in the log's directory (``fcntl.flock``), so the API
+    and the prefetch CLI can share a store without one process deleting the column
+    files of a generation the other is still writing.
+    """
+
+    FORMAT_VERSION = 4
+
+    def __init__(self, root: Optional[str] = None):
+        """
+        Args:
+            root: Directory of the store (defaults to ``~/.cache/nbaprops/game_logs``)
+        """
+        self.root = root or os.path.join(DEFAULT_CACHE_DIR, 'game_logs')
+        self._lock = threading.Lock()
+        if fcntl is None:
+            logger.warning("File locking is not available on this platform, "
+                           "game log writes are only serialized within this process")
+
+    def load(self, player_id: str, season: int, columns: Optional[List[str]] = None,
+             max_age: Optional[float] = None, query: Optional[GameLogQuery] = None) -> Optional[pd.DataFrame]:
+        """
+        Load a stored game log.
+
+        Args:
+            player_id: Basketball Reference player ID (e.g., "youngtr01")
+            season: Season year (e.g., 2025 for 2024-2025 season)
+            columns: Columns to read (defaults to all stored columns). Columns that
+                     are not stored are skipped.
+            max_age: Maximum age of a stored log that is not final, in seconds, or None
+                     for no limit. Final logs never expire.
+            query: Optional games to read (defaults to all games)
+
+        Returns:
+            DataFrame with the requested columns, most recent game first, or None if
+            the log is not stored or too old
+        """
+        meta = self.meta(player_id, season)
+        if meta is None:
+            return None
+        if max_age is not None and not meta.get('final') and time.time() - meta['stored_at'] > max_age:
+            return None
+
+        schema = meta['schema']
+        wanted = [col for col in (columns or meta['columns']) if col in schema]
+        directory = self._directory(player_id, season)
+        try:
+            rows = self._select_rows(directory, meta, query) if query else None
+            data = {col: self._read_column(directory, meta['generation'], col, schema[col], rows) for col in wanted}
+        except (OSError, ValueError):
+            # The files were replaced by a concurrent writer; treat as a miss
+            return None
+
+        return pd.DataFrame(data, columns=wanted)
+
+    def save(self, player_id: str, season: int, games_df: pd.DataFrame, final: bool = False) -> None:
+        """
+        Store a parsed game log, replacing any previous version.
+
+        Args:
+            player_id: Basketball Reference player ID (e.g., "youngtr01")
+            season: Season year (e.g., 2025 for 2024-2025 season)
+            games_df: Parsed game log
+            final: Whether the log was fetched after the season ended, so it can never change
+        """
+        with self._locked(player_id, season):
+            self._save(player_id, season, games_df, final)
+
+    def append(self, player_id: str, season: int, new_games: pd.DataFrame,
+               final: bool = False) -> Optional[pd.DataFrame]:
+        """
+        Add games played since the last stored game to a stored game log.
+
+        Games dated on or before the last stored game are ignored, so the same
+        update can safely be applied twice.
+
+        Args:
+            player_id: Basketball Reference player ID (e.g., "youngtr01")
+            season: Season year (e.g., 2025 for 2024-2025 season)
+            new_games: Parsed rows of the new games, most recent first
+            final: Whether the games were fetched after the season ended (see ``save``)
+
+        Returns:
+            The complete updated game log, or None if the log is not stored
+        """
+        with self._locked(player_id, season):
+            meta = self.meta(player_id, season)
+            stored = self.load(player_id, season)
+            if meta is None or stored is None:
+                return None
+
+            if meta.get('last_date') and 'date_game' in new_games.columns:
+                new_games = new_games[new_games['date_game'] > pd.Timestamp(meta['last_date'])]
+            if new_games.empty:
+                self._touch(player_id, season, meta, final)
+                return stored
+
+            # Both are most recent first, and every new game is more recent than the stored ones
+            games_df = pd.concat([new_games, stored], ignore_index=True)
+            self._save(player_id, season, games_df, final)
+            return games_df
+
+    def touch(self, player_id: str, season: int) -> None:
+        """
+        Mark a stored game log as up to date without changing its rows, generation or finality.
+
+        Args:
+            player_id: Basketball Reference player ID (e.g., "youngtr01")
+            season: Season year (e.g., 2025 for 2024-2025 season)
+        """
+        with self._locked(player_id, season):
+            meta = self.meta(player_id, season)
+            if meta is not None:
+                self._touch(player_id, season, meta)
+
+    @contextmanager
+    def _locked(self, player_id: str, season: int) -> Iterator[None]:
+        """
+        Hold the store's lock and the lock file of one game log.
+
+        The thread lock serializes this process's writers, the lock file those of
+        other processes writing to the same directory.
+        """
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            directory = self._directory(player_id, season)
+            os.makedirs(directory, exist_ok=True)
+            with open(os.path.join(directory, '.lock'), 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _save(self, player_id: str, season: int, games_df: pd.DataFrame, final: bool = False) -> None:
+        """Write a new generation of a game log. Must hold the lock."""
+        directory = self._directory(player_id, season)
+        generation = uuid.uuid4().hex[:12]
+
+        schema = {}
+        for col in games_df.columns:
+            schema[col] = self._write_column(directory, generation, col, games_df[col])
+        index = self._build_index(games_df)
+
+        dates = games_df['date_game'].dropna() if 'date_game' in games_df.columns else []
+        meta = {
+            'version': self.FORMAT_VERSION,
+            'generation': generation,
+            'stored_at': time.time(),
+            'rows': len(games_df),
+            'columns': list(games_df.columns),
+            'schema': schema,
+            'index': index,
+            # Date of the last stored game, so a refresh only has to parse newer rows
+            'last_date': max(dates).strftime('%Y-%m-%d') if len(dates) else None,
+            # Fetched after the season ended, so the log never needs refreshing
+            'final': final,
+        }
+        self._write_meta(directory, meta)
+
+        self._remove_stale_files(directory, generation)
+
+    def _touch(self, player_id: str, season: int, meta: Dict[str, Any], final: bool = False) -> None:
+        """Reset the age of a stored log, keeping its generation. Must hold the lock."""
+        self._write_meta(self._directory(player_id, season),
+                         dict(meta, stored_at=time.time(), final=bool(meta.get('final')) or final))
+
+    def _write_meta(self, directory: str, meta: Dict[str, Any]) -> None:
+        """Atomically replace ``meta.json``."""
+        tmp_path = os.path.join(directory, f"meta.json.{meta['generation']}.{uuid.uuid4().hex[:6]}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, os.path.join(directory, 'meta.json'))
+
+    def meta(self, player_id: str, season: int) -> Optional[Dict[str, Any]]:
+        """
+        Get the metadata of a stored game log.
+
+        Args:
+            player_id: Basketball Reference player ID (e.g., "youngtr01")
+            season: Season year (e.g., 2025 for 2024-2025 season)
+
+        Returns:
+            Metadata dictionary, or None if the log is not stored in the current format
+        """
+        try:
+            with open(os.path.join(self._directory(player_id, season), 'meta.json')) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get('version') != self.FORMAT_VERSION:
+            return None
+        return meta
+
+    def _directory(self, player_id: str, season: int) -> str:
+        return os.path.join(self.root, player_id, str(season))
+
+    def _path(self, directory: str, generation: str, name: str) -> str:
+        return os.path.join(directory, f'{generation}.{name}.npy')
+
+    def _write_column(self, directory: str, generation: str, col: str, values: pd.Series) -> Dict[str, Any]:
+        """Write one column and return its schema entry."""
+        if col in CATEGORICAL_COLUMNS:
+            categorical = pd.Categorical(values)
+            np.save(self._path(directory, generation, col), categorical.codes)
+            return {'kind': 'categorical', 'categories': [str(c) for c in categorical.categories]}
+
+        if pd.api.types.is_numeric_dtype(values.dtype) or pd.api.types.is_datetime64_dtype(values.dtype):
+            np.save(self._path(directory, generation, col), values.to_numpy())
+            return {'kind': 'numeric'}
+
+        missing = values.isna().to_numpy()
+        text = values.astype(object).where(~missing, '').astype(str).to_numpy(dtype=str)
+        np.save(self._path(directory, generation, col), text)
+        if missing.any():
+            np.save(self._path(directory, generation, f'{col}.mask'), missing)
+        return {'kind': 'text', 'has_missing': bool(missing.any())}
+
+    @staticmethod
+    def _build_index(games_df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Index the row positions (most recent first) of the games against each opponent
+        at each location, and of the games with complete stats.
+        """
+        index: Dict[str, Any] = {'opponents': {}, 'played': []}
+        if REQUIRED_STATS[0] in games_df.columns:
+            played = games_df.reindex(columns=REQUIRED_STATS).notna().all(axis=1).to_numpy()
+            index['played'] = np.flatnonzero(played).tolist()
+        if 'opp_id' not in games_df.columns or 'game_location' not in games_df.columns:
+            return index
+
+        opponents = games_df['opp_id'].astype(str).to_numpy()
+        locations = games_df['game_location'].astype(str).to_numpy()
+        for position in range(len(games_df)):
+            index['opponents'].setdefault(opponents[position], {}).setdefault(locations[position], []).append(position)
+        return index
+
+    def _select_rows(self, directory: str, meta: Dict[str, Any], query: GameLogQuery) -> np.ndarray:
+        """Get the row positions of the games matching a query, most recent first."""
+        index = meta['index']
+        rows = np.arange(meta['rows'])
+
+        if query.opponent is not None or query.location is not None:
+            by_opponent = ([index['opponents'].get(query.opponent, {})] if query.opponent is not None
+                           else index['opponents'].values())
+            rows = np.array(sorted(position for by_location in by_opponent for loc, positions in by_location.items()
+                                   if query.location is None or loc == query.location
+                                   for position in positions), dtype=np.intp)
+
+        if query.played_only:
+            rows = np.intersect1d(rows, np.asarray(index['played'], dtype=np.intp), assume_unique=True)
+
+        if query.since is not None or query.until is not None:
+            first, last = self._date_window(directory, meta, query.since, query.until)
+            rows = rows[(rows >= first) & (rows < last)]
+
+        return rows[:query.limit] if query.limit is not None else rows
+
+    def _date_window(self, directory: str, meta: Dict[str, Any], since: Optional[pd.Timestamp],
+                     until: Optional[pd.Timestamp]) -> tuple:
+        """
+        Binary search the date column for the rows in a date range.
+
+        Returns:
+            (first, last) row positions; the games in the range are ``first:last``
+        """
+        n_rows = meta['rows']
+        if 'date_game' not in meta['schema']:
+            return 0, n_rows
+
+        # Stored most recent first, so the reversed column is in ascending order
+        dates = np.load(self._path(directory, meta['generation'], 'date_game'), mmap_mode='r')[::-1]
+        first = 0 if until is None else n_rows - int(np.searchsorted(dates, np.datetime64(until), 'right'))
+        last = n_rows if since is None else n_rows - int(np.searchsorted(dates, np.datetime64(since), 'left'))
+        return first, last
+
+    def _read_column(self, directory: str, generation: str, col: str, schema: Dict[str, Any],
+                     rows: Optional[np.ndarray] = None):
+        """Read one column (or only some of its rows), memory-mapping the file."""
+        values = np.load(self._path(directory, generation, col), mmap_mode='r')
+        if rows is not None:
+            values = values[rows]
+
+        if schema['kind'] == 'categorical':
+            return pd.Categorical.from_codes(np.asarray(values), categories=schema['categories'])
+
+        if schema['kind'] == 'text':
+            values = values.astype(object)
+            if schema['has_missing']:
+                missing = np.load(self._path(directory, generation, f'{col}.mask'), mmap_mode='r')
+                if rows is not None:
+                    missing = missing[rows]
+                values[missing] = np.nan
+            return values
+
+        return values
+
+    def _remove_stale_files(self, directory: str, generation: str) -> None:
+        """Delete column files of previous generations. Must hold the lock."""
+        for name in os.listdir(directory):
+            if name.endswith('.npy') and not name.startswith(f'{generation}.'):
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+
+
+_shared_store: Optional[GameLogStore] = None
+_shared_store_lock = threading.Lock()
+
+
+def get_shared_game_log_store() -> GameLogStore:
+    """
+    Get the process-wide game log store, creating it on first use.
+
+    The store lives in the ``game_logs`` directory under ``NBAPROPS_CACHE_DIR``.
+
+    Returns:
+        Shared game log store
+    """
+    global _shared_store
+    with _shared_store_lock:
+        if _shared_store is None:
+            cache_dir = os.environ.get('NBAPROPS_CACHE_DIR', DEFAULT_CACHE_DIR)
+            _shared_store = GameLogStore(os.path.join(cache_dir, 'game_logs'))
+        return _shared_store
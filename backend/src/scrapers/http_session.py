@@ -0,0 +1,125 @@
+import logging
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Default connection pool and retry settings for basketball-reference.com
+DEFAULT_POOL_SIZE = int(os.environ.get('NBAPROPS_HTTP_POOL_SIZE', 10))
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+# (connect timeout, read timeout) in seconds
+DEFAULT_TIMEOUT = (5.0, 20.0)
+
+# Status codes that are worth retrying: rate limiting and transient server errors
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# Longest Retry-After (in seconds) that is waited out; a response asking for a longer
+# wait is returned to the caller instead of holding a worker until it passes
+MAX_RETRY_AFTER = 10.0
+
+_sessions: Dict[int, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def create_session(pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """
+    Create a requests session with a keep-alive connection pool.
+
+    The session does not retry: the scrapers retry in their fetch loop (see
+    ``retry_delay``) so that every attempt waits for a rate limiter token.
+
+    Args:
+        pool_size: Maximum number of pooled connections per host
+
+    Returns:
+        Configured requests session
+    """
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0, pool_block=True)
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def retry_after_seconds(headers: Mapping[str, str]) -> Optional[float]:
+    """
+    Get the wait a response asks for in its Retry-After header.
+
+    Args:
+        headers: Response headers
+
+    Returns:
+        Seconds to wait (a number of seconds or an HTTP date), or None without a valid header
+    """
+    value = headers.get('Retry-After')
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_delay(attempt: int, max_retries: int, backoff_factor: float,
+                status_code: Optional[int] = None, headers: Optional[Mapping[str, str]] = None) -> Optional[float]:
+    """
+    Decide whether a failed attempt is retried, and after how long.
+
+    Connection errors (no status code), 429 and 5xx responses are retried with
+    exponential backoff, or after the response's Retry-After if that is longer.
+    A Retry-After above ``MAX_RETRY_AFTER`` is not waited out.
+
+    Args:
+        attempt: Number of the attempt that failed, starting at 0
+        max_retries: Number of retries allowed after the first attempt
+        backoff_factor: Exponential backoff factor between retries (in seconds)
+        status_code: Status of the response, or None after a connection error
+        headers: Headers of the response
+
+    Returns:
+        Seconds to wait before the next attempt, or None to give up
+    """
+    if attempt >= max_retries or (status_code is not None and status_code not in RETRY_STATUS_CODES):
+        return None
+    delay = backoff_factor * 2 ** attempt
+    retry_after = retry_after_seconds(headers) if headers is not None else None
+    if retry_after is not None:
+        if retry_after > MAX_RETRY_AFTER:
+            logger.warning(f"Not retrying status {status_code}: Retry-After of {retry_after:.0f}s "
+                           f"exceeds {MAX_RETRY_AFTER:.0f}s")
+            return None
+        delay = max(delay, retry_after)
+    return delay
+
+
+def get_shared_session(pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """
+    Get the process-wide session for the given pool settings, creating it on first use.
+
+    Sharing one session means every scraper instance reuses the same pooled
+    keep-alive connections instead of opening a new TCP/TLS connection per request.
+    The underlying urllib3 pool is thread-safe, so the session can be used from
+    multiple Flask worker threads.
+
+    Args:
+        pool_size: Maximum number of pooled connections per host
+
+    Returns:
+        Shared requests session
+    """
+    with _sessions_lock:
+        session = _sessions.get(pool_size)
+        if session is None:
+            session = create_session(pool_size)
+            _sessions[pool_size] = session
+        return session
@@ -0,0 +1,343 @@
+import difflib
+import json
+import logging
+import os
+import re
+import string
+import threading
+import time
+import unicodedata
+from typing import Any, Dict, List, Optional
+
+from src.scrapers.response_cache import DEFAULT_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+# Full team names for the abbreviations used on basketball-reference.com
+TEAM_NAMES = {
+    'ATL': 'Atlanta Hawks', 'BOS': 'Boston Celtics', 'BRK': 'Brooklyn Nets', 'CHI': 'Chicago Bulls',
+    'CHO': 'Charlotte Hornets', 'CLE': 'Cleveland Cavaliers', 'DAL': 'Dallas Mavericks', 'DEN': 'Denver Nuggets',
+    'DET': 'Detroit Pistons', 'GSW': 'Golden State Warriors', 'HOU': 'Houston Rockets', 'IND': 'Indiana Pacers',
+    'LAC': 'Los Angeles Clippers', 'LAL': 'Los Angeles Lakers', 'MEM': 'Memphis Grizzlies', 'MIA': 'Miami Heat',
+    'MIL': 'Milwaukee Bucks', 'MIN': 'Minnesota Timberwolves', 'NOP': 'New Orleans Pelicans',
+    'NYK': 'New York Knicks', 'OKC': 'Oklahoma City Thunder', 'ORL': 'Orlando Magic', 'PHI': 'Philadelphia 76ers',
+    'PHO': 'Phoenix Suns', 'POR': 'Portland Trail Blazers', 'SAC': 'Sacramento Kings', 'SAS': 'San Antonio Spurs',
+    'TOR': 'Toronto Raptors', 'UTA': 'Utah Jazz', 'WAS': 'Washington Wizards',
+}
+
+DEFAULT_REFRESH_INTERVAL = 24 * 60 * 60
+# Seconds after startup before a search may start rebuilding a stale index, so the first user requests
+# have the rate limit budget to themselves
+DEFAULT_WARMUP = 2 * 60
+DEFAULT_LIMIT = 25
+# Seconds searches are asked to wait (Retry-After) while an empty index is being built
+LOADING_RETRY_AFTER = 5
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize a player name for matching: strip accents and punctuation, lowercase.
+
+    For example "Luka Dončić" and "luka doncic" both become "luka doncic", and
+    "De'Aaron Fox" becomes "deaaron fox".
+
+    Args:
+        name: Player name or search query
+
+    Returns:
+        Normalized name
+    """
+    decomposed = unicodedata.normalize('NFKD', name)
+    without_accents = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    cleaned = re.sub(r"['.’]", '', without_accents.lower())
+    cleaned = re.sub(rf"[{re.escape(string.punctuation)}]", ' ', cleaned)
+    return ' '.join(cleaned.split())
+
+
+class _TrieNode:
+    __slots__ = ('children', 'players')
+
+    def __init__(self):
+        self.children: Dict[str, '_TrieNode'] = {}
+        # Indices of every player with a key passing through this node
+        self.players: List[int] = []
+
+
+class PlayerIndex:
+    """
+    Local, searchable index of NBA players built from the league's player directory.
+
+    The index is persisted as JSON and loaded into an in-memory trie keyed by the
+    normalized full name and each of its trailing name parts, so a prefix lookup is a walk down
+    the trie. Queries without prefix matches fall back to accent-insensitive fuzzy
+    matching against the keys that start with the query's first letter. When the index
+    is older than ``refresh_interval`` it is rebuilt in a background thread while the old
+    data keeps serving searches. The rebuild's requests run at background priority on
+    the rate limiter, so user requests go first. An empty index is first built from the
+    directory pages already in the response cache, without touching the network.
+    """
+
+    def __init__(self, path: Optional[str] = None, refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+                 warmup: float = DEFAULT_WARMUP):
+        """
+        Args:
+            path: Path of the index file (defaults to ``~/.cache/nbaprops/player_index.json``)
+            refresh_interval: Seconds after which the index is rebuilt
+            warmup: Seconds after the index is created before ``ensure_fresh`` rebuilds a stale index
+        """
+        self.path = path or os.path.join(DEFAULT_CACHE_DIR, 'player_index.json')
+        self.refresh_interval = refresh_interval
+        self.warmup = warmup
+        self.built_at = 0.0
+        self._created_at = time.monotonic()
+
+        self._players: List[Dict[str, Any]] = []
+        self._root = _TrieNode()
+        self._normalized: Dict[str, List[int]] = {}
+        self._keys: Dict[str, List[int]] = {}
+        # First letter -> keys starting with it, the candidates for fuzzy matching
+        self._buckets: Dict[str, List[str]] = {}
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+
+        self.load()
+
+    def __len__(self) -> int:
+        return len(self._players)
+
+    @property
+    def is_stale(self) -> bool:
+        return time.time() - self.built_at > self.refresh_interval
+
+    def load(self) -> bool:
+        """
+        Load the index from disk.
+
+        Returns:
+            True if an index file was loaded
+        """
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        self._set_players(data.get('players', []), data.get('built_at', 0.0))
+        return True
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> List[Dict[str, str]]:
+        """
+        Search players by name prefix, falling back to fuzzy matching.
+
+        Args:
+            query: Player name or prefix (e.g., "jok" or "Jokic")
+            limit: Maximum number of results
+
+        Returns:
+            List of dictionaries with the player's id, name, team and position,
+            active players first
+        """
+        key = normalize_name(query)
+        if not key:
+            return []
+
+        with self._lock:
+            players, root, keys, buckets = self._players, self._root, self._keys, self._buckets
+
+        node = root
+        for char in key:
+            node = node.children.get(char)
+            if node is None:
+                break
+        matches = node.players if node is not None else []
+
+        if not matches:
+            close = difflib.get_close_matches(key, buckets.get(key[0], []), n=limit, cutoff=0.75)
+            matches = [i for name in close for i in keys[name]]
+
+        # Trie nodes hold players in rank order, so the first unique hits are the best ones
+        results = []
+        seen = set()
+        for i in matches:
+            if i in seen:
+                continue
+            seen.add(i)
+            results.append(self._result(players[i]))
+            if len(results) >= limit:
+                break
+        return results
+
+    def get(self, player_id: str) -> Optional[Dict[str, Any]]:
+        """Get a player's index entry by ID."""
+        with self._lock:
+            return self._by_id.get(player_id)
+
+    def find_by_name(self, name: str) -> List[Dict[str, Any]]:
+        """
+        Get all players whose normalized name matches exactly, best ranked first.
+
+        Args:
+            name: Full player name
+
+        Returns:
+            List of index entries
+        """
+        with self._lock:
+            players, normalized = self._players, self._normalized
+        return [players[i] for i in normalized.get(normalize_name(name), [])]
+
+    def refresh(self, scraper, cached_only: bool = False) -> int:
+        """
+        Rebuild the index from the player directory pages and save it to disk.
+
+        The pages are fetched at background priority (see ``TokenBucketRateLimiter``).
+
+        Args:
+            scraper: BasketballReferenceScaper used to fetch the pages
+            cached_only: Only use pages in the response cache, without touching the
+                         network. The index is then marked stale, so the next
+                         ``ensure_fresh`` rebuilds it from fresh pages.
+
+        Returns:
+            Number of players in the new index
+        """
+        # Imported here because src.main imports the scraper module
+        from src.main import get_current_season
+
+        logger.info(f"Refreshing player index from the {'cached ' if cached_only else ''}player directory...")
+        players = {}
+        for letter in string.ascii_lowercase:
+            for player in scraper.get_player_directory(letter, background=True, cached_only=cached_only):
+                player['team'] = "Unknown"
+                players[player['id']] = player
+
+        if not players:
+            if not cached_only:
+                logger.warning("Player directory is empty, keeping the existing player index")
+            return len(self)
+
+        # Current teams and positions come from the league-wide per game stats
+        for player in scraper.get_league_players(get_current_season(), background=True, cached_only=cached_only):
+            if player['id'] in players:
+                players[player['id']]['team'] = TEAM_NAMES.get(player['team'], player['team'])
+                players[player['id']]['position'] = player['position']
+
+        built_at = 0.0 if cached_only else time.time()
+        player_list = list(players.values())
+        self._set_players(player_list, built_at)
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'built_at': built_at, 'players': player_list}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+        logger.info(f"Player index refreshed with {len(player_list)} players")
+        return len(player_list)
+
+    def ensure_fresh(self, scraper) -> None:
+        """
+        Start a background refresh if the index is stale and no refresh is running.
+
+        A stale index keeps serving searches, so its rebuild is not started during the
+        first ``warmup`` seconds after startup. An empty index is built right away.
+
+        Args:
+            scraper: BasketballReferenceScaper used to fetch the pages
+        """
+        if not self.is_stale or (len(self) > 0 and time.monotonic() - self._created_at < self.warmup):
+            return
+
+        with self._lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(target=self._refresh_in_background, args=(scraper,),
+                                                    name='player-index-refresh', daemon=True)
+            self._refresh_thread.start()
+
+    def _refresh_in_background(self, scraper) -> None:
+        try:
+            if len(self) == 0:
+                # Serve searches from cached directory pages while fresh ones are fetched
+                self.refresh(scraper, cached_only=True)
+            self.refresh(scraper)
+        except Exception as e:
+            logger.error(f"Error refreshing player index: {e}")
+        finally:
+            # Avoid retrying on every search if the refresh failed
+            if self.is_stale:
+                self.built_at = time.time() - self.refresh_interval + 15 * 60
+
+    def _set_players(self, players: List[Dict[str, Any]], built_at: float) -> None:
+        """Build the trie and name lookup for a new player list and swap them in."""
+        # Active and recent players rank first
+        players = sorted(players, key=lambda p: (not p.get('active'), -(p.get('to') or 0), p['name']))
+
+        root = _TrieNode()
+        normalized: Dict[str, List[int]] = {}
+        keys: Dict[str, List[int]] = {}
+        buckets: Dict[str, List[str]] = {}
+        for i, player in enumerate(players):
+            full_name = normalize_name(player['name'])
+            normalized.setdefault(full_name, []).append(i)
+
+            # The full name and every trailing part of it ("lebron james", "james")
+            parts = full_name.split()
+            for key in {' '.join(parts[j:]) for j in range(len(parts))}:
+                if key not in keys:
+                    buckets.setdefault(key[0], []).append(key)
+                keys.setdefault(key, []).append(i)
+                node = root
+                for char in key:
+                    node = node.children.setdefault(char, _TrieNode())
+                    if not node.players or node.players[-1] != i:
+                        node.players.append(i)
+
+        with self._lock:
+            self._players = players
+            self._root = root
+            self._normalized = normalized
+            self._keys = keys
+            self._buckets = buckets
+            self._by_id = {player['id']: player for player in players}
+            self.built_at = built_at
+
+    def _result(self, player: Dict[str, Any]) -> Dict[str, str]:
+        return {
+            "id": player['id'],
+            "name": player['name'],
+            "team": player.get('team', "Unknown"),
+            "position": player.get('position', "Unknown"),
+        }
+
+
+_shared_index: Optional[PlayerIndex] = None
+_shared_index_lock = threading.Lock()
+
+
+def get_shared_player_index() -> PlayerIndex:
+    """
+    Get the process-wide player index, creating it on first use.
+
+    The index file lives under ``NBAPROPS_CACHE_DIR``.
+
+    Returns:
+        Shared player index
+    """
+    global _shared_index
+    with _shared_index_lock:
+        if _shared_index is None:
+            cache_dir = os.environ.get('NBAPROPS_CACHE_DIR', DEFAULT_CACHE_DIR)
+            _shared_index = PlayerIndex(os.path.join(cache_dir, 'player_index.json'))
+        return _shared_index
+
+
+if __name__ == "__main__":
+    from src.scrapers.basketball_reference import BasketballReferenceScaper
+
+    index = get_shared_player_index()
+    index.refresh(BasketballReferenceScaper())
+    print(index.search("Jokic"))
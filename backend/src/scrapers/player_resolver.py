@@ -0,0 +1,196 @@
+import json
+import logging
+import os
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.scrapers.player_index import PlayerIndex, get_shared_player_index, normalize_name
+from src.scrapers.response_cache import DEFAULT_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+
+class PlayerIdResolver:
+    """
+    Resolve player names to verified basketball-reference.com player IDs.
+
+    Resolved names are kept in a persistent name -> ID cache, so after the first
+    lookup a name costs one dictionary hit. Misses are answered from the local
+    player index (built from the directory pages) and, failing that, from the
+    site's player search. IDs are never guessed from the name, so duplicate
+    names and suffixes no longer produce 404s. Only players whose normalized name
+    is exactly the requested one are remembered; when several share it, the active
+    or most recent one is chosen, and a name that cannot be settled is not saved.
+    """
+
+    def __init__(self, path: Optional[str] = None, player_index: Optional[PlayerIndex] = None):
+        """
+        Args:
+            path: Path of the cache file (defaults to ``~/.cache/nbaprops/player_ids.json``)
+            player_index: Player index used for lookups. Defaults to the shared index.
+        """
+        self.path = path or os.path.join(DEFAULT_CACHE_DIR, 'player_ids.json')
+        self.player_index = player_index or get_shared_player_index()
+        self._lock = threading.Lock()
+        self._ids: Dict[str, str] = {}
+
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self._ids = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    def resolve(self, player_name: str,
+                search: Optional[Callable[[str], List[Dict[str, Any]]]] = None) -> Optional[str]:
+        """
+        Get the player ID for a name.
+
+        Args:
+            player_name: Full name of the player (e.g., "Trae Young"), optionally
+                         followed by text in parentheses such as years
+            search: Optional player search function (e.g. the scraper's
+                    ``search_players``) used when the name is not cached or indexed
+
+        Returns:
+            Player ID (e.g., "youngtr01"), or None if the name could not be resolved
+        """
+        # Remove any text in parentheses, typically years like "(2019-2025)"
+        clean_name = re.sub(r'\s*\([^)]*\)', '', player_name).strip()
+        key = normalize_name(clean_name)
+        if not key:
+            return None
+
+        with self._lock:
+            player_id = self._ids.get(key)
+        if player_id:
+            return player_id
+
+        # The index ranks active and recent players first
+        matches = self.player_index.find_by_name(clean_name)
+        if matches:
+            player_id = matches[0]['id']
+            self.record(clean_name, player_id)
+            return player_id
+
+        if search is None:
+            return None
+
+        results = search(clean_name)
+        self.record_results(results)
+        matches = [result for result in results if normalize_name(result['name']) == key]
+        player_id = self._pick(matches)
+        if player_id is None and matches:
+            logger.warning(f"Player name {clean_name!r} matches several players equally well; "
+                           f"pass a player ID to choose one")
+        return player_id
+
+    def record(self, player_name: str, player_id: str, overwrite: bool = True) -> None:
+        """
+        Remember the player ID for a name.
+
+        Args:
+            player_name: Full name of the player
+            player_id: Verified player ID
+            overwrite: Whether to replace an existing entry for the name
+        """
+        key = normalize_name(player_name)
+        with self._lock:
+            if self._ids.get(key) == player_id or (not overwrite and key in self._ids):
+                return
+            self._ids[key] = player_id
+            self._save()
+
+    def record_results(self, results: List[Dict[str, Any]]) -> None:
+        """
+        Remember the IDs from player search results.
+
+        Each name is saved as the best ranked player with exactly that name (see
+        ``_pick``). An existing entry is only replaced when its player is among the
+        results and ranks below another one; names the results cannot settle are
+        skipped.
+
+        Args:
+            results: Search results with "id", "name" and optionally "to" (last season) keys
+        """
+        by_name: Dict[str, List[Dict[str, Any]]] = {}
+        for result in results:
+            key = normalize_name(result['name'])
+            if key:
+                by_name.setdefault(key, []).append(result)
+
+        with self._lock:
+            changed = False
+            for key, matches in by_name.items():
+                player_id = self._pick(matches)
+                existing = self._ids.get(key)
+                if player_id is None or player_id == existing:
+                    continue
+                if existing is not None and existing not in {match['id'] for match in matches}:
+                    continue
+                self._ids[key] = player_id
+                changed = True
+            if changed:
+                self._save()
+
+    def _pick(self, matches: List[Dict[str, Any]]) -> Optional[str]:
+        """
+        Pick the player meant by a name among the players who have exactly that name.
+
+        Players are ranked like the index ranks them: active players first, then by
+        their last season.
+
+        Args:
+            matches: Search results for one normalized name
+
+        Returns:
+            ID of the best ranked player, or None if there are no matches or the best
+            two rank the same
+        """
+        unique = list({match['id']: match for match in matches}.values())
+        if len(unique) <= 1:
+            return unique[0]['id'] if unique else None
+
+        ranked = sorted(unique, key=self._rank)
+        if self._rank(ranked[0]) == self._rank(ranked[1]):
+            return None
+        return ranked[0]['id']
+
+    def _rank(self, result: Dict[str, Any]) -> Tuple[bool, int]:
+        """Sort key of a search result: active first, then most recent last season."""
+        entry = self.player_index.get(result['id']) or {}
+        return not entry.get('active', False), -(entry.get('to') or result.get('to') or 0)
+
+    def _save(self) -> None:
+        """Write the cache file atomically. Must be called with the lock held."""
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._ids, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save player ID cache: {e}")
+
+
+_shared_resolver: Optional[PlayerIdResolver] = None
+_shared_resolver_lock = threading.Lock()
+
+
+def get_shared_player_resolver() -> PlayerIdResolver:
+    """
+    Get the process-wide player ID resolver, creating it on first use.
+
+    The cache file lives under ``NBAPROPS_CACHE_DIR``.
+
+    Returns:
+        Shared player ID resolver
+    """
+    global _shared_resolver
+    with _shared_resolver_lock:
+        if _shared_resolver is None:
+            cache_dir = os.environ.get('NBAPROPS_CACHE_DIR', DEFAULT_CACHE_DIR)
+            _shared_resolver = PlayerIdResolver(os.path.join(cache_dir, 'player_ids.json'))
+        return _shared_resolver
@@ -0,0 +1,192 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# basketball-reference.com asks scrapers to stay under 20 requests per minute
+DEFAULT_REQUESTS_PER_MINUTE = 20
+DEFAULT_BURST = 3
+# Seconds between attempts to take the shared state file lock without blocking the event loop
+LOCK_POLL_INTERVAL = 0.005
+
+
+class TokenBucketRateLimiter:
+    """
+    Token-bucket rate limiter shared by all threads of a process.
+
+    Tokens refill continuously at ``requests_per_minute / 60`` per second up to
+    ``burst`` tokens. Each network request takes one token, waiting only when
+    the bucket is empty. If ``lock_path`` is given, the bucket state lives in that
+    file and is guarded by an exclusive file lock, so several processes (e.g.
+    multiple API workers) share one budget.
+
+    Background requests (e.g. rebuilding the player index) only take a token from
+    a full bucket, so they run while the budget is idle and always leave the
+    burst minus one token to user requests.
+    """
+
+    def __init__(self, requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+                 burst: int = DEFAULT_BURST, lock_path: Optional[str] = None):
+        """
+        Args:
+            requests_per_minute: Sustained request budget
+            burst: Maximum number of requests that may be made back-to-back
+            lock_path: Optional path of a state file shared between processes
+        """
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+
+        self.requests_per_minute = requests_per_minute
+        self.burst = burst
+        self.rate = requests_per_minute / 60.0
+        self.lock_path = lock_path
+        if lock_path and fcntl is None:
+            logger.warning("File locking is not available on this platform, "
+                           "falling back to a process-local rate limiter")
+            self.lock_path = None
+
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = time.time()
+
+    def acquire(self, background: bool = False) -> float:
+        """
+        Take one token, blocking until one is available.
+
+        Args:
+            background: Wait until the bucket is full, so user requests go first
+
+        Returns:
+            Number of seconds the caller waited in the queue
+        """
+        started = time.monotonic()
+        while True:
+            wait = self._try_take(background)
+            if wait <= 0:
+                return time.monotonic() - started
+            time.sleep(wait)
+
+    async def acquire_async(self, background: bool = False) -> float:
+        """
+        Take one token, waiting on the event loop until one is available.
+
+        Shares the bucket with ``acquire``, so sync and async callers draw on the
+        same request budget. The shared state file lock is polled instead of
+        waited for, so another process holding it never blocks the event loop.
+
+        Args:
+            background: Wait until the bucket is full, so user requests go first
+
+        Returns:
+            Number of seconds the caller waited in the queue
+        """
+        started = time.monotonic()
+        while True:
+            wait = self._try_take(background, blocking=False)
+            if wait <= 0:
+                return time.monotonic() - started
+            await asyncio.sleep(wait)
+
+    def _try_take(self, background: bool = False, blocking: bool = True) -> float:
+        """
+        Try to take a token from the bucket.
+
+        Args:
+            background: Only take a token from a full bucket
+            blocking: Wait for the shared state file lock; otherwise retry after
+                      ``LOCK_POLL_INTERVAL`` if another process holds it
+
+        Returns:
+            0 if a token was taken, otherwise the number of seconds until one is available
+        """
+        if self.lock_path:
+            return self._try_take_shared(background, blocking)
+
+        with self._lock:
+            tokens, self._updated = self._refill(self._tokens, self._updated)
+            self._tokens, wait = self._take(tokens, background)
+        return wait
+
+    def _take(self, tokens: float, background: bool) -> Tuple[float, float]:
+        """Take a token from ``tokens`` if enough are left, returning the tokens left and the wait."""
+        needed = float(self.burst) if background else 1.0
+        if tokens >= needed:
+            return tokens - 1, 0.0
+        return tokens, (needed - tokens) / self.rate
+
+    def _try_take_shared(self, background: bool = False, blocking: bool = True) -> float:
+        """
+        Cross-process variant of ``_try_take`` backed by a locked state file.
+
+        Every call opens the file, so the lock also serializes the threads of this process.
+        """
+        with open(self.lock_path, 'a+') as state_file:
+            try:
+                fcntl.flock(state_file, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return LOCK_POLL_INTERVAL
+            try:
+                state_file.seek(0)
+                state = self._read_state(state_file.read())
+                tokens, updated = self._refill(state['tokens'], state['updated'])
+                tokens, wait = self._take(tokens, background)
+
+                state_file.seek(0)
+                state_file.truncate()
+                state_file.write(json.dumps({'tokens': tokens, 'updated': updated}))
+                state_file.flush()
+                return wait
+            finally:
+                fcntl.flock(state_file, fcntl.LOCK_UN)
+
+    def _read_state(self, raw: str) -> Dict[str, float]:
+        """Parse the shared state file, starting with a full bucket if it is empty or corrupt."""
+        try:
+            state = json.loads(raw)
+            return {'tokens': float(state['tokens']), 'updated': float(state['updated'])}
+        except (ValueError, KeyError, TypeError):
+            return {'tokens': float(self.burst), 'updated': time.time()}
+
+    def _refill(self, tokens: float, updated: float) -> Tuple[float, float]:
+        """Add the tokens accrued since ``updated``."""
+        now = time.time()
+        elapsed = max(0.0, now - updated)
+        return min(float(self.burst), tokens + elapsed * self.rate), now
+
+
+_shared_limiter: Optional[TokenBucketRateLimiter] = None
+_shared_limiter_lock = threading.Lock()
+
+
+def get_shared_rate_limiter() -> TokenBucketRateLimiter:
+    """
+    Get the process-wide rate limiter, creating it on first use.
+
+    The budget can be configured with the ``NBAPROPS_RATE_LIMIT_RPM`` and
+    ``NBAPROPS_RATE_LIMIT_BURST`` environment variables. Setting
+    ``NBAPROPS_RATE_LIMIT_FILE`` shares the budget across processes.
+
+    Returns:
+        Shared rate limiter
+    """
+    global _shared_limiter
+    with _shared_limiter_lock:
+        if _shared_limiter is None:
+            _shared_limiter = TokenBucketRateLimiter(
+                requests_per_minute=float(os.environ.get('NBAPROPS_RATE_LIMIT_RPM', DEFAULT_REQUESTS_PER_MINUTE)),
+                burst=int(os.environ.get('NBAPROPS_RATE_LIMIT_BURST', DEFAULT_BURST)),
+                lock_path=os.environ.get('NBAPROPS_RATE_LIMIT_FILE') or None,
+            )
+        return _shared_limiter
@@ -0,0 +1,274 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, NamedTuple, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from src.instrumentation import record_cache
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'nbaprops')
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Response headers kept alongside the cached body
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+# Cache hits only update an entry's last access time in memory; the times are written
+# in one batch once this many entries or seconds have accumulated (or before evicting)
+TOUCH_BATCH_SIZE = 256
+TOUCH_FLUSH_INTERVAL = 30.0
+
+
+class CachedResponse(NamedTuple):
+    """A response stored in the cache."""
+    url: str
+    final_url: str
+    status_code: int
+    content: bytes
+    headers: Dict[str, str]
+    fetched_at: float
+    expires_at: Optional[float]
+
+    @property
+    def is_fresh(self) -> bool:
+        """Whether the entry can be served without contacting the server."""
+        return self.expires_at is None or self.expires_at > time.time()
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get('ETag')
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.headers.get('Last-Modified')
+
+    def to_response(self) -> requests.Response:
+        """Rebuild a ``requests.Response`` so callers can treat cached and live responses alike."""
+        response = requests.Response()
+        response.status_code = self.status_code
+        response._content = self.content
+        response.url = self.final_url
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.from_cache = True
+        return response
+
+
+class ResponseCache:
+    """
+    Disk-backed HTTP response cache keyed by URL.
+
+    Entries live in a SQLite database so the cache survives restarts and can be
+    shared by several processes. Each entry has an optional expiry time; entries
+    without one never expire. When the total size of stored bodies exceeds
+    ``max_bytes``, the least recently used entries are evicted.
+
+    Reads do not write to the database: last access times are buffered and
+    flushed in batches (see ``TOUCH_BATCH_SIZE``), so the LRU order seen by other
+    processes can lag behind by up to ``TOUCH_FLUSH_INTERVAL`` seconds.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            path: Path of the SQLite database (defaults to ``~/.cache/nbaprops/http_cache.sqlite``)
+            max_bytes: Maximum total size of cached response bodies
+        """
+        self.path = path or os.path.join(DEFAULT_CACHE_DIR, 'http_cache.sqlite')
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.stale = 0
+        self.evictions = 0
+        # URL -> last access time not yet written to the database
+        self._touches: Dict[str, float] = {}
+        self._touches_flushed_at = time.time()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                final_url TEXT NOT NULL,
+                status_code INTEGER NOT NULL,
+                content BLOB NOT NULL,
+                headers TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                expires_at REAL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        """)
+        self._conn.execute('CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)')
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """
+        Look up a cached response, fresh or stale.
+
+        Args:
+            url: Request URL
+
+        Returns:
+            Cached response, or None if the URL is not cached
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT final_url, status_code, content, headers, fetched_at, expires_at '
+                'FROM responses WHERE url = ?', (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            self._touches[url] = now
+            if len(self._touches) >= TOUCH_BATCH_SIZE or now - self._touches_flushed_at >= TOUCH_FLUSH_INTERVAL:
+                self._flush_touches()
+                self._conn.commit()
+
+        final_url, status_code, content, headers, fetched_at, expires_at = row
+        return CachedResponse(url, final_url, status_code, bytes(content), json.loads(headers),
+                              fetched_at, expires_at)
+
+    def put(self, url: str, response: requests.Response, ttl: Optional[float]) -> None:
+        """
+        Store a response.
+
+        Args:
+            url: Request URL
+            response: Response to store
+            ttl: Seconds until the entry goes stale, or None to never expire
+        """
+        now = time.time()
+        headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+        content = response.content
+        with self._lock:
+            self._touches.pop(url, None)
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses '
+                '(url, final_url, status_code, content, headers, fetched_at, expires_at, accessed_at, size) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (url, response.url or url, response.status_code, sqlite3.Binary(content), json.dumps(headers),
+                 now, self._expiry(now, ttl), now, len(content))
+            )
+            self._evict()
+            self._conn.commit()
+
+    def refresh(self, url: str, ttl: Optional[float]) -> None:
+        """
+        Extend the lifetime of an entry after the server confirmed it is unchanged (HTTP 304).
+
+        Args:
+            url: Request URL
+            ttl: Seconds until the entry goes stale again, or None to never expire
+        """
+        now = time.time()
+        with self._lock:
+            self._touches.pop(url, None)
+            self._conn.execute('UPDATE responses SET expires_at = ?, accessed_at = ? WHERE url = ?',
+                               (self._expiry(now, ttl), now, url))
+            self._conn.commit()
+
+    def record_hit(self) -> None:
+        with self._lock:
+            self.hits += 1
+        record_cache('http', 'hit')
+
+    def record_miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+        record_cache('http', 'miss')
+
+    def record_revalidation(self) -> None:
+        with self._lock:
+            self.revalidations += 1
+        record_cache('http', 'revalidated')
+
+    def record_stale(self) -> None:
+        with self._lock:
+            self.stale += 1
+        record_cache('http', 'stale')
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache counters and size.
+
+        Returns:
+            Dictionary with hits, misses, revalidations, stale responses served,
+            evictions, entries and bytes
+        """
+        with self._lock:
+            entries, size = self._conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses').fetchone()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "stale": self.stale,
+                "evictions": self.evictions,
+                "entries": entries,
+                "bytes": size,
+            }
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self._lock:
+            self._touches.clear()
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+
+    def _expiry(self, now: float, ttl: Optional[float]) -> Optional[float]:
+        return None if ttl is None else now + ttl
+
+    def _flush_touches(self) -> None:
+        """Write the buffered last access times (the caller holds the lock and commits)."""
+        if self._touches:
+            self._conn.executemany('UPDATE responses SET accessed_at = ? WHERE url = ?',
+                                   [(accessed_at, url) for url, accessed_at in self._touches.items()])
+            self._touches.clear()
+        self._touches_flushed_at = time.time()
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache fits in ``max_bytes``."""
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        self._flush_touches()
+        for url, size in self._conn.execute('SELECT url, size FROM responses ORDER BY accessed_at').fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute('DELETE FROM responses WHERE url = ?', (url,))
+            total -= size
+            self.evictions += 1
+
+
+_shared_cache: Optional[ResponseCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_response_cache() -> ResponseCache:
+    """
+    Get the process-wide response cache, creating it on first use.
+
+    The location and size can be configured with the ``NBAPROPS_CACHE_DIR`` and
+    ``NBAPROPS_HTTP_CACHE_MB`` environment variables.
+
+    Returns:
+        Shared response cache
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            cache_dir = os.environ.get('NBAPROPS_CACHE_DIR', DEFAULT_CACHE_DIR)
+            max_mb = float(os.environ.get('NBAPROPS_HTTP_CACHE_MB', DEFAULT_MAX_BYTES / (1024 * 1024)))
+            _shared_cache = ResponseCache(os.path.join(cache_dir, 'http_cache.sqlite'),
+                                          max_bytes=int(max_mb * 1024 * 1024))
+        return _shared_cache
@@ -0,0 +1,105 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'task')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        # Set when the call runs as an asyncio task (see ``SingleFlight.do_async``)
+        self.task: Optional[asyncio.Task] = None
+
+
+class SingleFlight:
+    """
+    Deduplicate concurrent calls that share a key.
+
+    The first caller for a key runs the function; callers that arrive while it is
+    still running wait for it and receive the same result (or exception) instead
+    of starting their own call. Threads (``do``) and coroutines (``do_async``)
+    share the calls, so a sync and an async caller for the same key also share one.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run ``fn`` once for all concurrent callers with the same key.
+
+        Args:
+            key: Key identifying the call (e.g., a (player_id, season) tuple)
+            fn: Function to run
+
+        Returns:
+            Tuple of the result and whether it was shared with an in-flight call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Async variant of ``do`` for coroutine functions.
+
+        The first caller runs ``fn()`` as a task, so cancelling that caller does not
+        cancel the call for the others. Callers on another event loop or waiting for
+        a thread's call wait in a worker thread instead of blocking the event loop.
+
+        Args:
+            key: Key identifying the call (e.g., a (player_id, season) tuple)
+            fn: Coroutine function to run
+
+        Returns:
+            Tuple of the result and whether it was shared with an in-flight call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                call.task = asyncio.ensure_future(fn())
+                call.task.add_done_callback(lambda task: self._finish(key, call, task))
+
+        if call.task is not None and call.task.get_loop() is asyncio.get_running_loop():
+            return await asyncio.shield(call.task), not leader
+
+        await asyncio.to_thread(call.done.wait)
+        if call.error is not None:
+            raise call.error
+        return call.result, True
+
+    def _finish(self, key: Hashable, call: _Call, task: asyncio.Task) -> None:
+        """Record the outcome of an async call and release its waiters."""
+        if task.cancelled():
+            call.error = asyncio.CancelledError()
+        else:
+            call.error = task.exception()
+            call.result = None if call.error is not None else task.result()
+        with self._lock:
+            del self._calls[key]
+        call.done.set()
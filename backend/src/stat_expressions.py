@@ -0,0 +1,155 @@
+"""
+Stat expressions for props on single stats and combinations of stats.
+
+A stat is a game log column (``fg3``), a name for one (``threes``) or a sum of
+them (``pts+trb+ast``, ``PRA``). Every expression is a linear combination of
+game log columns, so any number of them is evaluated with one matrix product
+over the (games, columns) matrix of parsed stats.
+"""
+import ast
+import functools
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.scrapers.game_log_parser import COUNTING_STATS
+
+# Longest accepted expression, in characters
+MAX_EXPRESSION_LENGTH = 100
+
+# Names for game log columns and common combination props (case-insensitive)
+STAT_ALIASES = {
+    'points': 'pts',
+    'rebounds': 'trb',
+    'reb': 'trb',
+    'assists': 'ast',
+    'threes': 'fg3',
+    'steals': 'stl',
+    'blocks': 'blk',
+    'turnovers': 'tov',
+    'p': 'pts',
+    'r': 'trb',
+    'a': 'ast',
+    'pra': 'pts+trb+ast',
+    'pr': 'pts+trb',
+    'pa': 'pts+ast',
+    'ra': 'trb+ast',
+    'stocks': 'stl+blk',
+}
+
+
+class StatExpression(NamedTuple):
+    """A parsed stat expression: the weight of each game log column it sums"""
+    name: str
+    coefficients: Tuple[Tuple[str, float], ...]
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_stat_expression(name: str) -> StatExpression:
+    """
+    Parse a stat expression.
+
+    Expressions combine game log columns (see ``COUNTING_STATS``) and
+    ``STAT_ALIASES`` with ``+``, ``-``, parentheses and numeric factors,
+    e.g. ``"pts+trb+ast"``, ``"PRA"``, ``"fg3"`` or ``"pts + 2*blk"``.
+
+    Args:
+        name: Expression text
+
+    Returns:
+        Parsed expression with its columns in a canonical order
+
+    Raises:
+        ValueError: If the expression is not a linear combination of known stats
+    """
+    if not isinstance(name, str) or not name.strip():
+        raise ValueError(f"Invalid stat: {name!r}")
+    if len(name) > MAX_EXPRESSION_LENGTH:
+        raise ValueError(f"Stats can be at most {MAX_EXPRESSION_LENGTH} characters long")
+    try:
+        tree = ast.parse(name.strip(), mode='eval')
+    except SyntaxError:
+        raise ValueError(f"Invalid stat: {name!r}")
+
+    coefficients = _linear_terms(tree.body, name, depth=0)
+    if '' in coefficients:
+        raise ValueError(f"Stat {name!r} must use a game log column")
+    order = {column: i for i, column in enumerate(COUNTING_STATS)}
+    terms = tuple(sorted(((column, weight) for column, weight in coefficients.items() if weight != 0),
+                         key=lambda term: order[term[0]]))
+    if not terms:
+        raise ValueError(f"Stat {name!r} must use a game log column")
+    if not np.all(np.isfinite([weight for _, weight in terms])):
+        raise ValueError(f"Invalid stat: {name!r}")
+    return StatExpression(name, terms)
+
+
+def _linear_terms(node: ast.AST, name: str, depth: int) -> Dict[str, float]:
+    """Get the column weights of an expression node, or a {"": value} constant."""
+    if isinstance(node, ast.Name):
+        column = node.id.lower()
+        if column in COUNTING_STATS:
+            return {column: 1.0}
+        if column in STAT_ALIASES and depth < 2:
+            return _linear_terms(ast.parse(STAT_ALIASES[column], mode='eval').body, name, depth + 1)
+        raise ValueError(f"Unknown stat {node.id!r} in {name!r}")
+
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        return {'': float(node.value)}
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+        sign = -1.0 if isinstance(node.op, ast.USub) else 1.0
+        return {column: sign * weight for column, weight in _linear_terms(node.operand, name, depth).items()}
+
+    if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Sub)):
+        sign = -1.0 if isinstance(node.op, ast.Sub) else 1.0
+        terms = dict(_linear_terms(node.left, name, depth))
+        for column, weight in _linear_terms(node.right, name, depth).items():
+            terms[column] = terms.get(column, 0.0) + sign * weight
+        if '' in terms:
+            raise ValueError(f"Constants can only multiply stats in {name!r}")
+        return terms
+
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Mult):
+        left, right = _linear_terms(node.left, name, depth), _linear_terms(node.right, name, depth)
+        if set(left) == {''}:
+            left, right = right, left
+        if set(right) != {''}:
+            raise ValueError(f"Stats can only be multiplied by numbers in {name!r}")
+        return {column: weight * right[''] for column, weight in left.items()}
+
+    raise ValueError(f"Invalid stat: {name!r}")
+
+
+def expression_columns(expressions: Sequence[StatExpression]) -> List[str]:
+    """Get the game log columns used by any of the expressions, in ``COUNTING_STATS`` order."""
+    used = {column for expression in expressions for column, _ in expression.coefficients}
+    return [column for column in COUNTING_STATS if column in used]
+
+
+def evaluate_stats(games_df: pd.DataFrame, expressions: Sequence[StatExpression]) -> np.ndarray:
+    """
+    Evaluate stat expressions for every game in one pass.
+
+    The columns used by any expression are gathered into one (games, columns)
+    matrix and multiplied by the (columns, expressions) weight matrix.
+
+    Args:
+        games_df: Game log with the scraper's column names; missing values count as 0
+        expressions: Parsed expressions (see ``parse_stat_expression``)
+
+    Returns:
+        Array of shape (games, expressions)
+    """
+    columns = expression_columns(expressions)
+    index = {column: i for i, column in enumerate(columns)}
+    weights = np.zeros((len(columns), len(expressions)))
+    for j, expression in enumerate(expressions):
+        for column, weight in expression.coefficients:
+            weights[index[column], j] = weight
+
+    stats = games_df.reindex(columns=columns)
+    numeric = all(pd.api.types.is_numeric_dtype(dtype) for dtype in stats.dtypes)
+    values = stats if numeric else stats.apply(pd.to_numeric, errors='coerce')
+    return np.nan_to_num(values.to_numpy(np.float64)) @ weights
@@ -0,0 +1,133 @@
+from typing import Any, Dict, List, Sequence, Union
+
+import numpy as np
+
+# Change in the last-five average (vs the previous five) needed to call a trend
+TREND_THRESHOLD = 1.0
+
+# Upper bound on the number of bet lines evaluated per stat in one request
+MAX_BET_LINES = 500
+
+BetLineSpec = Union[float, int, Sequence[float], Dict[str, float]]
+
+
+def parse_bet_lines(spec: BetLineSpec) -> np.ndarray:
+    """
+    Parse a bet line specification into an array of lines.
+
+    Accepts a single line (``25.5``), a list of lines (``[24.5, 25.5, 26.5]``) or a
+    ladder (``{"start": 20.5, "stop": 35.5, "step": 0.5}``, ``stop`` inclusive).
+
+    Args:
+        spec: Bet line specification
+
+    Returns:
+        1-D float array of bet lines, in the order given
+    """
+    if spec is None:
+        return np.zeros(1)
+
+    if isinstance(spec, dict):
+        try:
+            start, stop = float(spec['start']), float(spec['stop'])
+            step = float(spec.get('step', 0.5))
+        except (KeyError, TypeError, ValueError):
+            raise ValueError("Bet line ladders need numeric 'start', 'stop' and 'step' values")
+        if not np.all(np.isfinite([start, stop, step])):
+            raise ValueError(f"Invalid bet line: {spec!r}")
+        if step <= 0 or stop < start:
+            raise ValueError("Bet line ladders need a positive 'step' and 'stop' >= 'start'")
+        count = np.floor((stop - start) / step + 1e-9) + 1
+        # Checked before the ladder is allocated, so a huge range is rejected cheaply
+        if count > MAX_BET_LINES:
+            raise ValueError(f"At most {MAX_BET_LINES} bet lines can be evaluated per stat")
+        lines = start + step * np.arange(int(count))
+    else:
+        try:
+            lines = np.atleast_1d(np.asarray(spec, dtype=np.float64))
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid bet line: {spec!r}")
+
+    if lines.ndim != 1 or lines.size == 0:
+        raise ValueError(f"Invalid bet line: {spec!r}")
+    if lines.size > MAX_BET_LINES:
+        raise ValueError(f"At most {MAX_BET_LINES} bet lines can be evaluated per stat")
+    if not np.all(np.isfinite(lines)):
+        raise ValueError(f"Invalid bet line: {spec!r}")
+    return lines
+
+
+def over_percentages(sorted_values: np.ndarray, lines: np.ndarray) -> np.ndarray:
+    """
+    Get the percentage of games strictly over each line.
+
+    Args:
+        sorted_values: Stat values sorted ascending
+        lines: Bet lines
+
+    Returns:
+        Over percentage for every line
+    """
+    n_games = sorted_values.size
+    if n_games == 0:
+        return np.zeros(lines.size)
+    over_counts = n_games - np.searchsorted(sorted_values, lines, side='right')
+    return over_counts / n_games * 100
+
+
+def calculate_stats(values: np.ndarray, bet_lines: List[np.ndarray]) -> List[Dict[str, Any]]:
+    """
+    Calculate summary statistics for several stat categories in one pass.
+
+    Args:
+        values: Array of shape (games, stats), most recent game first
+        bet_lines: One array of bet lines per stat column (see ``parse_bet_lines``).
+                   The first line is used for ``overPercentage``; when several lines
+                   are given, ``lineLadder`` holds the over percentage of each one.
+
+    Returns:
+        One statistics dictionary per stat column
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, np.newaxis]
+    n_games, n_stats = values.shape
+
+    if n_games == 0:
+        zeros = np.zeros(n_stats)
+        average = median = min_val = max_val = last_five_avg = prev_five_avg = zeros
+    else:
+        average = values.mean(axis=0)
+        median = np.median(values, axis=0)
+        min_val = values.min(axis=0)
+        max_val = values.max(axis=0)
+
+        # Trend based on last 5 games vs previous 5
+        last_five_avg = values[:5].mean(axis=0)
+        prev_five_avg = values[5:10].mean(axis=0) if n_games > 5 else last_five_avg
+
+    trends = np.where(last_five_avg > prev_five_avg + TREND_THRESHOLD, 'up',
+                      np.where(last_five_avg < prev_five_avg - TREND_THRESHOLD, 'down', 'stable'))
+
+    sorted_values = np.sort(values, axis=0)
+
+    stats = []
+    for j in range(n_stats):
+        lines = np.asarray(bet_lines[j], dtype=np.float64)
+        percentages = over_percentages(sorted_values[:, j], lines)
+        stat = {
+            "average": round(float(average[j]), 1),
+            "median": float(median[j]),
+            "min": float(min_val[j]),
+            "max": float(max_val[j]),
+            "overPercentage": round(float(percentages[0]), 1),
+            "lastFiveAvg": round(float(last_five_avg[j]), 1),
+            "trend": str(trends[j])
+        }
+        if lines.size > 1:
+            stat["lineLadder"] = [
+                {"line": float(line), "overPercentage": round(float(pct), 1)}
+                for line, pct in zip(lines, percentages)
+            ]
+        stats.append(stat)
+    return stats
@@ -0,0 +1,50 @@
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from benchmarks.stub_server import StubServer
+
+# The scraper reads NBAPROPS_BASE_URL when it is imported, so the stub of the site is
+# started and the environment set up before any test module imports src
+_stub_server = StubServer(latency=0).start()
+_cache_dir = tempfile.mkdtemp(prefix='nbaprops-tests-')
+os.environ.update(
+    NBAPROPS_BASE_URL=_stub_server.url,
+    NBAPROPS_CACHE_DIR=_cache_dir,
+    NBAPROPS_RATE_LIMIT_RPM='100000',
+    NBAPROPS_RATE_LIMIT_BURST='1000',
+    NBAPROPS_LOG_LEVEL='ERROR',
+)
+
+# Season of the stub's game logs that is treated as the current one
+CURRENT_SEASON = 2025
+
+
+def pytest_sessionfinish(session, exitstatus):
+    _stub_server.stop()
+    shutil.rmtree(_cache_dir, ignore_errors=True)
+
+
+@pytest.fixture
+def stub_server():
+    """Local stub of basketball-reference.com that the scraper is pointed at."""
+    return _stub_server
+
+
+@pytest.fixture
+def current_season(monkeypatch):
+    """Pin the current season, so results do not depend on today's date."""
+    import src.analysis
+    import src.main
+    monkeypatch.setattr(src.main, 'get_current_season', lambda: CURRENT_SEASON)
+    monkeypatch.setattr(src.analysis, 'get_current_season', lambda: CURRENT_SEASON)
+    return CURRENT_SEASON
+
+
+@pytest.fixture
+def client(current_season):
+    """Test client of the Flask app."""
+    from src.api import app
+    return app.test_client()
@@ -0,0 +1,112 @@
+import pytest
+
+from src.analysis_cache import AnalysisCache
+
+RESULT = {"playerName": "Trae Young", "gameLogs": [], "stats": {"pts": {"average": 25.1}}}
+
+
+@pytest.fixture
+def generations():
+    """Generations of the stored game logs, by (player_id, season)"""
+    return {('youngtr01', 2025): 'g1', ('youngtr01', 2024): 'final'}
+
+
+def generation_of(generations):
+    return lambda player_id, season: generations.get((player_id, season))
+
+
+def test_entries_are_dropped_when_a_game_log_changes(generations):
+    cache = AnalysisCache()
+    key = AnalysisCache.make_key({"playerName": "Trae Young", "seasons": [2025, 2024]})
+    entry = cache.put(key, RESULT, [('youngtr01', 2025, 'g1'), ('youngtr01', 2024, 'final')])
+
+    assert entry.is_final and entry.etag
+    assert cache.get(key, generation_of(generations)) == entry
+    assert cache.stats()['hits'] == 1
+
+    generations[('youngtr01', 2025)] = 'g2'
+    assert cache.get(key, generation_of(generations)) is None
+    assert cache.stats()['invalidations'] == 1
+    # The entry is gone, not just skipped
+    generations[('youngtr01', 2025)] = 'g1'
+    assert cache.get(key, generation_of(generations)) is None
+
+
+def test_keys_do_not_depend_on_parameter_order():
+    assert AnalysisCache.make_key({"a": 1, "b": [2, 3]}) == AnalysisCache.make_key({"b": [2, 3], "a": 1})
+    assert AnalysisCache.make_key({"a": 1}) != AnalysisCache.make_key({"a": 2})
+
+
+def test_expired_entries_are_revalidated(generations):
+    cache = AnalysisCache()
+    entry = cache.put('key', RESULT, [('youngtr01', 2025, 'g1')], ttl=-1)
+    assert entry.is_expired and not entry.is_final
+
+    assert cache.get('key', generation_of(generations)) is None
+    entry = cache.put('key', RESULT, [('youngtr01', 2025, 'g1')], ttl=-1)
+    expired = cache.get('key', generation_of(generations), allow_expired=True)
+    assert expired == entry
+
+    # No new games: the entry and its ETag are kept for another ttl
+    renewed = cache.revalidate('key', expired, generation_of(generations), ttl=60)
+    assert renewed.etag == entry.etag and not renewed.is_expired
+    assert cache.stats()['revalidations'] == 1
+
+    # New games: the analysis has to be recomputed
+    expired = cache.put('key', RESULT, [('youngtr01', 2025, 'g1')], ttl=-1)
+    generations[('youngtr01', 2025)] = 'g2'
+    assert cache.revalidate('key', expired, generation_of(generations), ttl=60) is None
+    assert cache.get('key', generation_of(generations), allow_expired=True) is None
+
+
+def test_least_recently_used_entries_are_evicted(generations):
+    cache = AnalysisCache(max_entries=2)
+    for key in ['a', 'b']:
+        cache.put(key, RESULT, [])
+    cache.get('a', generation_of(generations))
+    cache.put('c', RESULT, [])
+
+    assert cache.get('b', generation_of(generations)) is None
+    assert cache.get('a', generation_of(generations)) is not None
+
+
+def test_processes_share_the_cache_file(tmp_path, generations):
+    path = str(tmp_path / 'analyses.sqlite')
+    entry = AnalysisCache(path=path).put('key', RESULT, [('youngtr01', 2025, 'g1')])
+
+    loaded = AnalysisCache(path=path).get('key', generation_of(generations))
+    assert loaded.result == RESULT
+    assert loaded.etag == entry.etag and loaded.body == entry.body
+
+
+def test_analyze_revalidates_with_etags(client, stub_server):
+    body = {"playerName": "Trae Young", "playerId": "youngtr01", "betLines": {"pts": 24.5}}
+    response = client.post('/api/player/analyze', json=body)
+    etag = response.headers['ETag']
+    assert response.status_code == 200 and etag
+    # The current season can get new games
+    assert response.headers['Cache-Control'] == 'private, no-cache'
+
+    requests = stub_server.requests
+    response = client.post('/api/player/analyze', json=body, headers={'If-None-Match': etag})
+    assert response.status_code == 304 and response.data == b''
+    assert response.headers['ETag'] == etag
+    # Served from the analysis cache without contacting the site
+    assert stub_server.requests == requests
+
+    response = client.post('/api/player/analyze', json=body, headers={'If-None-Match': '"other"'})
+    assert response.status_code == 200 and response.headers['ETag'] == etag
+
+    response = client.post('/api/player/analyze', json={**body, "betLines": {"pts": 5.5}})
+    assert response.status_code == 200 and response.headers['ETag'] != etag
+
+
+def test_completed_seasons_can_be_cached_by_clients(client, monkeypatch):
+    import src.main
+    # The analyzed season has ended by the time its game log is fetched
+    monkeypatch.setattr(src.main, 'get_current_season', lambda: 2026)
+
+    response = client.post('/api/player/analyze', json={"playerName": "Final Season", "playerId": "finalse01"})
+
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == 'private, max-age=86400'
@@ -0,0 +1,120 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics import (PER_MINUTES, RollingWindows, SplitWindows, ewma, parse_windows, per_36, rest_days,
+                           split_masks)
+
+
+@pytest.fixture
+def games():
+    rng = np.random.default_rng(24)
+    values = rng.integers(0, 40, size=(60, 3)).astype(float)
+    values[rng.random(values.shape) < 0.1] = np.nan
+    minutes = rng.uniform(20, 40, size=60)
+    minutes[5] = np.nan
+    return values, minutes
+
+
+@pytest.mark.parametrize('window, min_periods', [(1, None), (5, None), (10, 3), (60, 1), (100, 1)])
+def test_rolling_windows_match_a_naive_computation(games, window, min_periods):
+    values, minutes = games
+    rolling = RollingWindows(values, minutes)
+    frame = pd.DataFrame(values).rolling(window, min_periods=min_periods if min_periods is not None else window)
+
+    np.testing.assert_allclose(rolling.mean(window, min_periods), frame.mean().to_numpy(), equal_nan=True)
+    # The square root magnifies the rounding error of a variance near 0 from the prefix sums
+    np.testing.assert_allclose(rolling.std(window, min_periods), frame.std(ddof=0).to_numpy(),
+                               equal_nan=True, atol=1e-5)
+    np.testing.assert_allclose(rolling.std(window, min_periods, ddof=1), frame.std(ddof=1).to_numpy(),
+                               equal_nan=True, atol=1e-5)
+
+    totals = frame.sum().to_numpy()
+    played = pd.Series(np.nan_to_num(minutes)).rolling(window, min_periods=1).sum().to_numpy()[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        expected = np.where(played > 0, totals / played * PER_MINUTES, np.nan)
+    np.testing.assert_allclose(rolling.per_36(window, min_periods), expected, equal_nan=True)
+
+
+def test_rolling_windows_of_one_stat_and_no_games():
+    rolling = RollingWindows([10.0, 20.0, 30.0])
+    np.testing.assert_allclose(rolling.mean(2), [[np.nan], [15.0], [25.0]], equal_nan=True)
+    with pytest.raises(ValueError):
+        rolling.mean(0)
+    with pytest.raises(ValueError):
+        rolling.per_36(2)
+
+    assert RollingWindows(np.empty((0, 2))).mean(5).shape == (0, 2)
+
+
+def test_ewma_and_per_36(games):
+    values, minutes = games
+    np.testing.assert_allclose(ewma(values, 5), pd.DataFrame(values).ewm(span=5, ignore_na=True).mean().to_numpy())
+    with pytest.raises(ValueError):
+        ewma(values, 0.5)
+
+    np.testing.assert_allclose(per_36(values, minutes), np.nansum(values, axis=0) / np.nansum(minutes) * 36)
+    assert np.isnan(per_36([10.0], [0.0])).all()
+
+
+def test_rest_days_and_split_masks():
+    rest = rest_days(['2025-01-01', '2025-01-02', '2025-01-05', '2025-01-07', None, '2025-01-20'])
+    np.testing.assert_array_equal(rest, [np.nan, 0, 2, 1, np.nan, np.nan])
+
+    masks = split_masks(['H', 'A', 'H', 'A', 'H', 'A'], rest)
+    assert masks['home'].tolist() == [True, False, True, False, True, False]
+    assert masks['backToBack'].tolist() == [False, True, False, False, False, False]
+    assert masks['rested'].tolist() == [False, False, True, True, False, False]
+    assert masks['restDays2'].tolist() == [False, False, True, False, False, False]
+    assert not masks['restDays3Plus'].any()
+
+
+@pytest.mark.parametrize('last_n', [None, 1, 10, 59, 100])
+def test_split_windows_match_a_naive_computation(games, last_n):
+    values, minutes = games
+    rng = np.random.default_rng(1)
+    masks = {'home': rng.random(60) < 0.5, 'none': np.zeros(60, dtype=bool)}
+    masks['away'] = ~masks['home']
+
+    summary = SplitWindows(values, minutes, masks).summarize(last_n)
+
+    recent = slice(-last_n if last_n is not None else None, None)
+    for name, mask in masks.items():
+        split = values[recent][mask[recent]]
+        split_minutes = np.nansum(minutes[recent][mask[recent]])
+        assert summary[name]["games"] == mask[recent].sum()
+        with warnings.catch_warnings():
+            # Splits without games have NaN averages
+            warnings.simplefilter('ignore', RuntimeWarning)
+            expected_average = np.nanmean(split, axis=0)
+            expected_std = np.nanstd(split, axis=0)
+        np.testing.assert_allclose(summary[name]["average"], expected_average, equal_nan=True)
+        np.testing.assert_allclose(summary[name]["std"], expected_std, equal_nan=True, atol=1e-9)
+        expected_rates = np.nansum(split, axis=0) / split_minutes * 36 if split_minutes else np.full(3, np.nan)
+        np.testing.assert_allclose(summary[name]["per36"], expected_rates, equal_nan=True)
+
+
+@pytest.mark.parametrize('windows, expected', [(None, [5, 10]), ([10, 3, 3], [3, 10]), ([5.0], [5])])
+def test_parse_windows(windows, expected):
+    assert parse_windows(windows, [5, 10], 82) == expected
+
+
+@pytest.mark.parametrize('windows', [[], 5, [0], [83], [2.5], [True], ['5'], [float('inf')], [float('nan')],
+                                     [10 ** 400]])
+def test_parse_invalid_windows(windows):
+    with pytest.raises(ValueError):
+        parse_windows(windows, [5, 10], 82)
+
+
+def test_analytics_endpoint(client):
+    response = client.post('/api/player/analytics', json={"playerName": "Trae Young", "playerId": "youngtr01",
+                                                            "windows": [3, 10], "betLines": {"pts": 20.5}})
+    assert response.status_code == 200, response.get_json()
+
+
+@pytest.mark.parametrize('body', [{"windows": [float('inf')]}, {"ewmaSpan": 10 ** 400}, {"ewmaSpan": float('nan')}])
+def test_analytics_endpoint_rejects_invalid_parameters(client, body):
+    response = client.post('/api/player/analytics', json={"playerName": "Trae Young", **body})
+    assert response.status_code == 400, response.get_json()
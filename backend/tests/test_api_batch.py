@@ -0,0 +1,60 @@
+import copy
+
+import pytest
+
+BATCH_URL = '/api/player/analyze/batch'
+
+
+def test_batch_analyzes_every_item(client):
+    items = [
+        {"playerName": "Trae Young", "playerId": "youngtr01", "gamesCount": 5, "betLines": {"points": 25.5}},
+        {"playerName": "Luka Doncic", "playerId": "doncilu01", "gamesCount": 3},
+    ]
+    sent = copy.deepcopy(items)
+
+    response = client.post(BATCH_URL, json={"items": items})
+
+    assert response.status_code == 200
+    results = response.get_json()['results']
+    assert [result['index'] for result in results] == [0, 1]
+    assert all(result['status'] == 'ok' for result in results)
+    assert results[0]['result']['playerName'] == 'Trae Young'
+    assert len(results[0]['result']['gameLogs']) == 5
+    assert len(results[1]['result']['gameLogs']) == 3
+    # The caller's items are not modified
+    assert items == sent
+
+
+@pytest.mark.parametrize('bad_item, message', [
+    ({"playerName": "Trae Young", "playerId": "youngtr01", "gamesCount": "abc"}, 'gamesCount'),
+    ({"playerName": "Trae Young", "playerId": "youngtr01", "gamesCount": 0}, 'gamesCount'),
+    ({"playerName": "Trae Young", "playerId": "youngtr01", "gamesCount": -3}, 'gamesCount'),
+    ({"playerName": "Trae Young", "playerId": "youngtr01", "betLines": [25.5]}, 'betLines'),
+    ({"playerName": "Trae Young", "playerId": "youngtr01", "betLines": "25.5"}, 'betLines'),
+    ({"playerName": "Trae Young", "playerId": "youngtr01", "lastDays": "soon"}, 'lastDays'),
+    ({"playerName": "Trae Young", "playerId": "youngtr01", "stats": 3}, 'stats'),
+    ({"playerName": 7}, 'Player name'),
+    ("Trae Young", 'JSON object'),
+])
+def test_bad_item_gets_400_while_others_succeed(client, bad_item, message):
+    good = {"playerName": "Trae Young", "playerId": "youngtr01", "gamesCount": 5}
+
+    response = client.post(BATCH_URL, json={"items": [good, bad_item, good]})
+
+    assert response.status_code == 200
+    results = response.get_json()['results']
+    assert [result['status'] for result in results] == ['ok', 'error', 'ok']
+    assert results[1]['statusCode'] == 400
+    assert message in results[1]['error']
+
+
+def test_batch_requires_items(client):
+    assert client.post(BATCH_URL, json={"items": []}).status_code == 400
+    assert client.post(BATCH_URL, json={"items": "x"}).status_code == 400
+
+
+def test_single_analysis_rejects_bad_games_count(client):
+    response = client.post('/api/player/analyze', json={"playerName": "Trae Young", "gamesCount": "abc"})
+
+    assert response.status_code == 400
+    assert 'gamesCount' in response.get_json()['error']
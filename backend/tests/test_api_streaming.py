@@ -0,0 +1,87 @@
+import json
+
+ANALYZE_URL = '/api/player/analyze'
+BATCH_URL = '/api/player/analyze/batch'
+
+
+def ndjson_events(response):
+    lines = response.get_data(as_text=True).splitlines()
+    return [json.loads(line) for line in lines if line]
+
+
+def sse_events(response):
+    """Parse Server-Sent Events into (event name, data) pairs."""
+    events = []
+    for block in response.get_data(as_text=True).split('\n\n'):
+        if not block:
+            continue
+        fields = dict(line.split(': ', 1) for line in block.split('\n'))
+        events.append((fields['event'], json.loads(fields['data'])))
+    return events
+
+
+def test_analysis_streams_each_seasons_games_then_the_result(client, current_season):
+    body = {"playerName": "Trae Young", "playerId": "youngtr01", "gamesCount": 5, "seasons": "both"}
+
+    response = client.post(f'{ANALYZE_URL}?stream=ndjson', json=body)
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    events = ndjson_events(response)
+    seasons = [event for event in events if event['event'] == 'season']
+    assert sorted(event['season'] for event in seasons) == [current_season - 1, current_season]
+    for event in seasons:
+        assert event['games'] == len(event['gameLogs']) == 5
+        assert {'date', 'opponent', 'points', 'rebounds', 'assists'} <= set(event['gameLogs'][0])
+    assert events[-1]['event'] == 'result'
+
+    # The result covers the most recent games, which are the current season's
+    result = events[-1]['result']
+    current = next(event for event in seasons if event['season'] == current_season)
+    assert result['gameLogs'] == current['gameLogs']
+    assert result == client.post(ANALYZE_URL, json=body).get_json()
+
+
+def test_streamed_season_games_are_filtered(client):
+    body = {"playerName": "Trae Young", "playerId": "youngtr01", "gamesCount": 3, "location": "H"}
+
+    events = ndjson_events(client.post(f'{ANALYZE_URL}?stream=ndjson', json=body))
+
+    season = events[0]
+    assert season['event'] == 'season'
+    assert season['games'] == 3
+    assert all(game['location'] == 'H' for game in season['gameLogs'])
+
+
+def test_analysis_stream_reports_errors_as_events(client):
+    events = ndjson_events(client.post(f'{ANALYZE_URL}?stream=ndjson', json={"playerName": "Trae Young",
+                                                                              "gamesCount": "abc"}))
+
+    assert events == [{"event": "error", "error": events[0]['error'], "statusCode": 400}]
+
+
+def test_sse_framing_uses_event_names(client):
+    body = {"playerName": "Trae Young", "playerId": "youngtr01", "gamesCount": 3}
+
+    response = client.post(ANALYZE_URL, json=body, headers={'Accept': 'text/event-stream'})
+
+    assert response.mimetype == 'text/event-stream'
+    assert response.headers['Cache-Control'] == 'no-cache'
+    events = sse_events(response)
+    assert [name for name, _ in events] == ['season', 'result']
+    assert all(data['event'] == name for name, data in events)
+
+
+def test_batch_stream_sends_every_item_then_done(client):
+    items = [{"playerName": "Trae Young", "playerId": "youngtr01", "gamesCount": 3},
+             {"playerName": "Trae Young", "playerId": "youngtr01", "gamesCount": 0},
+             {"playerName": "Luka Doncic", "playerId": "doncilu01", "gamesCount": 4}]
+
+    events = ndjson_events(client.post(f'{BATCH_URL}?stream=ndjson', json={"items": items}))
+
+    assert events[-1] == {"event": "done", "count": 3}
+    by_index = {event['index']: event for event in events[:-1]}
+    assert sorted(by_index) == [0, 1, 2]
+    assert all(event['event'] == 'item' for event in by_index.values())
+    assert by_index[1]['statusCode'] == 400
+    assert len(by_index[2]['result']['gameLogs']) == 4
@@ -0,0 +1,46 @@
+import asyncio
+
+import pandas as pd
+
+from src.scrapers.async_basketball_reference import AsyncBasketballReferenceScraper
+from src.scrapers.basketball_reference import BasketballReferenceScaper
+
+
+def run_async(scraper, method, *args, **kwargs):
+    async def call():
+        async_scraper = AsyncBasketballReferenceScraper(scraper)
+        try:
+            return await getattr(async_scraper, method)(*args, **kwargs)
+        finally:
+            await async_scraper.aclose()
+    return asyncio.run(call())
+
+
+def assert_same_games(left, right):
+    # Freshly scraped logs have object columns where stored ones are categorical
+    pd.testing.assert_frame_equal(left.astype(object), right.astype(object))
+
+
+def test_recent_games_match_the_sync_scraper():
+    scraper = BasketballReferenceScaper()
+
+    games = run_async(scraper, 'get_recent_games', 'Trae Young', seasons=[2025, 2024], last_n_games=15,
+                      player_id='youngtr01', location='A')
+
+    assert len(games) == 15
+    assert (games['game_location'] == 'A').all()
+    assert_same_games(games, scraper.get_recent_games('Trae Young', seasons=[2025, 2024], last_n_games=15,
+                                                      player_id='youngtr01', location='A'))
+
+
+def test_games_against_opponent_match_the_sync_scraper():
+    scraper = BasketballReferenceScaper()
+    opponent = scraper.get_game_log_by_id('youngtr01', 2025)['opp_id'].iloc[0]
+
+    games = run_async(scraper, 'get_games_against_opponent', 'Trae Young', opponent, seasons=[2025, 2024],
+                      player_id='youngtr01')
+
+    assert len(games) > 0
+    assert (games['opp_id'] == opponent).all()
+    assert_same_games(games, scraper.get_games_against_opponent('Trae Young', opponent, seasons=[2025, 2024],
+                                                                player_id='youngtr01'))
@@ -0,0 +1,60 @@
+import pytest
+
+from src.scrapers.expiring_set import ExpiringSet
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('src.scrapers.expiring_set.time.monotonic', lambda: now[0])
+    return now
+
+
+def test_members_expire_after_ttl(clock):
+    members = ExpiringSet(ttl=60, max_size=10)
+    members.add(('youngtr01', 2025))
+
+    assert ('youngtr01', 2025) in members
+    clock[0] += 61
+    assert ('youngtr01', 2025) not in members
+    assert len(members) == 0
+
+
+def test_adding_again_restarts_the_lifetime(clock):
+    members = ExpiringSet(ttl=60, max_size=10)
+    members.add('a')
+    clock[0] += 50
+    members.add('a')
+    clock[0] += 50
+
+    assert 'a' in members
+
+
+def test_size_is_bounded_by_dropping_the_oldest(clock):
+    members = ExpiringSet(ttl=60, max_size=3)
+    for key in 'abcd':
+        members.add(key)
+        clock[0] += 1
+
+    assert 'a' not in members
+    assert all(key in members for key in 'bcd')
+    assert len(members._expires) == 3
+
+
+def test_expired_members_are_dropped_as_new_ones_arrive(clock):
+    members = ExpiringSet(ttl=60, max_size=100)
+    for key in range(50):
+        members.add(key)
+    clock[0] += 61
+    members.add('new')
+
+    assert list(members._expires) == ['new']
+
+
+def test_discard(clock):
+    members = ExpiringSet(ttl=60, max_size=10)
+    members.add('a')
+    members.discard('a')
+    members.discard('missing')
+
+    assert 'a' not in members
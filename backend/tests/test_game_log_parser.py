@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.fixtures import ensure_fixtures, synthesize_game_log
+from src.scrapers.game_log_parser import PARSER_ENGINES, lxml, parse_game_log
+
+ENGINES = [engine for engine in PARSER_ENGINES if engine != 'lxml' or lxml is not None]
+
+
+def read_fixture(path):
+    with open(path, 'rb') as f:
+        return f.read(), int(path[-len('2025.html'):-len('.html')])
+
+
+def assert_same_frame(left, right):
+    pd.testing.assert_frame_equal(left[sorted(left.columns)], right[sorted(right.columns)])
+
+
+@pytest.mark.parametrize('path', ensure_fixtures())
+def test_engines_parse_the_fixtures_alike(path):
+    html, season = read_fixture(path)
+    expected = parse_game_log(html, season, engine='html.parser')
+
+    for engine in ENGINES:
+        assert_same_frame(parse_game_log(html, season, engine=engine), expected)
+
+
+@pytest.mark.parametrize('path', ensure_fixtures()[:1])
+def test_engines_parse_recent_games_alike(path):
+    html, season = read_fixture(path)
+    games = parse_game_log(html, season, engine='html.parser')
+    after_date = games['date_game'].iloc[10]
+
+    expected = parse_game_log(html, season, engine='html.parser', after_date=after_date)
+    # Only columns that any of the recent games has are present
+    assert_same_frame(expected, games.iloc[:10][list(expected.columns)].reset_index(drop=True))
+
+    for engine in ENGINES:
+        assert_same_frame(parse_game_log(html, season, engine=engine, after_date=after_date), expected)
+
+
+def test_page_quirks():
+    html = synthesize_game_log('youngtr01', 2024, games=82).encode('utf-8')
+
+    for engine in ENGINES:
+        games = parse_game_log(html, 2024, engine=engine)
+
+        # Repeated header rows and the commented-out playoffs table are not games
+        assert len(games) == 82
+        assert games['date_game'].is_monotonic_decreasing
+        assert games['season'].eq('2023-2024').all()
+        # Missed games keep their date, opponent and reason, without stats
+        missed = games[games['reason'].notna()]
+        assert len(missed) > 0
+        assert missed['pts'].isna().all() and missed['opp_id'].notna().all()
+        played = games[games['reason'].isna()]
+        assert played['pts'].notna().all()
+        assert played['mp'].between(0, 48).all()
+        assert set(games['game_location']) <= {'H', 'A'}
+        assert np.allclose(played['pts'], 2 * (played['fg'] - played['fg3']) + 3 * played['fg3'] + played['ft'])
+
+
+def test_page_without_game_log():
+    for engine in ENGINES:
+        assert parse_game_log(b'<html><body><p>Page not found</p></body></html>', 2025, engine=engine) is None
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        parse_game_log(b'<html></html>', 2025, engine='regex')
@@ -0,0 +1,135 @@
+import multiprocessing
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.scrapers.game_log_store import GameLogQuery, GameLogStore, filter_game_log
+
+
+def make_games(dates, opponents=None, pts=None):
+    """Build a parsed game log, most recent game first."""
+    dates = pd.to_datetime(sorted(dates, reverse=True))
+    n = len(dates)
+    return pd.DataFrame({
+        'date_game': dates,
+        'opp_id': opponents or ['BOS', 'NYK'] * (n // 2) + ['BOS'] * (n % 2),
+        'game_location': ['@', ''] * (n // 2) + ['@'] * (n % 2),
+        'pts': np.asarray(pts if pts is not None else range(n), dtype=float),
+        'trb': np.ones(n),
+        'ast': np.ones(n),
+        'reason': [np.nan] * n,
+    })
+
+
+@pytest.fixture
+def store(tmp_path):
+    return GameLogStore(str(tmp_path / 'game_logs'))
+
+
+def test_save_and_load_round_trip(store):
+    games = make_games(['2024-11-01', '2024-11-03', '2024-11-05'])
+    store.save('youngtr01', 2025, games)
+
+    loaded = store.load('youngtr01', 2025)
+
+    pd.testing.assert_frame_equal(loaded, games, check_categorical=False, check_dtype=False)
+    assert list(loaded['date_game']) == list(games['date_game'])
+    assert store.meta('youngtr01', 2025)['last_date'] == '2024-11-05'
+
+
+def test_load_missing_log(store):
+    assert store.load('nobody01', 2025) is None
+
+
+def test_load_selected_columns(store):
+    store.save('youngtr01', 2025, make_games(['2024-11-01', '2024-11-03']))
+
+    loaded = store.load('youngtr01', 2025, columns=['pts', 'not_stored'])
+
+    assert list(loaded.columns) == ['pts']
+
+
+def test_append_adds_only_newer_games_and_changes_generation(store):
+    store.save('youngtr01', 2025, make_games(['2024-11-01', '2024-11-03']))
+    generation = store.meta('youngtr01', 2025)['generation']
+
+    update = make_games(['2024-11-03', '2024-11-07'])
+    games = store.append('youngtr01', 2025, update)
+
+    assert len(games) == 3
+    assert store.load('youngtr01', 2025)['date_game'].iloc[0] == pd.Timestamp('2024-11-07')
+    assert store.meta('youngtr01', 2025)['generation'] != generation
+    # Column files of the previous generation are removed
+    directory = os.path.join(store.root, 'youngtr01', '2025')
+    assert all(name.startswith(store.meta('youngtr01', 2025)['generation'])
+               for name in os.listdir(directory) if name.endswith('.npy'))
+
+
+def test_append_without_new_games_keeps_generation(store):
+    store.save('youngtr01', 2025, make_games(['2024-11-01', '2024-11-03']))
+    generation = store.meta('youngtr01', 2025)['generation']
+
+    games = store.append('youngtr01', 2025, make_games(['2024-11-03']), final=True)
+
+    assert len(games) == 2
+    meta = store.meta('youngtr01', 2025)
+    assert meta['generation'] == generation
+    assert meta['final'] is True
+
+
+def test_append_to_missing_log(store):
+    assert store.append('youngtr01', 2025, make_games(['2024-11-01'])) is None
+
+
+def test_max_age_expires_only_logs_that_are_not_final(store, monkeypatch):
+    store.save('youngtr01', 2024, make_games(['2024-01-01']), final=True)
+    store.save('youngtr01', 2025, make_games(['2024-11-01']))
+
+    real_time = __import__('time').time
+    monkeypatch.setattr('src.scrapers.game_log_store.time.time', lambda: real_time() + 3600)
+
+    assert store.load('youngtr01', 2024, max_age=60) is not None
+    assert store.load('youngtr01', 2025, max_age=60) is None
+
+
+def test_query_matches_in_memory_filter(store):
+    games = make_games([f'2024-11-{day:02d}' for day in range(1, 21)])
+    games.loc[3, 'pts'] = np.nan
+    store.save('youngtr01', 2025, games)
+
+    queries = [
+        GameLogQuery(opponent='BOS'),
+        GameLogQuery(opponent='NYK', location=''),
+        GameLogQuery(since=pd.Timestamp('2024-11-05'), until=pd.Timestamp('2024-11-12')),
+        GameLogQuery(played_only=True, limit=5),
+        GameLogQuery(opponent='LAL'),
+    ]
+    for query in queries:
+        expected = filter_game_log(games, query).reset_index(drop=True)
+        loaded = store.load('youngtr01', 2025, query=query)
+        pd.testing.assert_frame_equal(loaded, expected, check_categorical=False, check_dtype=False)
+
+
+def _append_days(root, days):
+    store = GameLogStore(root)
+    for day in days:
+        store.append('youngtr01', 2025, make_games([f'2024-12-{day:02d}']))
+
+
+def test_appends_from_several_processes_are_serialized(store):
+    store.save('youngtr01', 2025, make_games(['2024-11-01']))
+
+    # Each process adds games dated after the other's, so every append must see the previous one
+    workers = [multiprocessing.Process(target=_append_days, args=(store.root, range(start, 29, 2)))
+               for start in (1, 2)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    loaded = store.load('youngtr01', 2025)
+    assert loaded is not None
+    assert loaded['date_game'].is_monotonic_decreasing
+    assert loaded['date_game'].iloc[0] == pd.Timestamp('2024-12-28')
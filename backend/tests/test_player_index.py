@@ -0,0 +1,111 @@
+import pytest
+
+from src.scrapers.player_index import PlayerIndex, normalize_name
+
+PLAYERS = [
+    {"id": "jokicni01", "name": "Nikola Jokić", "to": 2025, "active": True},
+    {"id": "jamesle01", "name": "LeBron James", "to": 2025, "active": True},
+    {"id": "jamesmi01", "name": "Mike James", "to": 2018, "active": False},
+    {"id": "johnsla01", "name": "Larry Johnson", "to": 2001, "active": False},
+    {"id": "johnsla02", "name": "Larry Johnson", "to": 2025, "active": True},
+]
+
+
+class DirectoryScraper:
+    """Serves the player directory from a list, recording how it was asked for."""
+
+    def __init__(self, players, cached_players=None):
+        self.players = players
+        self.cached_players = cached_players
+        self.calls = []
+
+    def get_player_directory(self, letter, background=False, cached_only=False):
+        self.calls.append((letter, background, cached_only))
+        source = self.cached_players if cached_only else self.players
+        return [dict(p) for p in source or [] if p['name'].split()[-1].lower().startswith(letter)]
+
+    def get_league_players(self, season, background=False, cached_only=False):
+        return []
+
+
+@pytest.fixture
+def index(tmp_path, current_season):
+    index = PlayerIndex(str(tmp_path / 'player_index.json'))
+    index._set_players([dict(p) for p in PLAYERS], built_at=0.0)
+    return index
+
+
+def ids(results):
+    return [result['id'] for result in results]
+
+
+def test_normalize_name():
+    assert normalize_name("Luka Dončić") == "luka doncic"
+    assert normalize_name("De'Aaron Fox") == "deaaron fox"
+    assert normalize_name("  Karl-Anthony  Towns ") == "karl anthony towns"
+
+
+def test_prefix_search_on_first_and_last_names(index):
+    assert ids(index.search('jok')) == ['jokicni01']
+    assert ids(index.search('nikola j')) == ['jokicni01']
+    # Active players first
+    assert ids(index.search('james')) == ['jamesle01', 'jamesmi01']
+    assert ids(index.search('larry johnson')) == ['johnsla02', 'johnsla01']
+
+
+def test_fuzzy_search_within_first_letter_bucket(index):
+    assert ids(index.search('jokc')) == ['jokicni01']
+    # Typos in the first letter are not matched
+    assert index.search('gokic') == []
+
+
+def test_find_by_name_ranks_active_players_first(index):
+    assert ids(index.find_by_name('Larry Johnson')) == ['johnsla02', 'johnsla01']
+
+
+def test_refresh_fetches_at_background_priority(index, tmp_path):
+    scraper = DirectoryScraper(PLAYERS[:2])
+
+    assert index.refresh(scraper) == 2
+    assert all(background and not cached_only for _, background, cached_only in scraper.calls)
+    assert not index.is_stale
+    # Saved to disk
+    assert len(PlayerIndex(index.path)) == 2
+
+
+def test_empty_index_is_built_from_cached_pages_first(tmp_path, current_season):
+    index = PlayerIndex(str(tmp_path / 'player_index.json'))
+    scraper = DirectoryScraper(players=[], cached_players=PLAYERS)
+
+    index._refresh_in_background(scraper)
+
+    # Cached pages are read before any page is fetched
+    assert scraper.calls[0][2] is True
+    assert scraper.calls[-1][2] is False
+    # The fetched directory was empty, so the index built from the cached one is kept
+    assert len(index) == len(PLAYERS)
+
+
+def test_search_route_does_not_proxy_to_the_site_while_index_is_empty(client, stub_server, monkeypatch, tmp_path):
+    import src.api
+    empty = PlayerIndex(str(tmp_path / 'player_index.json'))
+    monkeypatch.setattr(empty, 'ensure_fresh', lambda scraper: None)
+    monkeypatch.setattr(src.api, 'player_index', empty)
+    requests_before = stub_server.requests
+
+    response = client.get('/api/players/search?q=young')
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After']
+    assert stub_server.requests == requests_before
+
+
+def test_search_route_answers_from_the_index(client, index, monkeypatch):
+    import src.api
+    monkeypatch.setattr(index, 'ensure_fresh', lambda scraper: None)
+    monkeypatch.setattr(src.api, 'player_index', index)
+
+    response = client.get('/api/players/search?q=lebron')
+
+    assert response.status_code == 200
+    assert ids(response.get_json()) == ['jamesle01']
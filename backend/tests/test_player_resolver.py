@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from src.scrapers.player_index import PlayerIndex
+from src.scrapers.player_resolver import PlayerIdResolver
+
+
+def result(player_id, name, to=None):
+    return {"id": player_id, "name": name, "team": "Unknown", "position": "Unknown", "to": to}
+
+
+@pytest.fixture
+def resolver(tmp_path):
+    index = PlayerIndex(str(tmp_path / 'player_index.json'))
+    return PlayerIdResolver(str(tmp_path / 'player_ids.json'), player_index=index)
+
+
+def saved_ids(resolver):
+    with open(resolver.path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_exact_match_is_resolved_and_saved(resolver):
+    results = [result('youngtr01', 'Trae Young', 2025), result('youngth01', 'Thaddeus Young', 2025)]
+
+    assert resolver.resolve('Trae Young (2019-2025)', search=lambda _: results) == 'youngtr01'
+    assert saved_ids(resolver)['trae young'] == 'youngtr01'
+    # Cached afterwards, without searching again
+    assert resolver.resolve('trae young', search=lambda _: pytest.fail('searched again')) == 'youngtr01'
+
+
+def test_single_result_with_another_name_is_not_resolved_or_saved(resolver):
+    results = [result('jamesle01', 'LeBron James', 2025)]
+
+    assert resolver.resolve('Bron', search=lambda _: results) is None
+    assert 'bron' not in saved_ids(resolver)
+
+
+def test_shared_name_resolves_to_most_recent_player(resolver):
+    results = [result('johnsla01', 'Larry Johnson', 2001), result('johnsla02', 'Larry Johnson', 2025)]
+
+    assert resolver.resolve('Larry Johnson', search=lambda _: results) == 'johnsla02'
+    assert saved_ids(resolver)['larry johnson'] == 'johnsla02'
+
+
+def test_shared_name_without_ranking_is_ambiguous(resolver):
+    results = [result('smithch01', 'Chris Smith'), result('smithch02', 'Chris Smith')]
+
+    assert resolver.resolve('Chris Smith', search=lambda _: results) is None
+    assert resolver.resolve('Chris Smith') is None
+
+
+def test_index_ranks_active_players_first(resolver):
+    resolver.player_index._set_players([
+        {"id": "johnsla01", "name": "Larry Johnson", "to": 2001, "active": False},
+        {"id": "johnsla02", "name": "Larry Johnson", "to": 2025, "active": True},
+    ], built_at=0.0)
+
+    assert resolver.resolve('Larry Johnson') == 'johnsla02'
+
+
+def test_record_results_replaces_entry_ranked_below_another_match(resolver):
+    resolver.record_results([result('johnsla01', 'Larry Johnson', 2001)])
+    assert saved_ids(resolver)['larry johnson'] == 'johnsla01'
+
+    resolver.record_results([result('johnsla01', 'Larry Johnson', 2001), result('johnsla02', 'Larry Johnson', 2025)])
+
+    assert saved_ids(resolver)['larry johnson'] == 'johnsla02'
+
+
+def test_record_results_keeps_entry_missing_from_results(resolver):
+    resolver.record('Larry Johnson', 'johnsla02')
+
+    resolver.record_results([result('johnsla01', 'Larry Johnson', 2001)])
+
+    assert saved_ids(resolver)['larry johnson'] == 'johnsla02'
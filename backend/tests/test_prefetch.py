@@ -0,0 +1,77 @@
+import json
+import os
+
+import pytest
+import requests
+
+from src.prefetch import load_state, prefetch
+from src.scrapers.basketball_reference import BasketballReferenceScaper
+from src.scrapers.game_log_store import GameLogStore
+from src.scrapers.response_cache import ResponseCache
+
+
+@pytest.fixture
+def scraper(tmp_path, current_season):
+    scraper = BasketballReferenceScaper(response_cache=ResponseCache(str(tmp_path / 'http_cache.sqlite')),
+                                        game_log_store=GameLogStore(str(tmp_path / 'game_logs')))
+    yield scraper
+    scraper.close()
+
+
+def expire(store, player_id, season):
+    """Make a stored log look older than the current-season TTL."""
+    meta = store.meta(player_id, season)
+    store._write_meta(store._directory(player_id, season), dict(meta, stored_at=0))
+
+
+def test_season_is_complete(scraper, current_season):
+    assert scraper.season_is_complete(current_season - 1)
+    assert not scraper.season_is_complete(current_season)
+
+
+def test_prefetch_stores_logs_and_checkpoints_them(scraper, tmp_path, current_season):
+    state_path = str(tmp_path / 'state.json')
+    logs = [('youngtr01', current_season), ('youngtr01', current_season - 1)]
+
+    done, failed = prefetch(scraper, logs, state_path)
+
+    assert failed == {}
+    assert done[f'youngtr01:{current_season - 1}']['final'] is True
+    assert done[f'youngtr01:{current_season}']['final'] is False
+    assert done[f'youngtr01:{current_season}']['games'] > 0
+    # The current season is checked again by later runs, so the checkpoint is kept
+    assert os.path.exists(state_path)
+
+
+@pytest.mark.parametrize('incremental', [True, False])
+def test_failed_refresh_of_stored_log_is_reported_and_retried(scraper, tmp_path, current_season, monkeypatch,
+                                                              incremental):
+    scraper.incremental_refresh = incremental
+    state_path = str(tmp_path / 'state.json')
+    logs = [('youngtr01', current_season)]
+    prefetch(scraper, logs, state_path)
+    expire(scraper.game_log_store, 'youngtr01', current_season)
+
+    def unreachable(*args, **kwargs):
+        raise requests.ConnectionError('site unreachable')
+    fetch = scraper._get
+    monkeypatch.setattr(scraper, '_get', unreachable)
+    done, failed = prefetch(scraper, logs, state_path)
+
+    key = f'youngtr01:{current_season}'
+    assert scraper.game_log_status('youngtr01', current_season) == 'failed'
+    assert failed == {key: 1}
+    assert key not in done
+    with open(state_path) as f:
+        job_id = json.load(f)['job']
+    assert load_state(state_path, job_id) == (done, {key: 1})
+
+    # The next run refreshes it again and clears the failure
+    monkeypatch.setattr(scraper, '_get', fetch)
+    expire(scraper.game_log_store, 'youngtr01', current_season)
+    done, failed = prefetch(scraper, logs, state_path)
+
+    assert failed == {}
+    assert key in done
+    assert scraper.game_log_status('youngtr01', current_season) == 'stored'
+
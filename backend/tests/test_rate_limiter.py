@@ -0,0 +1,111 @@
+import asyncio
+import multiprocessing
+import time
+
+import pytest
+
+from src.scrapers.rate_limiter import LOCK_POLL_INTERVAL, TokenBucketRateLimiter, fcntl
+
+requires_file_locks = pytest.mark.skipif(fcntl is None, reason='File locking is not available on this platform')
+
+
+def test_burst_then_refill_rate():
+    limiter = TokenBucketRateLimiter(requests_per_minute=600, burst=3)
+
+    assert [limiter._try_take() for _ in range(3)] == [0.0, 0.0, 0.0]
+    # 10 tokens per second: the next one is about 0.1s away
+    assert 0.05 < limiter._try_take() <= 0.1
+
+    started = time.monotonic()
+    limiter.acquire()
+    assert 0.05 < time.monotonic() - started < 0.5
+
+
+def test_background_requests_wait_for_a_full_bucket():
+    limiter = TokenBucketRateLimiter(requests_per_minute=60, burst=3)
+    limiter.acquire()
+
+    # One token is missing, so background requests wait about a second...
+    assert limiter._try_take(background=True) > 0.5
+    # ...while user requests still go through
+    assert limiter._try_take() == 0.0
+    assert limiter._try_take() == 0.0
+    assert limiter._try_take() > 0.5
+
+
+def test_async_callers_share_the_bucket():
+    limiter = TokenBucketRateLimiter(requests_per_minute=600, burst=2)
+    limiter.acquire()
+    asyncio.run(limiter.acquire_async())
+
+    started = time.monotonic()
+    waited = asyncio.run(limiter.acquire_async())
+    assert waited > 0.05 and time.monotonic() - started > 0.05
+
+
+@pytest.mark.parametrize('kwargs', [{'requests_per_minute': 0}, {'burst': 0}])
+def test_invalid_settings(kwargs):
+    with pytest.raises(ValueError):
+        TokenBucketRateLimiter(**kwargs)
+
+
+@requires_file_locks
+def test_limiters_share_the_state_file(tmp_path):
+    path = str(tmp_path / 'limiter.json')
+    first = TokenBucketRateLimiter(requests_per_minute=60, burst=2, lock_path=path)
+    second = TokenBucketRateLimiter(requests_per_minute=60, burst=2, lock_path=path)
+
+    assert first._try_take() == 0.0
+    assert second._try_take() == 0.0
+    assert first._try_take() > 0.5
+    assert second._try_take() > 0.5
+
+
+@requires_file_locks
+def test_corrupt_state_file_starts_with_a_full_bucket(tmp_path):
+    path = tmp_path / 'limiter.json'
+    path.write_text('{"tokens": ')
+    limiter = TokenBucketRateLimiter(requests_per_minute=60, burst=2, lock_path=str(path))
+
+    assert limiter._try_take() == 0.0
+    assert limiter._try_take() == 0.0
+    assert limiter._try_take() > 0.5
+
+
+@requires_file_locks
+def test_async_callers_poll_a_held_state_file_lock(tmp_path):
+    path = str(tmp_path / 'limiter.json')
+    limiter = TokenBucketRateLimiter(requests_per_minute=60, burst=2, lock_path=path)
+
+    with open(path, 'a+') as state_file:
+        fcntl.flock(state_file, fcntl.LOCK_EX)
+        # Another process holds the lock: retry shortly instead of blocking the event loop
+        assert limiter._try_take(blocking=False) == LOCK_POLL_INTERVAL
+        fcntl.flock(state_file, fcntl.LOCK_UN)
+
+    assert limiter._try_take(blocking=False) == 0.0
+
+
+def acquire_tokens(path, count):
+    limiter = TokenBucketRateLimiter(requests_per_minute=1200, burst=1, lock_path=path)
+    for _ in range(count):
+        limiter.acquire()
+
+
+@requires_file_locks
+def test_processes_share_one_budget(tmp_path):
+    path = str(tmp_path / 'limiter.json')
+    context = multiprocessing.get_context('fork')
+    processes = [context.Process(target=acquire_tokens, args=(path, 5)) for _ in range(2)]
+
+    started = time.monotonic()
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=10)
+    elapsed = time.monotonic() - started
+
+    assert all(process.exitcode == 0 for process in processes)
+    # 10 requests at 20 per second with a burst of 1 take at least 9 refills, where
+    # separate budgets would let each process finish after 4
+    assert elapsed >= 9 / 20 - 0.02
@@ -0,0 +1,158 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from src.scrapers.basketball_reference import BasketballReferenceScaper
+from src.scrapers.rate_limiter import TokenBucketRateLimiter
+from src.scrapers.response_cache import ResponseCache
+
+
+def make_response(url, content=b'<html>page</html>', status_code=200, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    response.url = url
+    response.headers = requests.structures.CaseInsensitiveDict(headers or {})
+    return response
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    """Serves one page with an ETag, answering 304 to matching conditional requests."""
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.requests.append(dict(self.headers))
+        status = self.server.status
+        if status == 200 and self.headers.get('If-None-Match') == self.server.etag:
+            status = 304
+        body = self.server.body if status == 200 else b''
+        self.send_response(status)
+        self.send_header('ETag', self.server.etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def site():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), PageHandler)
+    server.daemon_threads = True
+    server.requests, server.status, server.etag, server.body = [], 200, '"v1"', b'<html>v1</html>'
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/page"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def stop(site, scraper):
+    """Take the site down, dropping the scraper's kept-alive connections to it."""
+    site.shutdown()
+    site.server_close()
+    scraper.session.close()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(str(tmp_path / 'http_cache.sqlite'))
+
+
+@pytest.fixture
+def scraper(cache):
+    return BasketballReferenceScaper(session=requests.Session(), max_retries=0, response_cache=cache,
+                                     rate_limiter=TokenBucketRateLimiter(requests_per_minute=60000, burst=100))
+
+
+def test_put_and_get(cache):
+    url = 'https://example.com/page'
+    cache.put(url, make_response(url, headers={'ETag': '"a"', 'Set-Cookie': 'x=1'}), ttl=60)
+
+    cached = cache.get(url)
+    assert cached.content == b'<html>page</html>'
+    assert cached.is_fresh and cached.etag == '"a"'
+    # Only the headers needed to serve and revalidate the page are kept
+    assert 'Set-Cookie' not in cached.headers
+    assert cached.to_response().text == '<html>page</html>'
+    assert cache.get('https://example.com/other') is None
+
+
+def test_expiry_and_refresh(cache):
+    url = 'https://example.com/page'
+    cache.put(url, make_response(url), ttl=-1)
+    assert not cache.get(url).is_fresh
+
+    cache.refresh(url, ttl=60)
+    assert cache.get(url).is_fresh
+
+    cache.put(url, make_response(url), ttl=None)
+    assert cache.get(url).expires_at is None and cache.get(url).is_fresh
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'http_cache.sqlite'), max_bytes=250)
+    for name in ['a', 'b']:
+        cache.put(name, make_response(name, content=b'x' * 100), ttl=None)
+        time.sleep(0.01)
+    cache.get('a')
+    cache.put('c', make_response('c', content=b'x' * 100), ttl=None)
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert cache.stats()['evictions'] == 1
+
+
+def test_fresh_entries_are_served_without_a_request(site, scraper, cache):
+    assert scraper._get(site.url, ttl=60).text == '<html>v1</html>'
+    assert scraper._get(site.url, ttl=60).from_cache
+    assert len(site.requests) == 1
+    assert cache.stats()['hits'] == 1
+
+
+def test_stale_entries_are_revalidated(site, scraper, cache):
+    scraper._get(site.url, ttl=-1)
+
+    response = scraper._get(site.url, ttl=60)
+
+    assert site.requests[-1]['If-None-Match'] == '"v1"'
+    assert response.status_code == 200 and response.text == '<html>v1</html>'
+    assert cache.stats()['revalidations'] == 1
+    # The 304 made the entry fresh again
+    assert cache.get(site.url).is_fresh
+
+
+def test_changed_pages_replace_stale_entries(site, scraper, cache):
+    scraper._get(site.url, ttl=-1)
+    site.etag, site.body = '"v2"', b'<html>v2</html>'
+
+    assert scraper._get(site.url, ttl=60).text == '<html>v2</html>'
+    assert cache.get(site.url).etag == '"v2"'
+
+
+def test_stale_entries_are_served_if_the_site_fails(site, scraper, cache):
+    scraper._get(site.url, ttl=-1)
+    site.status = 503
+
+    response = scraper._get(site.url, ttl=60)
+    assert response.status_code == 200 and response.text == '<html>v1</html>'
+    assert cache.stats()['stale'] == 1
+    # The entry stays stale, so the next request tries the site again
+    assert not cache.get(site.url).is_fresh
+
+    stop(site, scraper)
+    assert scraper._get(site.url, ttl=60).text == '<html>v1</html>'
+    assert cache.stats()['stale'] == 2
+
+
+def test_failures_without_a_cached_page_are_returned(site, scraper):
+    site.status = 500
+    assert scraper._get(site.url, ttl=60).status_code == 500
+
+    stop(site, scraper)
+    with pytest.raises(requests.ConnectionError):
+        scraper._get(site.url + '?uncached', ttl=60)
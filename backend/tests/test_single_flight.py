@@ -0,0 +1,119 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.scrapers.single_flight import SingleFlight
+
+
+def run_threads(count, target):
+    results = [None] * count
+    errors = [None] * count
+
+    def run(i):
+        try:
+            results[i] = target()
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    return results, errors
+
+
+def test_concurrent_calls_share_one_run():
+    flight = SingleFlight()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.2)
+        return 'page'
+
+    results, errors = run_threads(8, lambda: flight.do(('youngtr01', 2025), fetch))
+
+    assert calls == [1]
+    assert errors == [None] * 8
+    assert sorted(shared for _, shared in results) == [False] + [True] * 7
+    assert {result for result, _ in results} == {'page'}
+
+
+def test_errors_are_shared_and_the_key_is_released():
+    flight = SingleFlight()
+
+    def fail():
+        time.sleep(0.2)
+        raise ValueError('upstream failed')
+
+    _, errors = run_threads(4, lambda: flight.do('key', fail))
+    assert all(isinstance(error, ValueError) for error in errors)
+
+    # A later call runs again instead of getting the old error
+    assert flight.do('key', lambda: 'page') == ('page', False)
+
+
+def test_different_keys_run_separately():
+    flight = SingleFlight()
+    assert flight.do('a', lambda: 1) == (1, False)
+    assert flight.do('b', lambda: 2) == (2, False)
+
+
+def test_async_calls_share_one_run():
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return 'page'
+
+    async def main():
+        return await asyncio.gather(*(flight.do_async('key', fetch) for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert calls == [1]
+    assert sorted(shared for _, shared in results) == [False] + [True] * 4
+
+
+def test_cancelling_the_first_async_caller_does_not_cancel_the_call():
+    flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.1)
+        return 'page'
+
+    async def main():
+        leader = asyncio.ensure_future(flight.do_async('key', fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do_async('key', fetch))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(main()) == ('page', True)
+
+
+def test_async_callers_share_a_thread_call():
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def fetch():
+        started.set()
+        time.sleep(0.2)
+        return 'page'
+
+    thread = threading.Thread(target=flight.do, args=('key', fetch))
+    thread.start()
+    started.wait(5)
+
+    async def fetch_async():
+        raise AssertionError('The thread call should be shared')
+
+    assert asyncio.run(flight.do_async('key', fetch_async)) == ('page', True)
+    thread.join(5)
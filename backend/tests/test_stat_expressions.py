@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.stat_expressions import MAX_EXPRESSION_LENGTH, evaluate_stats, parse_stat_expression
+
+
+@pytest.mark.parametrize('name, coefficients', [
+    ('pts', (('pts', 1.0),)),
+    ('PTS', (('pts', 1.0),)),
+    ('threes', (('fg3', 1.0),)),
+    ('pts+trb+ast', (('pts', 1.0), ('trb', 1.0), ('ast', 1.0))),
+    # Columns are put in a canonical order, so equivalent expressions compare equal
+    ('ast + trb + pts', (('pts', 1.0), ('trb', 1.0), ('ast', 1.0))),
+    ('PRA', (('pts', 1.0), ('trb', 1.0), ('ast', 1.0))),
+    ('P+R', (('pts', 1.0), ('trb', 1.0))),
+    ('stocks', (('stl', 1.0), ('blk', 1.0))),
+    ('pts + 2*blk', (('pts', 1.0), ('blk', 2.0))),
+    ('(pts + ast) * 0.5', (('pts', 0.5), ('ast', 0.5))),
+    ('PRA - ast', (('pts', 1.0), ('trb', 1.0))),
+    ('-tov', (('tov', -1.0),)),
+    ('pts + pts', (('pts', 2.0),)),
+])
+def test_parse_stat_expression(name, coefficients):
+    expression = parse_stat_expression(name)
+    assert expression.name == name
+    assert expression.coefficients == coefficients
+
+
+@pytest.mark.parametrize('name', [
+    '', '   ', None, 5, 'foo', 'pts+', 'pts + 1', '2', '2*3', 'pts - pts', 'pts*ast', 'pts/2', 'pts**2',
+    'pts.real', "__import__('os')", 'pts if ast else trb', 'True*pts', '1e400*pts', 'pts*1e308*10',
+    'p' * (MAX_EXPRESSION_LENGTH + 1),
+])
+def test_invalid_stat_expressions(name):
+    with pytest.raises(ValueError):
+        parse_stat_expression(name)
+
+
+def test_evaluate_stats():
+    games = pd.DataFrame({
+        'pts': [30.0, 20.0, 10.0],
+        'trb': [5.0, np.nan, 7.0],
+        'ast': ['8', '4', ''],
+        'blk': [1.0, 0.0, 2.0],
+    })
+    expressions = [parse_stat_expression(name) for name in ['pts', 'PRA', 'pts + 2*blk', 'stl']]
+
+    values = evaluate_stats(games, expressions)
+
+    # Missing and unparsable values and absent columns count as 0
+    np.testing.assert_array_equal(values, [
+        [30.0, 43.0, 32.0, 0.0],
+        [20.0, 24.0, 20.0, 0.0],
+        [10.0, 17.0, 14.0, 0.0],
+    ])
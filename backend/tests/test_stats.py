@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from src.stats import MAX_BET_LINES, calculate_stats, parse_bet_lines
+
+
+def test_parse_single_line_list_and_ladder():
+    assert parse_bet_lines(25.5).tolist() == [25.5]
+    assert parse_bet_lines([26.5, 24.5]).tolist() == [26.5, 24.5]
+    assert parse_bet_lines({"start": 20.5, "stop": 22.5, "step": 0.5}).tolist() == [20.5, 21.0, 21.5, 22.0, 22.5]
+    assert parse_bet_lines({"start": 20.5, "stop": 21.5}).tolist() == [20.5, 21.0, 21.5]
+    # stop is included even when the step does not divide the range exactly in floating point
+    assert parse_bet_lines({"start": 0.1, "stop": 0.3, "step": 0.1}).size == 3
+    assert parse_bet_lines(None).tolist() == [0.0]
+
+
+@pytest.mark.parametrize('spec', [
+    'abc', [], [[1, 2]], [1, float('nan')], float('inf'),
+    {"start": 20.5}, {"start": "a", "stop": 21}, {"start": 22, "stop": 21}, {"start": 20, "stop": 21, "step": 0},
+    {"start": 20, "stop": float('inf')}, {"start": 20, "stop": 21, "step": float('nan')},
+])
+def test_parse_invalid_lines(spec):
+    with pytest.raises(ValueError):
+        parse_bet_lines(spec)
+
+
+def test_ladders_are_bounded_before_they_are_built():
+    assert parse_bet_lines({"start": 0, "stop": MAX_BET_LINES - 1, "step": 1}).size == MAX_BET_LINES
+    with pytest.raises(ValueError, match='At most'):
+        parse_bet_lines({"start": 0, "stop": MAX_BET_LINES, "step": 1})
+    with pytest.raises(ValueError, match='At most'):
+        parse_bet_lines({"start": 0, "stop": 1e300, "step": 1e-300})
+    with pytest.raises(ValueError, match='At most'):
+        parse_bet_lines(list(range(MAX_BET_LINES + 1)))
+
+
+def test_calculate_stats():
+    # Most recent game first
+    points = [30, 10, 20, 25, 15, 12, 18, 22, 8, 40]
+    stats = calculate_stats(np.array(points, dtype=float), [np.array([19.5])])
+
+    assert stats == [{
+        "average": 20.0,
+        # Even number of games: the mean of the two middle values
+        "median": 19.0,
+        "min": 8.0,
+        "max": 40.0,
+        "overPercentage": 50.0,
+        "lastFiveAvg": 20.0,
+        "trend": "stable",
+    }]
+
+
+def test_calculate_stats_matches_per_column_computation():
+    rng = np.random.default_rng(7)
+    values = rng.integers(0, 40, size=(17, 3)).astype(float)
+    ladders = [np.array([10.5]), np.array([5.0, 20.0, 35.5]), np.array([0.0, 39.0])]
+
+    for column, stats in enumerate(calculate_stats(values, ladders)):
+        games = values[:, column]
+        assert stats["average"] == round(games.mean(), 1)
+        assert stats["median"] == float(np.median(games))
+        assert stats["lastFiveAvg"] == round(games[:5].mean(), 1)
+        expected = [round((games > line).mean() * 100, 1) for line in ladders[column]]
+        assert stats["overPercentage"] == expected[0]
+        if len(expected) > 1:
+            # A line equal to a game's value is not an over
+            assert [step["overPercentage"] for step in stats["lineLadder"]] == expected
+        else:
+            assert "lineLadder" not in stats
+
+
+def test_calculate_stats_trends_and_no_games():
+    up = calculate_stats(np.array([[30], [30], [30], [30], [30], [20], [20], [20], [20], [20]], dtype=float),
+                         [np.array([0.0])])
+    assert up[0]["trend"] == "up"
+    down = calculate_stats(np.array([[20]] * 5 + [[30]] * 5, dtype=float), [np.array([0.0])])
+    assert down[0]["trend"] == "down"
+
+    empty = calculate_stats(np.empty((0, 2)), [np.array([1.5]), np.array([1.5, 2.5])])
+    assert [stats["average"] for stats in empty] == [0.0, 0.0]
+    assert empty[1]["lineLadder"] == [{"line": 1.5, "overPercentage": 0.0}, {"line": 2.5, "overPercentage": 0.0}]
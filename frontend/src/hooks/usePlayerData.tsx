@@ -1,15 +1,17 @@
 import { useState, useEffect } from 'react';
 import { useQuery } from '@tanstack/react-query';
 import { toast } from 'sonner';
-import { PlayerSearchResult, FilterOptions, PlayerData } from '@/types/playerTypes';
+import { PlayerSearchResult, FilterOptions, PlayerData, SeasonProgress } from '@/types/playerTypes';
 import { searchPlayers, getPlayerAnalysis } from '@/utils/api';
 
-export type { GameLog, StatSummary, PlayerData, PlayerSearchResult, FilterOptions } from '@/types/playerTypes';
+export type { GameLog, StatSummary, PlayerData, PlayerSearchResult, FilterOptions, SeasonProgress } from '@/types/playerTypes';
 
 export const usePlayerData = () => {
   const [searchQuery, setSearchQuery] = useState('');
   const [selectedPlayer, setSelectedPlayer] = useState<PlayerSearchResult | null>(null);
   const [manuallyTriggered, setManuallyTriggered] = useState(false);
+  // Seasons of the running analysis whose games have been loaded
+  const [seasonProgress, setSeasonProgress] = useState<SeasonProgress[]>([]);
   const [filters, setFilters] = useState<FilterOptions>({
     opponent: 'ANY',
     location: 'ANY',
@@ -51,7 +53,9 @@ export const usePlayerData = () => {
         throw new Error('No player selected');
       }
       console.log("queryFn - Fetching data for:", selectedPlayer.name, "ID:", selectedPlayer.id);
-      return getPlayerAnalysis(selectedPlayer.name, filters, selectedPlayer.id);
+      setSeasonProgress([]);
+      return getPlayerAnalysis(selectedPlayer.name, filters, selectedPlayer.id,
+        (progress) => setSeasonProgress(previous => [...previous, progress]));
     },
     enabled: false, // Disable auto-fetching - only fetch when manually triggered
     meta: {
@@ -89,6 +93,7 @@ export const usePlayerData = () => {
     setFilters,
     playerData,
     isAnalyzing,
+    seasonProgress,
     error,
     analyze,
   };
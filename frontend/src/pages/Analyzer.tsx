@@ -16,6 +16,7 @@ const Analyzer = () => {
   const {
     playerData,
     isAnalyzing,
+    seasonProgress,
     analyze,
     filters,
     setFilters,
@@ -48,7 +49,23 @@ const Analyzer = () => {
             />
           </div>
           
-          {isAnalyzing ? (
+          {isAnalyzing && seasonProgress.length > 0 ? (
+            // Show the games of the seasons loaded so far while the rest are fetched
+            <div className="space-y-8 animate-fade-in">
+              <LoadingState 
+                type="pulse" 
+                height="h-[160px]" 
+                message={`Loaded ${seasonProgress.length} of ${filters.seasons === 'both' ? 2 : 1} seasons, analyzing...`} 
+              />
+              <div>
+                <h2 className="text-xl font-merriweather font-bold text-white mb-4">Game Log</h2>
+                <GameLogTable 
+                  data={seasonProgress.flatMap(progress => progress.gameLogs)} 
+                  betLines={filters.betLines} 
+                />
+              </div>
+            </div>
+          ) : isAnalyzing ? (
             <LoadingState type="pulse" height="h-[400px]" message="Analyzing player data..." />
           ) : !playerData ? (
             <div className="glass rounded-xl p-12 text-center">
@@ -30,6 +30,12 @@ export interface PlayerData {
   };
 }
 
+export interface SeasonProgress {
+  season: number;
+  games: number;
+  gameLogs: GameLog[];
+}
+
 export interface PlayerSearchResult {
   id: string;
   name: string;
@@ -1,4 +1,4 @@
-import { PlayerSearchResult, FilterOptions, PlayerData } from '@/types/playerTypes';
+import { PlayerSearchResult, FilterOptions, PlayerData, SeasonProgress } from '@/types/playerTypes';
 
 // Fallback players in case API fails
 const FALLBACK_PLAYERS: PlayerSearchResult[] = [
@@ -48,16 +48,44 @@ export const searchPlayers = async (query: string): Promise<PlayerSearchResult[]
   }
 };
 
+/**
+ * Read a newline-delimited JSON response, calling onEvent for each event as soon as it arrives
+ */
+const readEvents = async (response: Response, onEvent: (event: any) => void): Promise<void> => {
+  if (!response.body) {
+    (await response.text()).split('\n').filter(Boolean).forEach(line => onEvent(JSON.parse(line)));
+    return;
+  }
+  
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffered = '';
+  while (true) {
+    const { done, value } = await reader.read();
+    buffered += decoder.decode(value, { stream: !done });
+    const lines = buffered.split('\n');
+    // Keep a partial last line until the rest of it arrives
+    buffered = lines.pop() ?? '';
+    lines.filter(Boolean).forEach(line => onEvent(JSON.parse(line)));
+    if (done) break;
+  }
+  if (buffered.trim()) onEvent(JSON.parse(buffered));
+};
+
 /**
  * Get player analysis data
+ * 
+ * With onSeason, the analysis is streamed and onSeason receives each season's
+ * games as soon as they are loaded, before the statistics are ready.
  */
 export const getPlayerAnalysis = async (
   playerName: string, 
   filters: FilterOptions,
-  playerId?: string
+  playerId?: string,
+  onSeason?: (progress: SeasonProgress) => void
 ): Promise<PlayerData> => {
   try {
-    const response = await fetch(`${API_BASE_URL}/player/analyze`, {
+    const response = await fetch(`${API_BASE_URL}/player/analyze${onSeason ? '?stream=ndjson' : ''}`, {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
@@ -78,7 +106,24 @@ export const getPlayerAnalysis = async (
       throw new Error(errorData.error || 'Failed to analyze player');
     }
     
-    return await response.json();
+    if (!onSeason) {
+      return await response.json();
+    }
+    
+    let result: PlayerData | undefined;
+    await readEvents(response, (event) => {
+      if (event.event === 'season') {
+        onSeason(event);
+      } else if (event.event === 'result') {
+        result = event.result;
+      } else if (event.event === 'error') {
+        throw new Error(event.error || 'Failed to analyze player');
+      }
+    });
+    if (!result) {
+      throw new Error('The analysis ended without a result');
+    }
+    return result;
   } catch (error: any) {
     console.error('Error analyzing player:', error);
     throw new Error(error.message || 'Failed to analyze player');